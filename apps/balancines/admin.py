@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Count, OuterRef, Subquery
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 from django.urls import reverse
@@ -10,8 +11,10 @@ from .models import (
     TipoBalancin, BalancinIndividual, BalancinOH, HistorialBalancin,
     RepuestoBalancin, RepuestoAdicional,
     HistorialRepuesto, HistorialAdicional,
-    HistorialOH # ✅ IMPORT CORRECTO AQUÍ
+    HistorialOH, ActivityLog, # ✅ IMPORT CORRECTO AQUÍ
+    CalendarioLinea, ExcepcionOperacion,
 )
+from .paginacion import PaginadorEstimado
 
 # ========== CONFIGURACIÓN GENERAL ==========
 admin.site.site_header = 'Sistema TRM - Administración'
@@ -19,6 +22,12 @@ admin.site.site_title = 'TRM Admin'
 admin.site.index_title = 'Panel de Administración de Inventario'
 
 
+class TablaGrandeAdmin(admin.ModelAdmin):
+    """Listados de tablas grandes: sin COUNT(*) completo en cada página"""
+    paginator = PaginadorEstimado
+    show_full_result_count = False
+
+
 # ========== USUARIOS ==========
 @admin.register(Usuario)
 class UsuarioAdmin(UserAdmin):
@@ -53,8 +62,9 @@ class UsuarioAdmin(UserAdmin):
 
 # ========== REGISTRO ACTIVIDAD ==========
 @admin.register(RegistroActividad)
-class RegistroActividadAdmin(admin.ModelAdmin):
+class RegistroActividadAdmin(TablaGrandeAdmin):
     list_display = ('usuario', 'accion', 'fecha')
+    list_select_related = ('usuario',)
     list_filter = ('fecha', 'usuario')
     search_fields = ('usuario__email', 'usuario__nombre', 'accion')
     readonly_fields = ('fecha',)
@@ -67,9 +77,29 @@ class LineaAdmin(admin.ModelAdmin):
     search_fields = ('nombre',)
     readonly_fields = ('fecha_registro',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(total_torres=Count('torres'))
+
     def cantidad_torres(self, obj):
-        return obj.torres.count()
+        return obj.total_torres
     cantidad_torres.short_description = 'Cantidad de Torres'
+    cantidad_torres.admin_order_field = 'total_torres'
+
+
+# ========== CALENDARIO DE OPERACIÓN ==========
+@admin.register(CalendarioLinea)
+class CalendarioLineaAdmin(admin.ModelAdmin):
+    list_display = ('linea', 'hora_inicio', 'horas_dia', 'dias_semana')
+    list_select_related = ('linea',)
+
+
+@admin.register(ExcepcionOperacion)
+class ExcepcionOperacionAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'linea', 'tipo', 'horas_operadas', 'hora_inicio', 'motivo')
+    list_filter = ('tipo', 'linea')
+    search_fields = ('motivo',)
+    date_hierarchy = 'fecha'
+    list_select_related = ('linea',)
 
 
 @admin.register(Seccion)
@@ -93,9 +123,13 @@ class TorreAdmin(admin.ModelAdmin):
         'tipo_balancin_descendente'
     )
     readonly_fields = ('fecha_registro',)
+    list_select_related = ('linea', 'seccion')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(total_balancines=Count('balancines'))
 
     def balancines_instalados(self, obj):
-        count = obj.balancines.count()
+        count = obj.total_balancines
         if count > 0:
             return format_html(
                 '<span style="color: green; font-weight: bold;">{} instalado{}</span>',
@@ -103,6 +137,7 @@ class TorreAdmin(admin.ModelAdmin):
             )
         return format_html('<span style="color: gray;">0 instalados</span>')
     balancines_instalados.short_description = 'Balancines'
+    balancines_instalados.admin_order_field = 'total_balancines'
 
 
 # ========== TIPO BALANCÍN ==========
@@ -122,14 +157,13 @@ class TipoBalancinAdmin(admin.ModelAdmin):
     en_stock.boolean = True
     en_stock.short_description = 'En Stock'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_installed_counts()
+
     def balancines_instalados(self, obj):
-        from django.db.models import Q
-        count = BalancinIndividual.objects.filter(
-            Q(torre__tipo_balancin_ascendente=obj.codigo) |
-            Q(torre__tipo_balancin_descendente=obj.codigo)
-        ).count()
-        return count
+        return obj.balancines_instalados
     balancines_instalados.short_description = 'Instalados'
+    balancines_instalados.admin_order_field = 'total_instalados'
 
 
 # ========== BALANCÍN INDIVIDUAL ==========
@@ -148,6 +182,15 @@ class BalancinIndividualAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('fecha_registro',)
     raw_id_fields = ('torre',)
+    list_select_related = ('torre__seccion',)
+
+    def get_queryset(self, request):
+        # Última OH anotada; el tipo sale de with_status() sin consultar TipoBalancin por fila
+        ultima = BalancinOH.objects.filter(balancin=OuterRef('pk')).order_by('-fecha_oh')
+        return super().get_queryset(request).with_status().annotate(
+            numero_ultimo_oh=Subquery(ultima.values('numero_oh')[:1]),
+            fecha_ultimo_oh=Subquery(ultima.values('fecha_oh')[:1]),
+        )
 
     def torre_info(self, obj):
         url = reverse('admin:balancines_torre_change', args=[obj.torre.id])
@@ -169,14 +212,13 @@ class BalancinIndividualAdmin(admin.ModelAdmin):
     tipo_balancin.short_description = 'Tipo'
 
     def ultima_oh(self, obj):
-        ultima = obj.ordenes_horas.order_by('-fecha_oh').first()
-        if ultima:
+        if obj.numero_ultimo_oh is not None:
             return format_html(
                 '<span title="OH#{} - {} hrs">OH#{}</span><br><small>{}</small>',
-                ultima.numero_oh,
-                ultima.horas_operacion or 0,
-                ultima.numero_oh,
-                ultima.fecha_oh.strftime('%d/%m/%Y')
+                obj.numero_ultimo_oh,
+                obj.horas_ultimo_oh or 0,
+                obj.numero_ultimo_oh,
+                obj.fecha_ultimo_oh.strftime('%d/%m/%Y')
             )
         return format_html('<span style="color: gray;">Sin OH</span>')
     ultima_oh.short_description = 'Última OH'
@@ -221,23 +263,25 @@ class RepuestoAdicionalAdmin(admin.ModelAdmin):
 
 # ========== HISTORIALES ==========
 @admin.register(HistorialRepuesto)
-class HistorialRepuestoAdmin(admin.ModelAdmin):
+class HistorialRepuestoAdmin(TablaGrandeAdmin):
     list_display = ('repuesto', 'tipo_movimiento',
                     'cantidad', 'stock_restante',
                     'fecha_movimiento')
+    list_select_related = ('repuesto',)
     readonly_fields = ('fecha_movimiento',)
 
 
 @admin.register(HistorialAdicional)
-class HistorialAdicionalAdmin(admin.ModelAdmin):
+class HistorialAdicionalAdmin(TablaGrandeAdmin):
     list_display = ('repuesto', 'tipo_movimiento',
                     'cantidad', 'stock_restante',
                     'usuario', 'fecha_movimiento')
+    list_select_related = ('repuesto', 'usuario')
     readonly_fields = ('fecha_movimiento',)
 
 
 @admin.register(HistorialOH)
-class HistorialOHAdmin(admin.ModelAdmin):
+class HistorialOHAdmin(TablaGrandeAdmin):
     list_display = (
         'linea_nombre', 'torre_numero', 'sentido',
         'tipo_balancin', 'numero_oh',
@@ -261,4 +305,15 @@ class HistorialOHAdmin(admin.ModelAdmin):
     estado_color.short_description = 'Estado'
 
 
-# ========== TIPO BALANCÍN - REPUESTO ==========
\ No newline at end of file
+# ========== TIPO BALANCÍN - REPUESTO ==========
+
+
+# ========== LOG DE ACTIVIDADES ==========
+@admin.register(ActivityLog)
+class ActivityLogAdmin(TablaGrandeAdmin):
+    list_display = ('created_at', 'user', 'action', 'module', 'object_name', 'ip_address')
+    list_filter = ('action', 'module')
+    search_fields = ('description', 'object_id', 'object_name', 'user__email')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
@@ -0,0 +1,251 @@
+# apps/balancines/auditoria.py
+"""
+Auditoría de acciones (ActivityLog) escrita en lotes.
+
+Las acciones se capturan con las señales de los modelos (signals.py) y con
+el decorador @auditar de las vistas, que aporta el usuario, la IP y el
+navegador del request. Ninguna escribe durante el request:
+
+1. registrar() arma el ActivityLog en el momento de la acción.
+2. Al confirmarse la transacción (on_commit) pasa al buffer del proceso;
+   una acción revertida no queda auditada.
+3. Un hilo del worker lo escribe con bulk_create cuando el buffer llega a
+   AUDITORIA_TAMANO_LOTE registros o pasan AUDITORIA_INTERVALO_SEGUNDOS,
+   y al terminar el proceso.
+
+Un worker que muere sin cerrarse (kill -9, OOM) pierde como mucho los
+registros de un intervalo. En tests, buffer_auditoria.vaciar() escribe lo
+pendiente.
+
+Consultas (cada filtro usa un índice de la tabla):
+
+    ActivityLog.objects.de_objeto('BALANCIN_INDIVIDUAL', 'BAL-16N/4TR-0001')
+    ActivityLog.objects.de_usuario(usuario).recientes(dias=7)
+    paginar_auditoria(ActivityLog.objects.de_modulo('TORRE'), cursor)
+
+La retención (manage.py depurar_auditoria) borra meses completos.
+"""
+
+import atexit
+import ipaddress
+import logging
+import os
+import threading
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Máximo de registros retenidos en memoria si la BD no acepta escrituras (en lotes)
+MAX_LOTES_PENDIENTES = 20
+
+
+def _activa():
+    return getattr(settings, 'AUDITORIA_ACTIVA', True)
+
+
+def _tamano_lote():
+    return getattr(settings, 'AUDITORIA_TAMANO_LOTE', 100)
+
+
+def _intervalo():
+    return getattr(settings, 'AUDITORIA_INTERVALO_SEGUNDOS', 5)
+
+
+# ============================================================
+# BUFFER POR PROCESO
+# ============================================================
+
+class BufferAuditoria:
+    """Registros confirmados pendientes de escribir, con su hilo escritor"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pendientes = []
+        self._lote_listo = threading.Event()
+        self._hilo = None
+        self._pid = None
+
+    def agregar(self, registro):
+        with self._lock:
+            self._iniciar_hilo()
+            self._pendientes.append(registro)
+            lleno = len(self._pendientes) >= _tamano_lote()
+        if lleno:
+            self._lote_listo.set()
+
+    def _iniciar_hilo(self):
+        """Hilo escritor del proceso (tras un fork el del padre no existe en el hijo)"""
+        if self._pid == os.getpid() and self._hilo.is_alive():
+            return
+        if self._pid is not None and self._pid != os.getpid():
+            # Lo pendiente es del proceso padre: lo escribe él
+            self._pendientes = []
+        self._pid = os.getpid()
+        self._hilo = threading.Thread(target=self._escribir_periodicamente, name='auditoria', daemon=True)
+        self._hilo.start()
+
+    def _escribir_periodicamente(self):
+        while True:
+            self._lote_listo.wait(timeout=_intervalo())
+            self._lote_listo.clear()
+            if self.vaciar():
+                # Conexión propia del hilo: no mantenerla abierta entre lotes
+                connections.close_all()
+
+    def vaciar(self):
+        """Escribe los registros pendientes. Devuelve cuántos se escribieron"""
+        from .models import ActivityLog
+
+        with self._lock:
+            lote, self._pendientes = self._pendientes, []
+        if not lote:
+            return 0
+
+        try:
+            ActivityLog.objects.bulk_create(lote, batch_size=_tamano_lote())
+        except DatabaseError as e:
+            maximo = _tamano_lote() * MAX_LOTES_PENDIENTES
+            with self._lock:
+                pendientes = lote + self._pendientes
+                descartados = max(0, len(pendientes) - maximo)
+                self._pendientes = pendientes[descartados:]
+            logger.error(f"Error escribiendo {len(lote)} registros de auditoría: {e}")
+            if descartados:
+                logger.error(f"Se descartaron {descartados} registros de auditoría")
+            return 0
+        return len(lote)
+
+    def __len__(self):
+        return len(self._pendientes)
+
+
+buffer_auditoria = BufferAuditoria()
+
+# Al terminar el worker (gunicorn, comandos) se escribe lo que quede
+atexit.register(buffer_auditoria.vaciar)
+
+
+# ============================================================
+# CONTEXTO DEL REQUEST
+# ============================================================
+
+_contexto_request = ContextVar('auditoria_request', default=None)
+
+_NAVEGADORES = (('Edg/', 'Edge'), ('OPR/', 'Opera'), ('Chrome/', 'Chrome'), ('Firefox/', 'Firefox'), ('Safari/', 'Safari'))
+_SISTEMAS = (('Windows', 'Windows'), ('Android', 'Android'), ('iPhone', 'iOS'), ('iPad', 'iOS'),
+             ('Mac OS X', 'macOS'), ('Linux', 'Linux'))
+
+
+def _ip_cliente(request):
+    """IP del cliente; detrás de nginx viene en X-Real-IP (ver nginx.conf)"""
+    ip = request.META.get('HTTP_X_REAL_IP') or request.META.get('REMOTE_ADDR')
+    try:
+        return str(ipaddress.ip_address(ip)) if ip else None
+    except ValueError:
+        return None
+
+
+def _navegador(user_agent):
+    """'Chrome / Windows' a partir del User-Agent (sin dependencias)"""
+    navegador = next((nombre for clave, nombre in _NAVEGADORES if clave in user_agent), None)
+    sistema = next((nombre for clave, nombre in _SISTEMAS if clave in user_agent), None)
+    return ' / '.join(parte for parte in (navegador, sistema) if parte) or None
+
+
+def contexto_de_request(request):
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    usuario = getattr(request, 'user', None)
+    return {
+        'user_id': usuario.pk if usuario is not None and usuario.is_authenticated else None,
+        'ip_address': _ip_cliente(request),
+        'user_agent': user_agent or None,
+        'browser_info': _navegador(user_agent),
+    }
+
+
+# ============================================================
+# REGISTRO
+# ============================================================
+
+def _serializable(valores):
+    """Fechas, decimales, etc. como texto para el JSONField (no tiene encoder)"""
+    if valores is None:
+        return None
+    codificador = DjangoJSONEncoder()
+    return {
+        clave: valor if valor is None or isinstance(valor, (str, int, float, bool)) else codificador.default(valor)
+        for clave, valor in valores.items()
+    }
+
+
+def registrar(accion, modulo, descripcion, objeto_id=None, objeto_nombre=None,
+              anteriores=None, nuevos=None, usuario_id=None, contexto=None):
+    """
+    Registra una acción (ActivityLog.ACTION_CHOICES / MODULE_CHOICES) cuando
+    la transacción en curso se confirma. El usuario, la IP y el navegador
+    salen del request que se está atendiendo (@auditar), si lo hay.
+    """
+    if not _activa():
+        return
+    from .models import ActivityLog
+
+    contexto = contexto or _contexto_request.get() or {}
+    registro = ActivityLog(
+        action=accion,
+        module=modulo,
+        description=descripcion,
+        object_id=str(objeto_id)[:100] if objeto_id is not None else None,
+        object_name=str(objeto_nombre)[:200] if objeto_nombre is not None else None,
+        old_values=_serializable(anteriores),
+        new_values=_serializable(nuevos),
+        user_id=usuario_id or contexto.get('user_id'),
+        ip_address=contexto.get('ip_address'),
+        user_agent=contexto.get('user_agent'),
+        browser_info=contexto.get('browser_info'),
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: buffer_auditoria.agregar(registro))
+
+
+def auditar(accion=None, modulo='SYSTEM', descripcion=''):
+    """
+    Decorador de vistas: lo que la vista registra (señales de los modelos)
+    queda con el usuario, la IP y el navegador del request. Con `accion`
+    también registra la vista misma si responde sin error (p. ej. una
+    exportación, que no modifica modelos). Va debajo de @login_required.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            contexto = contexto_de_request(request)
+            token = _contexto_request.set(contexto)
+            try:
+                response = vista(request, *args, **kwargs)
+            finally:
+                _contexto_request.reset(token)
+            if accion and response.status_code < 400:
+                registrar(accion, modulo, descripcion or f'{accion} desde {request.path}', contexto=contexto)
+            return response
+        return envoltura
+    return decorador
+
+
+# ============================================================
+# CONSULTA
+# ============================================================
+
+# Orden de las páginas: recorre el índice de created_at desde el cursor
+ORDEN_AUDITORIA = ('-created_at', '-id')
+
+
+def paginar_auditoria(queryset, cursor=None, por_pagina=50):
+    """Página de registros (más recientes primero) por cursor; ver paginacion.paginar_keyset"""
+    from .paginacion import paginar_keyset
+
+    return paginar_keyset(queryset.select_related('user'), ORDEN_AUDITORIA, cursor=cursor, por_pagina=por_pagina)
@@ -0,0 +1,65 @@
+# apps/balancines/eventos.py
+"""
+Pub/sub en proceso para el stream SSE de horas en vivo.
+
+Las señales de los modelos publican eventos (cambios de control de horas,
+nuevos OH, cambios de estado y alertas) y cada conexión SSE abierta tiene
+su propia cola asyncio. Los eventos solo llegan a las conexiones del mismo
+proceso; para cambios hechos desde otros procesos (comandos, otros workers)
+el stream reenvía un snapshot completo cada SSE_RESYNC_SEGUNDOS.
+"""
+
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+TAMANO_COLA = 200
+
+
+class CanalEventos:
+
+    def __init__(self):
+        self._suscriptores = {}
+        self._lock = threading.Lock()
+
+    @property
+    def hay_suscriptores(self):
+        return bool(self._suscriptores)
+
+    def suscribir(self):
+        """Crea una cola para la conexión actual (llamar desde el event loop)"""
+        cola = asyncio.Queue(maxsize=TAMANO_COLA)
+        with self._lock:
+            self._suscriptores[cola] = asyncio.get_running_loop()
+        return cola
+
+    def desuscribir(self, cola):
+        with self._lock:
+            self._suscriptores.pop(cola, None)
+
+    def publicar(self, tipo, datos):
+        """Publica un evento a todas las conexiones (seguro desde cualquier hilo)"""
+        evento = {'tipo': tipo, 'datos': datos}
+        with self._lock:
+            suscriptores = list(self._suscriptores.items())
+        for cola, loop in suscriptores:
+            try:
+                loop.call_soon_threadsafe(self._encolar, cola, evento)
+            except RuntimeError:
+                # El loop de esa conexión ya se cerró
+                self.desuscribir(cola)
+
+    @staticmethod
+    def _encolar(cola, evento):
+        try:
+            cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Cliente lento: se descartan los pendientes y se le pide un snapshot completo
+            while not cola.empty():
+                cola.get_nowait()
+            cola.put_nowait({'tipo': 'resync', 'datos': {}})
+
+
+canal_horas = CanalEventos()
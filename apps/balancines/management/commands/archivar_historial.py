@@ -0,0 +1,67 @@
+# apps/balancines/management/commands/archivar_historial.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import LoteArchivado
+from ...services.archivo import ServicioArchivo
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve al archivo en frío (LoteArchivado, JSONL comprimido) las alertas OH resueltas '
+        'y el historial de balancines anteriores a la retención (settings.ARCHIVO_*)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modelo',
+            action='append',
+            choices=list(ServicioArchivo.MODELOS),
+            help='Modelo a archivar (se puede repetir). Por defecto todos'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Filas archivadas por transacción'
+        )
+        parser.add_argument(
+            '--exportar',
+            action='store_true',
+            help='Escribir además MEDIA_ROOT/archivo/<modelo>/<AAAA-MM>.jsonl.gz de los meses archivados'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo contar las filas que se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('❌ --lote debe ser >= 1')
+
+        for label in options['modelo'] or ServicioArchivo.MODELOS:
+            limite = ServicioArchivo.limite(label)
+            if options['dry_run']:
+                cantidad = ServicioArchivo.candidatas(label, limite).count()
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️ Dry-run: {cantidad} filas de {label} anteriores a {limite:%d/%m/%Y} se archivarían"
+                ))
+                continue
+
+            total = ServicioArchivo.archivar(label, limite, lote=options['lote'])
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {label}: {total} filas anteriores a {limite:%d/%m/%Y} archivadas"
+            ))
+            if options['exportar']:
+                self._exportar(label)
+
+    def _exportar(self, label):
+        meses = (
+            LoteArchivado.objects.filter(modelo=label)
+            .values_list('mes', flat=True).distinct().order_by('mes')
+        )
+        for mes in meses:
+            ruta = ServicioArchivo.exportar(label, mes)
+            if ruta:
+                self.stdout.write(f"  📦 {ruta}")
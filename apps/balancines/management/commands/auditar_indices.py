@@ -0,0 +1,156 @@
+# apps/balancines/management/commands/auditar_indices.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.balancines.models import (
+    Torre, TipoBalancin, BalancinIndividual, HistorialOH,
+    RepuestoBalancin, RepuestoAdicional,
+    HistorialRepuesto, HistorialAdicional,
+    RegistroTallerDiario, AlertaOH, ControlHorasBalancin,
+)
+
+
+def _consultas_criticas():
+    """
+    Consultas frecuentes de las vistas y comandos, con valores de ejemplo
+    tomados de la propia base de datos.
+    """
+    hoy = timezone.localdate()
+    balancin = BalancinIndividual.objects.values_list('codigo', flat=True).first() or 'BAL-SIN-DATOS'
+    tipo = TipoBalancin.objects.values_list('codigo', flat=True).first() or 'SIN-TIPO'
+
+    return {
+        'historial_repuesto_por_dia': lambda: HistorialRepuesto.objects.filter(
+            fecha_movimiento__date=hoy, tipo_movimiento='entrada'
+        ),
+        'historial_adicional_por_dia': lambda: HistorialAdicional.objects.filter(
+            fecha_movimiento__date=hoy, tipo_movimiento='salida'
+        ),
+        'historial_repuesto_recientes': lambda: HistorialRepuesto.objects.order_by('-fecha_movimiento')[:100],
+        'historial_adicional_por_tipo': lambda: HistorialAdicional.objects.filter(
+            tipo_movimiento='salida'
+        ).order_by('-fecha_movimiento')[:100],
+        'ultimo_oh_por_numero': lambda: HistorialOH.objects.filter(
+            balancin_id=balancin
+        ).order_by('-numero_oh')[:1],
+        'ultimo_oh_por_fecha': lambda: HistorialOH.objects.filter(
+            balancin_id=balancin
+        ).order_by('-fecha_oh')[:1],
+        'taller_por_fecha_area_turno': lambda: RegistroTallerDiario.objects.filter(
+            fecha=hoy, area='mecanica', turno='T1'
+        ),
+        'taller_listado': lambda: RegistroTallerDiario.objects.order_by('-fecha', '-fecha_registro')[:50],
+        'torres_por_tipo': lambda: Torre.objects.filter(
+            Q(tipo_balancin_ascendente=tipo) | Q(tipo_balancin_descendente=tipo)
+        ),
+        'repuestos_stock_bajo': lambda: RepuestoBalancin.objects.filter(cantidad__lt=5, cantidad__gt=0),
+        'adicionales_agotados': lambda: RepuestoAdicional.objects.filter(cantidad=0),
+        'controles_bajo_umbral': lambda: ControlHorasBalancin.objects.filter(backlog_actual__lte=5000),
+        'alertas_no_leidas': lambda: AlertaOH.objects.filter(
+            nivel='VENCIDO', resuelta=False, leida=False
+        ),
+    }
+
+
+def _recorrer_plan(nodo):
+    """Recorre recursivamente los nodos de un plan JSON de EXPLAIN"""
+    yield nodo
+    for hijo in nodo.get('Plans', []):
+        yield from _recorrer_plan(hijo)
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta EXPLAIN (ANALYZE, BUFFERS) sobre las consultas frecuentes y detecta sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--consulta',
+            action='append',
+            help='Nombre de consulta a auditar (se puede repetir). Por defecto todas'
+        )
+        parser.add_argument(
+            '--min-filas',
+            type=int,
+            default=1000,
+            help='Solo marcar Seq Scan en tablas con al menos este número de filas leídas/estimadas'
+        )
+        parser.add_argument(
+            '--estricto',
+            action='store_true',
+            help='Terminar con error si alguna consulta usa Seq Scan (útil en CI)'
+        )
+        parser.add_argument(
+            '--mostrar-plan',
+            action='store_true',
+            help='Imprimir el plan completo de cada consulta'
+        )
+        parser.add_argument(
+            '--listar',
+            action='store_true',
+            help='Listar las consultas disponibles y salir'
+        )
+
+    def handle(self, *args, **options):
+        consultas = _consultas_criticas()
+
+        if options['listar']:
+            for nombre in consultas:
+                self.stdout.write(f'  - {nombre}')
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError('❌ EXPLAIN (ANALYZE, BUFFERS) solo está disponible en PostgreSQL')
+
+        seleccion = options['consulta'] or list(consultas)
+        desconocidas = [n for n in seleccion if n not in consultas]
+        if desconocidas:
+            raise CommandError(f'❌ Consultas desconocidas: {", ".join(desconocidas)}')
+
+        self.stdout.write(f'🔍 Auditando {len(seleccion)} consultas (min filas: {options["min_filas"]})...\n')
+
+        marcadas = []
+
+        for nombre in seleccion:
+            queryset = consultas[nombre]()
+            plan = json.loads(queryset.explain(format='json', analyze=True, buffers=True))[0]
+
+            seq_scans = []
+            for nodo in _recorrer_plan(plan['Plan']):
+                if nodo.get('Node Type') != 'Seq Scan':
+                    continue
+                filas = max(
+                    nodo.get('Plan Rows', 0),
+                    nodo.get('Actual Rows', 0) + nodo.get('Rows Removed by Filter', 0)
+                )
+                if filas >= options['min_filas']:
+                    seq_scans.append((nodo.get('Relation Name'), filas))
+
+            tiempo = plan.get('Execution Time', 0)
+            bloques = plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0)
+
+            if seq_scans:
+                marcadas.append(nombre)
+                detalle = ', '.join(f'{tabla} (~{filas} filas)' for tabla, filas in seq_scans)
+                self.stdout.write(self.style.ERROR(
+                    f'  ❌ {nombre}: Seq Scan en {detalle} — {tiempo:.2f} ms, {bloques} bloques'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'  ✅ {nombre}: {tiempo:.2f} ms, {bloques} bloques'
+                ))
+
+            if options['mostrar_plan']:
+                self.stdout.write(json.dumps(plan, indent=2, default=str))
+
+        if marcadas:
+            mensaje = f'\n⚠️ {len(marcadas)} consultas con Seq Scan: {", ".join(marcadas)}'
+            if options['estricto']:
+                raise CommandError(mensaje)
+            self.stdout.write(self.style.WARNING(mensaje))
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✅ Todas las consultas usan índices'))
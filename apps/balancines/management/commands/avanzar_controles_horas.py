@@ -0,0 +1,40 @@
+# apps/balancines/management/commands/avanzar_controles_horas.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.balancines.models import ControlHorasBalancin
+
+
+class Command(BaseCommand):
+    help = (
+        'Avanza horas_actuales y backlog_actual de todos los controles de horas a la fecha indicada '
+        'según el calendario de operación de cada línea. Pensado para ejecutarse cada noche (cron/scheduler)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fecha',
+            type=str,
+            help='Fecha de referencia YYYY-MM-DD (default: hoy)'
+        )
+
+    def handle(self, *args, **options):
+        fecha = timezone.now().date()
+        if options['fecha']:
+            try:
+                fecha = parse_date(options['fecha'])
+            except ValueError:
+                fecha = None
+            if not fecha:
+                raise CommandError(f'❌ Fecha inválida: {options["fecha"]} (formato YYYY-MM-DD)')
+
+        inicio = time.perf_counter()
+        actualizados = ControlHorasBalancin.objects.avanzar(fecha)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {actualizados} controles con horas nuevas al {fecha:%d/%m/%Y} en {time.perf_counter() - inicio:.2f}s'
+        ))
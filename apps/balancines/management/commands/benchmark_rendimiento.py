@@ -0,0 +1,449 @@
+# apps/balancines/management/commands/benchmark_rendimiento.py
+
+import copy
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.balancines.metricas import capturar_consultas
+from apps.balancines.services.particiones import ServicioParticiones, inicio_mes
+from apps.balancines.models import (
+    Usuario, Linea, Torre, BalancinIndividual, HistorialOH,
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+    ControlHorasBalancin, AlertaOH,
+)
+
+
+USUARIO_BENCHMARK = 'benchmark@sistrm.local'
+
+
+def _vistas():
+    """Vistas pesadas: nombre -> (nombre de URL, parámetros GET[, argumentos de la URL])"""
+    torre = Torre.objects.order_by('id').first()
+    balancin = BalancinIndividual.objects.order_by('codigo').first()
+    return {
+        'dashboard_oh_nuevo': ('dashboard_oh_nuevo', {}),
+        'dashboard_oh_vivo': ('dashboard_oh_vivo', {}),
+        'dashboard_inventario': ('dashboard_inventario', {}),
+        'api_horas_en_vivo': ('api_horas_en_vivo', {}),
+        'buscar_inventario': ('buscar_inventario', {'q': 'BAL'}),
+        'api_dashboard_inventario': ('api_dashboard_inventario', {}),
+        'historial_torre_con_filtros': ('historial_torre_filtros', {
+            'linea': torre.linea_id, 'numero_torre': torre.numero_torre,
+        } if torre else {}),
+        'crear_formulario_control': ('crear_formulario_control', {}, [balancin.codigo] if balancin else []),
+    }
+
+
+# Comandos pesados: nombre -> argumentos
+COMANDOS = {
+    'inicializar_controles_horas': [],
+    'recalcular_backlogs': [],
+    'generar_alertas_oh': [],
+}
+
+# Cargadores de plantillas para comparar el render con y sin compilación en cache
+CARGADORES_PLANTILLAS = {
+    'cache': [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ],
+    'directo': [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ],
+}
+
+
+# Arranque en frío de un worker: configurar Django y cargar las URLs. Imprime
+# la memoria máxima del proceso (KB en Linux) y los módulos de vistas cargados
+CODIGO_ARRANQUE = (
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns; '
+    'import resource, sys; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss); '
+    "print(' '.join(sorted(m for m in sys.modules if m.startswith('apps.balancines.views'))))"
+)
+
+# Bibliotecas pesadas que no deberían cargarse al arrancar
+MODULOS_PESADOS = ['openpyxl', 'pandas']
+
+_LINEA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def _parsear_importtime(salida):
+    """{modulo: (self_us, acumulado_us, nivel)} a partir de la salida de -X importtime"""
+    modulos = {}
+    for linea in salida.splitlines():
+        match = _LINEA_IMPORTTIME.match(linea)
+        if match:
+            propio, acumulado, sangria, modulo = match.groups()
+            modulos[modulo] = (int(propio), int(acumulado), len(sangria) // 2)
+    return modulos
+
+
+def _templates_con_cargadores(cargadores):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['loaders'] = cargadores
+    return templates
+
+
+def _consultas_ventana_reciente():
+    """Consultas de ventana reciente sobre el historial, como las de los dashboards y el historial paginado"""
+    ahora = timezone.now()
+    return {
+        'movimientos_30_dias': HistorialRepuesto.objects.filter(
+            fecha_movimiento__gte=ahora - timedelta(days=30)
+        ).values('tipo_movimiento').annotate(total=Count('id')).order_by(),
+        'salidas_7_dias': HistorialRepuesto.objects.filter(
+            tipo_movimiento='salida', fecha_movimiento__gte=ahora - timedelta(days=7)
+        ).values_list('id', flat=True)[:100],
+        'primera_pagina_historial': HistorialRepuesto.objects.order_by('-fecha_movimiento', '-id')[:100],
+    }
+
+
+def _particiones_leidas(plan):
+    """Particiones que el plan ejecutado (EXPLAIN ANALYZE en JSON) realmente recorrió"""
+    leidas = set()
+    pendientes = [plan[0]['Plan']]
+    while pendientes:
+        nodo = pendientes.pop()
+        if nodo.get('Relation Name') and nodo.get('Actual Loops', 0) > 0:
+            leidas.add(nodo['Relation Name'])
+        pendientes.extend(nodo.get('Plans', []))
+    return len(leidas)
+
+
+MODELOS_CONTEO = [
+    Linea, Torre, BalancinIndividual, HistorialOH, ControlHorasBalancin, AlertaOH,
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+]
+
+
+def _resumen(mediciones):
+    tiempos = [m['total_ms'] for m in mediciones]
+    return {
+        'repeticiones': len(mediciones),
+        'primera_ms': tiempos[0],
+        'min_ms': min(tiempos),
+        'mediana_ms': round(statistics.median(tiempos), 2),
+        'max_ms': max(tiempos),
+        'consultas': mediciones[-1]['consultas'],
+        'consultas_max': max(m['consultas'] for m in mediciones),
+        'bd_ms_mediana': round(statistics.median(m['bd_ms'] for m in mediciones), 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide tiempo y número de consultas de las vistas y comandos pesados y emite JSON. '
+        'Los comandos modifican datos (controles, backlogs, alertas): usar en una BD de pruebas'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por escenario (default: 3)')
+        parser.add_argument('--vista', action='append', help='Vista a medir (se puede repetir). Por defecto todas')
+        parser.add_argument('--comando', action='append', help='Comando a medir (se puede repetir). Por defecto todos')
+        parser.add_argument('--sin-vistas', action='store_true', help='No medir vistas')
+        parser.add_argument('--sin-comandos', action='store_true', help='No medir comandos')
+        parser.add_argument('--arranque', action='store_true',
+                            help='Medir también el arranque en frío (python -X importtime en un proceso nuevo)')
+        parser.add_argument('--particiones', action='store_true',
+                            help='Medir consultas de ventana reciente del historial mientras crece la historia '
+                                 '(datos sintéticos en una transacción que se revierte)')
+        parser.add_argument('--historia-anios', type=int, nargs='+', default=[0, 2, 5, 10],
+                            help='Años de historia sintética agregados en cada paso de --particiones')
+        parser.add_argument('--filas-mes', type=int, default=2000,
+                            help='Movimientos sintéticos por mes de historia (--particiones)')
+        parser.add_argument('--salida', help='Archivo donde guardar el JSON')
+        parser.add_argument('--anexar', action='store_true',
+                            help='Anexar el resultado como una línea JSON al archivo de salida (histórico)')
+        parser.add_argument('--etiqueta', default='', help='Etiqueta libre para identificar la corrida')
+        parser.add_argument('--cargador-plantillas', choices=['actual', *CARGADORES_PLANTILLAS], default='actual',
+                            help='Cargador de plantillas: el de settings (default), con cache o directo (sin cache)')
+
+    def handle(self, *args, **options):
+        repeticiones = max(1, options['repeticiones'])
+        vistas = _vistas()
+        seleccion_vistas = [] if options['sin_vistas'] else (options['vista'] or list(vistas))
+        seleccion_comandos = [] if options['sin_comandos'] else (options['comando'] or list(COMANDOS))
+
+        desconocidas = [v for v in seleccion_vistas if v not in vistas]
+        desconocidas += [c for c in seleccion_comandos if c not in COMANDOS]
+        if desconocidas:
+            raise CommandError(f'❌ Escenarios desconocidos: {", ".join(desconocidas)}')
+
+        resultado = {
+            'fecha': timezone.now().isoformat(),
+            'etiqueta': options['etiqueta'],
+            'commit': self._commit_actual(),
+            'base_datos': connection.vendor,
+            'repeticiones': repeticiones,
+            'cargador_plantillas': options['cargador_plantillas'],
+            'conteos': {modelo.__name__: modelo.objects.count() for modelo in MODELOS_CONTEO},
+            'vistas': {},
+            'comandos': {},
+        }
+
+        if options['arranque']:
+            resultado['arranque'] = self._medir('arranque', self._medir_arranque, repeticiones)
+
+        if options['particiones']:
+            resultado['particiones'] = self._medir(
+                'particiones', self._medir_particiones,
+                repeticiones, sorted(set(options['historia_anios'])), options['filas_mes'],
+            )
+
+        # Sin correos reales durante el benchmark
+        ajustes = {'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend'}
+        if options['cargador_plantillas'] != 'actual':
+            ajustes['TEMPLATES'] = _templates_con_cargadores(CARGADORES_PLANTILLAS[options['cargador_plantillas']])
+
+        with override_settings(**ajustes):
+            if seleccion_vistas:
+                cliente = self._cliente()
+                for nombre in seleccion_vistas:
+                    url_name, parametros, *argumentos = vistas[nombre]
+                    resultado['vistas'][nombre] = self._medir(
+                        nombre, self._medir_vista, cliente, url_name, parametros, repeticiones,
+                        argumentos[0] if argumentos else (),
+                    )
+
+            for nombre in seleccion_comandos:
+                resultado['comandos'][nombre] = self._medir(
+                    nombre, self._medir_comando, nombre, COMANDOS[nombre], repeticiones
+                )
+
+        salida = json.dumps(resultado, indent=None if options['anexar'] else 2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'a' if options['anexar'] else 'w', encoding='utf-8') as archivo:
+                archivo.write(salida + '\n')
+            self.stderr.write(self.style.SUCCESS(f'✅ Resultados guardados en {options["salida"]}'))
+        else:
+            self.stdout.write(salida)
+
+    # ------------------------------------------------------------
+
+    def _cliente(self):
+        usuario, creado = Usuario.objects.get_or_create(
+            email=USUARIO_BENCHMARK,
+            defaults={'nombre': 'Benchmark', 'is_staff': True, 'is_superuser': True},
+        )
+        if creado:
+            usuario.set_unusable_password()
+            usuario.save(update_fields=['password'])
+        cliente = Client(raise_request_exception=True)
+        cliente.force_login(usuario)
+        return cliente
+
+    def _medir(self, nombre, funcion, *args):
+        """Un escenario que falla se registra con su error sin detener el resto"""
+        try:
+            resumen = funcion(*args)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'  ❌ {nombre}: {type(e).__name__}: {e}'))
+            return {'error': f'{type(e).__name__}: {e}'}
+        self._informar(nombre, resumen)
+        return resumen
+
+    def _medir_vista(self, cliente, url_name, parametros, repeticiones, argumentos=()):
+        url = reverse(url_name, args=argumentos)
+        cache.clear()
+        mediciones = []
+        status = None
+
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            with capturar_consultas() as registro:
+                respuesta = cliente.get(url, parametros)
+                # Consumir respuestas en streaming para medir el trabajo completo
+                if respuesta.streaming:
+                    b''.join(respuesta.streaming_content)
+            mediciones.append({
+                'total_ms': round((time.perf_counter() - inicio) * 1000, 2),
+                'consultas': registro.total,
+                'bd_ms': registro.tiempo_bd_ms,
+            })
+            status = respuesta.status_code
+
+        resumen = _resumen(mediciones)
+        resumen['status'] = status
+        return resumen
+
+    def _medir_comando(self, nombre, argumentos, repeticiones):
+        mediciones = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            # Los servicios escriben con print(); se descarta para no mezclarlo con el JSON
+            with capturar_consultas() as registro, redirect_stdout(StringIO()):
+                call_command(nombre, *argumentos, stdout=StringIO(), stderr=StringIO())
+            mediciones.append({
+                'total_ms': round((time.perf_counter() - inicio) * 1000, 2),
+                'consultas': registro.total,
+                'bd_ms': registro.tiempo_bd_ms,
+            })
+
+        return _resumen(mediciones)
+
+    def _medir_arranque(self, repeticiones):
+        """
+        Cada repetición es un intérprete nuevo con -X importtime. Se informa el
+        tiempo total del proceso, el de importación (suma de los módulos de
+        primer nivel), la memoria máxima, los módulos más lentos y qué
+        bibliotecas pesadas y módulos de vistas quedaron cargados.
+        """
+        entorno = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        )}
+        tiempos, importacion, memoria, modulos = [], [], [], {}
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            proceso = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CODIGO_ARRANQUE],
+                cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True, timeout=120,
+            )
+            tiempos.append(round((time.perf_counter() - inicio) * 1000, 2))
+            if proceso.returncode != 0:
+                raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+            modulos = _parsear_importtime(proceso.stderr)
+            memoria_kb, vistas = (proceso.stdout.splitlines() + ['', ''])[:2]
+            memoria.append(round(int(memoria_kb) / 1024, 1))
+            importacion.append(round(sum(a for _, a, nivel in modulos.values() if nivel == 0) / 1000, 2))
+
+        # Módulos del proyecto y de primer nivel más lentos (última repetición)
+        lentos = sorted(
+            ((m, a) for m, (_, a, nivel) in modulos.items() if nivel == 0 or m.startswith(('apps.', 'config.'))),
+            key=lambda x: x[1], reverse=True,
+        )[:15]
+        return {
+            'repeticiones': repeticiones,
+            'primera_ms': tiempos[0],
+            'mediana_ms': round(statistics.median(tiempos), 2),
+            'importacion_ms_mediana': round(statistics.median(importacion), 2),
+            'modulos_importados': len(modulos),
+            'memoria_mb_mediana': statistics.median(memoria),
+            'vistas_cargadas': vistas.split(),
+            'mas_lentos_ms': {m: round(a / 1000, 2) for m, a in lentos},
+            'pesados_cargados': [m for m in MODULOS_PESADOS if m in modulos],
+        }
+
+    def _medir_particiones(self, repeticiones, pasos_anios, filas_mes):
+        """
+        Agrega años de historia sintética (un año por partición, antes de la
+        partición más antigua) a app_historialrepuesto y mide en cada paso las
+        consultas de ventana reciente: tiempo y particiones que se leen. Todo
+        ocurre en una transacción que se revierte al final.
+        """
+        tabla = HistorialRepuesto._meta.db_table
+        if not ServicioParticiones.esta_particionada(tabla):
+            raise RuntimeError(f'{tabla} no está particionada (PostgreSQL + migración 0022)')
+
+        pasos = []
+        with transaction.atomic():
+            repuesto = RepuestoBalancin.objects.order_by('item').first() or RepuestoBalancin.objects.create(
+                item='BENCH-PART', descripcion='Repuesto del benchmark de particiones'
+            )
+            primera = next(p for p in ServicioParticiones.particiones(tabla) if p['desde'] is not None)
+            primer_anio = timezone.localtime(primera['desde']).year
+            agregados = 0
+
+            for anios in pasos_anios:
+                while agregados < anios:
+                    agregados += 1
+                    self._agregar_anio_sintetico(tabla, repuesto.item, primer_anio - agregados, filas_mes)
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(tabla)}')
+
+                consultas = {}
+                for nombre, queryset in _consultas_ventana_reciente().items():
+                    tiempos = []
+                    for _ in range(repeticiones):
+                        inicio = time.perf_counter()
+                        list(queryset.all())
+                        tiempos.append((time.perf_counter() - inicio) * 1000)
+                    plan = json.loads(queryset.explain(format='json', analyze=True))
+                    consultas[nombre] = {
+                        'mediana_ms': round(statistics.median(tiempos), 2),
+                        'particiones_leidas': _particiones_leidas(plan),
+                    }
+
+                pasos.append({
+                    'anios_agregados': anios,
+                    'filas': HistorialRepuesto.objects.count(),
+                    'particiones': len(ServicioParticiones.particiones(tabla)),
+                    'consultas': consultas,
+                })
+            transaction.set_rollback(True)
+
+        return {'repeticiones': repeticiones, 'filas_mes': filas_mes, 'pasos': pasos}
+
+    def _agregar_anio_sintetico(self, tabla, repuesto_id, anio, filas_mes):
+        """Partición del año y filas_mes * 12 movimientos repartidos en el año"""
+        qn = connection.ops.quote_name
+        desde, hasta = inicio_mes(anio, 1), inicio_mes(anio + 1, 1)
+        ServicioParticiones.crear(tabla, f'{tabla}_p{anio}', desde, hasta)
+        filas = filas_mes * 12
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {qn(tabla)} (repuesto_id, tipo_movimiento, cantidad, stock_restante, observaciones, fecha_movimiento)
+                SELECT %s, CASE WHEN n %% 2 = 0 THEN 'entrada' ELSE 'salida' END, 1, 0, '',
+                       %s::timestamptz + (n * (%s::timestamptz - %s::timestamptz) / %s)
+                FROM generate_series(0, %s - 1) AS n
+                """,
+                [repuesto_id, desde, hasta, desde, filas, filas],
+            )
+
+    def _informar(self, nombre, resumen):
+        if nombre == 'particiones':
+            for paso in resumen['pasos']:
+                detalle = ', '.join(
+                    f'{consulta} {datos["mediana_ms"]} ms ({datos["particiones_leidas"]} part.)'
+                    for consulta, datos in paso['consultas'].items()
+                )
+                self.stderr.write(self.style.SUCCESS(
+                    f'  ⏱️ +{paso["anios_agregados"]} años ({paso["filas"]} filas, '
+                    f'{paso["particiones"]} particiones): {detalle}'
+                ))
+            return
+        if nombre == 'arranque':
+            self.stderr.write(self.style.SUCCESS(
+                f'  ⏱️ arranque: mediana {resumen["mediana_ms"]} ms '
+                f'({resumen["importacion_ms_mediana"]} ms importando {resumen["modulos_importados"]} módulos), '
+                f'{resumen["memoria_mb_mediana"]} MB, '
+                f'pesados: {", ".join(resumen["pesados_cargados"]) or "ninguno"}'
+            ))
+            return
+        estilo = self.style.WARNING if resumen.get('status', 200) != 200 else self.style.SUCCESS
+        self.stderr.write(estilo(
+            f'  ⏱️ {nombre}: mediana {resumen["mediana_ms"]} ms, '
+            f'{resumen["consultas"]} consultas ({resumen["bd_ms_mediana"]} ms BD)'
+        ))
+
+    def _commit_actual(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
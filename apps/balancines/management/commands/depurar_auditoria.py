@@ -0,0 +1,96 @@
+# apps/balancines/management/commands/depurar_auditoria.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...models import ActivityLog
+from ...services.particiones import ServicioParticiones, inicio_mes
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra los meses completos de ActivityLog anteriores a la retención '
+        '(settings.AUDITORIA_RETENCION_MESES): elimina las particiones enteras y el resto mes por mes en lotes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--meses',
+            type=int,
+            help='Meses completos a conservar además del actual (por defecto AUDITORIA_RETENCION_MESES)'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=5000,
+            help='Registros borrados por transacción'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo contar los registros de cada mes, sin borrar'
+        )
+
+    def handle(self, *args, **options):
+        meses = options['meses']
+        if meses is None:
+            meses = getattr(settings, 'AUDITORIA_RETENCION_MESES', 24)
+        if meses < 0 or options['lote'] < 1:
+            raise CommandError('❌ --meses debe ser >= 0 y --lote >= 1')
+
+        hoy = timezone.localdate()
+        limite = inicio_mes(hoy.year, hoy.month - meses)
+        if ServicioParticiones.esta_particionada(ActivityLog._meta.db_table):
+            self._eliminar_particiones(limite, options['dry_run'])
+
+        mas_antiguo = ActivityLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        if mas_antiguo is None or mas_antiguo >= limite:
+            self.stdout.write(self.style.SUCCESS(f"✅ No quedan registros anteriores a {limite:%m/%Y}"))
+            return
+
+        mas_antiguo = timezone.localtime(mas_antiguo)
+        desde = inicio_mes(mas_antiguo.year, mas_antiguo.month)
+        total = 0
+        while desde < limite:
+            hasta = inicio_mes(desde.year, desde.month + 1)
+            del_mes = ActivityLog.objects.recientes(desde=desde, hasta=hasta)
+            if options['dry_run']:
+                borrados = del_mes.count()
+            else:
+                borrados = self._borrar_en_lotes(del_mes, options['lote'])
+            if borrados:
+                self.stdout.write(f"  {desde:%m/%Y}: {borrados} registros")
+            total += borrados
+            desde = hasta
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Dry-run: {total} registros anteriores a {limite:%m/%Y} se borrarían"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {total} registros anteriores a {limite:%m/%Y} borrados"))
+
+    def _eliminar_particiones(self, limite, dry_run):
+        """Las particiones que terminan antes del límite se eliminan sin recorrer sus filas"""
+        tabla = ActivityLog._meta.db_table
+        if dry_run:
+            particiones = [
+                p['nombre'] for p in ServicioParticiones.particiones(tabla)
+                if p['hasta'] is not None and p['hasta'] <= limite
+            ]
+            if particiones:
+                self.stdout.write(f"  Se eliminarían las particiones {', '.join(particiones)}")
+            return
+        eliminadas = ServicioParticiones.retirar_anteriores(tabla, limite, accion='eliminar')
+        if eliminadas:
+            self.stdout.write(f"  Particiones eliminadas: {', '.join(eliminadas)}")
+
+    def _borrar_en_lotes(self, queryset, lote):
+        """DELETE cortos (autocommit): no bloquean la tabla ni generan todo el WAL de una vez"""
+        borrados = 0
+        while True:
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:lote])
+            if not ids:
+                return borrados
+            borrados += ActivityLog.objects.filter(pk__in=ids).delete()[0]
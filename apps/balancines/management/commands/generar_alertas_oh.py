@@ -16,6 +16,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Forzar generación aunque ya existan alertas'
         )
+        parser.add_argument(
+            '--completa',
+            action='store_true',
+            help='Evaluar todos los balancines bajo el umbral, no solo los de evaluación pendiente'
+        )
     
     def handle(self, *args, **options):
         inicio = timezone.now()
@@ -47,14 +52,17 @@ class Command(BaseCommand):
                 )
         else:
             resultados = ServicioAlertasOH.generar_todas_las_alertas(
-                forzar=options['forzar']
+                forzar=options['forzar'],
+                completa=options['completa']
             )
             
             duracion = (timezone.now() - inicio).total_seconds()
             
             self.stdout.write(self.style.SUCCESS(
                 f'\n📊 RESULTADOS:\n'
-                f'   Procesados: {resultados["procesados"]} balancines\n'
+                f'   Procesados: {resultados["procesados"]} balancines'
+                f'{" (evaluación pendiente)" if not options["completa"] else ""}\n'
+                f'   Omitidos (VERDE): {resultados.get("omitidos_verde", "-")} balancines\n'
                 f'   Alertas generadas: {resultados["alertas_generadas"]}\n'
                 f'   Por nivel:\n'
                 f'      CRITICAS: {resultados["alertas_por_nivel"].get("CRITICA", 0)}\n'
@@ -0,0 +1,308 @@
+# apps/balancines/management/commands/generar_flota_sintetica.py
+
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.balancines.models import (
+    Linea, Seccion, Torre, TipoBalancin, BalancinIndividual, HistorialOH,
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+    ConfiguracionRepuestosPorTipo,
+)
+from apps.balancines.services.tablero_oh import ServicioTableroOH
+from apps.balancines.versiones import incrementar
+
+
+# Tamaños base (escala 1), similares a backup.sql
+BASE = {
+    'lineas': 10,
+    'torres_por_linea': 28,
+    'tipos': 20,
+    'repuestos': 200,
+    'adicionales': 55,
+    'repuestos_por_tipo': 15,
+    'movimientos_por_repuesto': 6,
+}
+
+COLORES = ['danger', 'warning', 'success', 'primary', 'info', 'purple', 'brown', 'secondary', 'orange', 'white-custom']
+RANGOS_OH = [30000, 35000, 40000]
+INICIO_OC = date(2014, 5, 1)
+LOTE = 5000
+
+# La escala multiplica líneas y catálogos; el resto se mantiene salvo que se indique
+ESCALABLES = ('lineas', 'tipos', 'repuestos', 'adicionales')
+
+
+class Command(BaseCommand):
+    help = 'Genera una flota sintética (líneas, torres, balancines, OH, repuestos y movimientos) para benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help='Factor de escala sobre el tamaño de backup.sql (default: 1)')
+        parser.add_argument('--lineas', type=int, help='Número de líneas (sobrescribe la escala)')
+        parser.add_argument('--torres-por-linea', type=int, help='Torres por línea (default: 28)')
+        parser.add_argument('--tipos', type=int, help='Tipos de balancín (sobrescribe la escala)')
+        parser.add_argument('--repuestos', type=int, help='Repuestos de balancín (sobrescribe la escala)')
+        parser.add_argument('--adicionales', type=int, help='Repuestos adicionales (sobrescribe la escala)')
+        parser.add_argument('--movimientos-por-repuesto', type=int,
+                            help='Movimientos de historial por repuesto (default: 6)')
+        parser.add_argument('--anios', type=int, default=10, help='Años de historial OH (default: 10)')
+        parser.add_argument('--prefijo', default='SIN', help='Prefijo de los datos generados (default: SIN)')
+        parser.add_argument('--semilla', type=int, default=42, help='Semilla aleatoria (default: 42)')
+        parser.add_argument('--limpiar', action='store_true',
+                            help='Eliminar los datos sintéticos con el prefijo antes de generar')
+        parser.add_argument('--solo-limpiar', action='store_true',
+                            help='Eliminar los datos sintéticos con el prefijo y salir')
+
+    def handle(self, *args, **options):
+        prefijo = options['prefijo'].strip().upper()
+        if not prefijo:
+            raise CommandError('❌ El prefijo no puede estar vacío')
+
+        if options['limpiar'] or options['solo_limpiar']:
+            self._limpiar(prefijo)
+            if options['solo_limpiar']:
+                return
+
+        if Linea.objects.filter(nombre__startswith=f'{prefijo} ').exists():
+            raise CommandError(f'❌ Ya existen datos con el prefijo "{prefijo}". Use --limpiar')
+
+        escala = options['escala']
+        tam = {
+            clave: max(1, round(valor * escala)) if clave in ESCALABLES else valor
+            for clave, valor in BASE.items()
+        }
+        for clave in tam:
+            if options.get(clave) is not None:
+                tam[clave] = options[clave]
+
+        self.random = random.Random(options['semilla'])
+        self.hoy = timezone.localdate()
+        self.anios = options['anios']
+
+        self.stdout.write(f'🏗️ Generando flota sintética "{prefijo}" (escala {escala}): {tam}, {self.anios} años de OH')
+        inicio = time.perf_counter()
+
+        with transaction.atomic():
+            tipos = self._generar_tipos(prefijo, tam['tipos'])
+            torres = self._generar_torres(prefijo, tam['lineas'], tam['torres_por_linea'], tipos)
+            balancines = self._generar_balancines(prefijo, torres)
+            total_oh = self._generar_historial_oh(balancines)
+            repuestos, adicionales = self._generar_repuestos(prefijo, tam['repuestos'], tam['adicionales'])
+            total_config = self._generar_configuracion(tipos, repuestos, tam['repuestos_por_tipo'])
+            total_mov = self._generar_movimientos(repuestos, adicionales, tam['movimientos_por_repuesto'])
+            # bulk_create no dispara señales
+            incrementar(
+                TipoBalancin, Linea, Torre, BalancinIndividual, HistorialOH,
+                RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+            )
+            ServicioTableroOH.invalidar_todo()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Flota generada en {time.perf_counter() - inicio:.1f}s: '
+            f'{len(torres)} torres, {len(balancines)} balancines, {total_oh} OH, '
+            f'{len(repuestos)} repuestos, {len(adicionales)} adicionales, '
+            f'{total_config} configuraciones, {total_mov} movimientos'
+        ))
+        self.stdout.write('💡 Ejecute inicializar_controles_horas para crear los controles de horas')
+
+    # ------------------------------------------------------------
+
+    def _limpiar(self, prefijo):
+        self.stdout.write(f'🧹 Eliminando datos sintéticos "{prefijo}"...')
+        with transaction.atomic():
+            ConfiguracionRepuestosPorTipo.objects.filter(tipo_balancin__codigo__startswith=f'{prefijo}-').delete()
+            HistorialOH.objects.filter(balancin__codigo__startswith=f'{prefijo}-').delete()
+            BalancinIndividual.objects.filter(codigo__startswith=f'{prefijo}-').delete()
+            Torre.objects.filter(linea__nombre__startswith=f'{prefijo} ').delete()
+            Linea.objects.filter(nombre__startswith=f'{prefijo} ').delete()
+            Seccion.objects.filter(nombre=prefijo).delete()
+            TipoBalancin.objects.filter(codigo__startswith=f'{prefijo}-').delete()
+            HistorialRepuesto.objects.filter(repuesto__item__startswith=f'{prefijo}-').delete()
+            HistorialAdicional.objects.filter(repuesto__item__startswith=f'{prefijo}-').delete()
+            RepuestoBalancin.objects.filter(item__startswith=f'{prefijo}-').delete()
+            RepuestoAdicional.objects.filter(item__startswith=f'{prefijo}-').delete()
+        self.stdout.write(self.style.SUCCESS('✅ Datos sintéticos eliminados'))
+
+    def _generar_tipos(self, prefijo, cantidad):
+        tipos = [
+            TipoBalancin(
+                codigo=f'{prefijo}-{self.random.choice([4, 6, 8, 10, 12, 16])}T-{n:03d}',
+                tipo=self.random.choice(TipoBalancin.Tipo.values),
+            )
+            for n in range(1, cantidad + 1)
+        ]
+        TipoBalancin.objects.bulk_create(tipos, batch_size=LOTE)
+        return [t.codigo for t in tipos]
+
+    def _generar_torres(self, prefijo, lineas, torres_por_linea, tipos):
+        seccion, _ = Seccion.objects.get_or_create(nombre=prefijo)
+        Linea.objects.bulk_create([
+            Linea(
+                nombre=f'{prefijo} {n:02d}',
+                color=COLORES[(n - 1) % len(COLORES)],
+                descripcion=f'Línea sintética {n}',
+            )
+            for n in range(1, lineas + 1)
+        ], batch_size=LOTE)
+        # bulk_create solo devuelve PKs en PostgreSQL
+        objetos_lineas = list(Linea.objects.filter(nombre__startswith=f'{prefijo} '))
+
+        torres = []
+        for linea in objetos_lineas:
+            for n in range(1, torres_por_linea + 1):
+                tipo = self.random.choice(tipos)
+                torres.append(Torre(
+                    linea=linea,
+                    seccion=seccion,
+                    numero_torre=str(n),
+                    tipo_balancin_ascendente=tipo,
+                    tipo_balancin_descendente=tipo if self.random.random() < 0.8 else self.random.choice(tipos),
+                ))
+        Torre.objects.bulk_create(torres, batch_size=LOTE)
+        return list(Torre.objects.filter(linea__in=objetos_lineas).select_related('linea'))
+
+    def _generar_balancines(self, prefijo, torres):
+        balancines = []
+        for torre in torres:
+            for sentido in (BalancinIndividual.SentidoBalancin.ASCENDENTE,
+                            BalancinIndividual.SentidoBalancin.DESCENDENTE):
+                balancines.append(BalancinIndividual(
+                    codigo=f'{prefijo}-{torre.linea_id}-{torre.numero_torre}-{sentido[0]}',
+                    torre=torre,
+                    sentido=sentido,
+                    rango_horas_cambio_oh=self.random.choice(RANGOS_OH),
+                    estado=self.random.choices(
+                        ['OPERANDO', 'MANTENIMIENTO', 'OH_PENDIENTE'], weights=[90, 5, 5]
+                    )[0],
+                ))
+        BalancinIndividual.objects.bulk_create(balancines, batch_size=LOTE)
+        return balancines
+
+    def _generar_historial_oh(self, balancines):
+        """OH cada 1-3 años durante los últimos N años, con campos derivados ya calculados"""
+        inicio = self.hoy - timedelta(days=365 * self.anios)
+        lote = []
+        total = 0
+
+        for balancin in balancines:
+            torre = balancin.torre
+            tipo = (torre.tipo_balancin_ascendente if balancin.sentido == 'ASCENDENTE'
+                    else torre.tipo_balancin_descendente)
+            fecha_anterior = inicio
+            fecha = inicio + timedelta(days=self.random.randint(0, 365))
+            numero = 0
+
+            while fecha <= self.hoy:
+                numero += 1
+                horas = (fecha - fecha_anterior).days * 16
+                lote.append(HistorialOH(
+                    balancin=balancin,
+                    linea_nombre=torre.linea.nombre,
+                    torre_numero=torre.numero_torre,
+                    sentido=balancin.sentido,
+                    tipo_balancin=tipo or '',
+                    rango_oh_horas=balancin.rango_horas_cambio_oh,
+                    inicio_oc=INICIO_OC,
+                    horas_promedio_dia=16,
+                    numero_oh=numero,
+                    fecha_oh=fecha,
+                    horas_operacion=horas,
+                    backlog=balancin.rango_horas_cambio_oh - horas,
+                    anio=fecha.year,
+                    dia_semana=fecha.strftime('%A'),
+                    observaciones=f'OH sintético #{numero}',
+                    usuario_registro='generar_flota_sintetica',
+                ))
+                fecha_anterior = fecha
+                fecha = fecha + timedelta(days=self.random.randint(365, 365 * 3))
+
+            if len(lote) >= LOTE:
+                HistorialOH.objects.bulk_create(lote, batch_size=LOTE)
+                total += len(lote)
+                lote = []
+
+        HistorialOH.objects.bulk_create(lote, batch_size=LOTE)
+        return total + len(lote)
+
+    def _generar_repuestos(self, prefijo, cantidad_repuestos, cantidad_adicionales):
+        repuestos = [
+            RepuestoBalancin(
+                item=f'{prefijo}-R{n:06d}',
+                descripcion=f'Repuesto sintético {n}',
+                cantidad=self.random.randint(0, 60),
+                ubicacion=f'Estante {self.random.randint(1, 40)}',
+            )
+            for n in range(1, cantidad_repuestos + 1)
+        ]
+        adicionales = [
+            RepuestoAdicional(
+                item=f'{prefijo}-A{n:06d}',
+                descripcion=f'Repuesto adicional sintético {n}',
+                cantidad=self.random.randint(0, 60),
+                ubicacion=f'Estante {self.random.randint(1, 40)}',
+            )
+            for n in range(1, cantidad_adicionales + 1)
+        ]
+        RepuestoBalancin.objects.bulk_create(repuestos, batch_size=LOTE)
+        RepuestoAdicional.objects.bulk_create(adicionales, batch_size=LOTE)
+        return repuestos, adicionales
+
+    def _generar_configuracion(self, tipos, repuestos, repuestos_por_tipo):
+        grupos = [g for g, _ in ConfiguracionRepuestosPorTipo.GRUPO_CHOICES]
+        configuraciones = []
+        for codigo in tipos:
+            for orden, repuesto in enumerate(
+                self.random.sample(repuestos, min(repuestos_por_tipo, len(repuestos))), start=1
+            ):
+                configuraciones.append(ConfiguracionRepuestosPorTipo(
+                    tipo_balancin_id=codigo,
+                    repuesto=repuesto,
+                    id_original=str(10000000 + self.random.randint(0, 9999999)),
+                    descripcion=repuesto.descripcion,
+                    cantidad_por_balancin=self.random.randint(1, 8),
+                    grupo=self.random.choice(grupos),
+                    orden=orden,
+                ))
+        ConfiguracionRepuestosPorTipo.objects.bulk_create(configuraciones, batch_size=LOTE)
+        return len(configuraciones)
+
+    def _fecha_aleatoria(self):
+        dias = self.random.randint(0, 365 * self.anios)
+        momento = datetime.combine(self.hoy - timedelta(days=dias), datetime.min.time()) + timedelta(
+            seconds=self.random.randint(6 * 3600, 22 * 3600)
+        )
+        return timezone.make_aware(momento)
+
+    def _generar_movimientos(self, repuestos, adicionales, por_repuesto):
+        historial = [
+            HistorialRepuesto(
+                repuesto=repuesto,
+                tipo_movimiento=self.random.choice(['entrada', 'salida']),
+                cantidad=self.random.randint(1, 10),
+                stock_restante=repuesto.cantidad,
+                observaciones='Movimiento sintético',
+                fecha_movimiento=self._fecha_aleatoria(),
+            )
+            for repuesto in repuestos
+            for _ in range(por_repuesto)
+        ]
+        historial_adicional = [
+            HistorialAdicional(
+                repuesto=repuesto,
+                tipo_movimiento=self.random.choice(['entrada', 'salida', 'actualizacion']),
+                cantidad=self.random.randint(1, 10),
+                stock_restante=repuesto.cantidad,
+                observaciones='Movimiento sintético',
+                fecha_movimiento=self._fecha_aleatoria(),
+            )
+            for repuesto in adicionales
+            for _ in range(por_repuesto)
+        ]
+        HistorialRepuesto.objects.bulk_create(historial, batch_size=LOTE)
+        HistorialAdicional.objects.bulk_create(historial_adicional, batch_size=LOTE)
+        return len(historial) + len(historial_adicional)
@@ -0,0 +1,122 @@
+# apps/balancines/management/commands/gestionar_particiones.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...services.particiones import ServicioParticiones, inicio_mes
+
+
+class Command(BaseCommand):
+    help = (
+        'Mantiene las particiones por mes de las tablas de settings.PARTICIONES_TABLAS: crea las de '
+        'los próximos meses y saca de la tabla (archiva, separa o elimina) las anteriores a la retención'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tabla',
+            action='append',
+            help='Tabla a mantener (se puede repetir). Por defecto todas las de PARTICIONES_TABLAS'
+        )
+        parser.add_argument(
+            '--meses-futuros',
+            type=int,
+            help='Meses a crear por adelantado además del actual (por defecto PARTICIONES_MESES_FUTUROS)'
+        )
+        parser.add_argument(
+            '--accion',
+            choices=ServicioParticiones.ACCIONES,
+            help='Qué hacer con las particiones anteriores a la retención (por defecto PARTICIONES_ACCION_RETIRO)'
+        )
+        parser.add_argument(
+            '--listar',
+            action='store_true',
+            help='Solo listar las particiones de cada tabla con sus filas estimadas'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostrar qué se crearía y qué se retiraría, sin modificar'
+        )
+
+    def handle(self, *args, **options):
+        tablas = getattr(settings, 'PARTICIONES_TABLAS', {})
+        seleccion = options['tabla'] or list(tablas)
+        desconocidas = [tabla for tabla in seleccion if tabla not in tablas]
+        if desconocidas:
+            raise CommandError(f'❌ Tablas fuera de PARTICIONES_TABLAS: {", ".join(desconocidas)}')
+
+        meses_futuros = options['meses_futuros']
+        if meses_futuros is None:
+            meses_futuros = getattr(settings, 'PARTICIONES_MESES_FUTUROS', 3)
+        accion = options['accion'] or getattr(settings, 'PARTICIONES_ACCION_RETIRO', 'archivar')
+
+        hoy = timezone.localdate()
+        hasta = timezone.localtime(inicio_mes(hoy.year, hoy.month + meses_futuros))
+
+        for tabla in seleccion:
+            if not ServicioParticiones.esta_particionada(tabla):
+                self.stdout.write(self.style.WARNING(f'⚠️ {tabla} no está particionada (¿migración 0022?)'))
+                continue
+
+            if options['listar']:
+                self._listar(tabla)
+                continue
+
+            self.stdout.write(f'📦 {tabla}')
+            self._crear(tabla, hasta, options['dry_run'])
+            if tablas[tabla] is not None:
+                limite = inicio_mes(hoy.year, hoy.month - tablas[tabla])
+                self._retirar(tabla, limite, accion, options['dry_run'])
+
+            en_default = ServicioParticiones.filas_default(tabla)
+            if en_default:
+                self.stdout.write(self.style.WARNING(
+                    f'  ⚠️ {en_default} filas en {tabla}_pdefault (fechas sin partición): '
+                    f'se moverán al crear la partición de su mes'
+                ))
+
+    def _listar(self, tabla):
+        particiones = ServicioParticiones.particiones(tabla)
+        self.stdout.write(f'📦 {tabla}: {len(particiones)} particiones')
+        for particion in particiones:
+            rango = (
+                f'{particion["desde"]:%d/%m/%Y} - {particion["hasta"]:%d/%m/%Y}'
+                if particion['desde'] else 'DEFAULT'
+            )
+            self.stdout.write(f'  {particion["nombre"]}: {rango}, ~{particion["filas_estimadas"]} filas')
+
+    def _crear(self, tabla, hasta, dry_run):
+        if dry_run:
+            particiones = [p for p in ServicioParticiones.particiones(tabla) if p['hasta']]
+            ultima = particiones[-1]['hasta'] if particiones else None
+            if ultima is None or ultima <= hasta:
+                self.stdout.write(f'  Se crearían particiones mensuales hasta {hasta:%m/%Y}')
+            else:
+                self.stdout.write(f'  Particiones al día hasta {hasta:%m/%Y}')
+            return
+
+        creadas = ServicioParticiones.crear_meses(tabla, hasta)
+        if creadas:
+            self.stdout.write(self.style.SUCCESS(f'  ✅ Creadas: {", ".join(creadas)}'))
+        else:
+            self.stdout.write(f'  Particiones al día hasta {hasta:%m/%Y}')
+
+    def _retirar(self, tabla, limite, accion, dry_run):
+        if dry_run:
+            anteriores = [
+                p['nombre'] for p in ServicioParticiones.particiones(tabla)
+                if p['hasta'] is not None and p['hasta'] <= limite
+            ]
+            if anteriores:
+                self.stdout.write(self.style.WARNING(
+                    f'  ⚠️ Dry-run: se aplicaría "{accion}" a {", ".join(anteriores)}'
+                ))
+            return
+
+        retiradas = ServicioParticiones.retirar_anteriores(tabla, limite, accion)
+        if retiradas:
+            self.stdout.write(self.style.SUCCESS(
+                f'  ✅ {accion.capitalize()} (anteriores a {limite:%m/%Y}): {", ".join(retiradas)}'
+            ))
@@ -1,54 +1,87 @@
 # apps/balancines/management/commands/inicializar_controles_horas.py
 
+import time
+
 from django.core.management.base import BaseCommand
-from django.utils import timezone  # ← AGREGAR ESTA IMPORTACIÓN
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
 from apps.balancines.models import BalancinIndividual, ControlHorasBalancin, HistorialOH
+from apps.balancines.services.tablero_oh import ServicioTableroOH
+from apps.balancines.versiones import incrementar
 
 
 class Command(BaseCommand):
     help = 'Inicializa los registros de ControlHorasBalancin para todos los balancines'
-    
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Tamaño de lote para bulk_create/bulk_update (default: 1000)'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("🔄 Inicializando controles de horas para todos los balancines...")
-        
-        total = 0
-        creados = 0
-        actualizados = 0
-        
-        for balancin in BalancinIndividual.objects.all():
-            total += 1
-            
-            # Obtener el último OH
-            ultimo_oh = HistorialOH.objects.filter(balancin=balancin).order_by('-fecha_oh').first()
-            
-            if ultimo_oh:
-                horas_base = ultimo_oh.horas_operacion
-                fecha_base = ultimo_oh.fecha_oh
-            else:
-                horas_base = 0
-                fecha_base = timezone.now().date()
-            
-            control, creado = ControlHorasBalancin.objects.get_or_create(
+        inicio = time.perf_counter()
+        lote = options['lote']
+        hoy = timezone.now().date()
+
+        # Último OH de cada balancín en una sola consulta
+        ultimo_oh = HistorialOH.objects.filter(
+            balancin=OuterRef('pk')
+        ).order_by('-fecha_oh', '-numero_oh').values('id')[:1]
+
+        # La torre da la línea, y con ella el calendario de operación de las horas
+        balancines = list(
+            BalancinIndividual.objects.select_related('torre')
+            .only('codigo', 'rango_horas_cambio_oh', 'torre__linea')
+            .annotate(ultimo_oh_id=Subquery(ultimo_oh))
+        )
+        ohs = HistorialOH.objects.only('id', 'fecha_oh', 'horas_operacion').in_bulk(
+            [b.ultimo_oh_id for b in balancines if b.ultimo_oh_id]
+        )
+        existentes = set(ControlHorasBalancin.objects.values_list('balancin_id', flat=True))
+
+        # Controles nuevos: base en el último OH (o 0 horas desde hoy)
+        nuevos = []
+        for balancin in balancines:
+            if balancin.codigo in existentes:
+                continue
+            oh = ohs.get(balancin.ultimo_oh_id)
+            control = ControlHorasBalancin(
                 balancin=balancin,
-                defaults={
-                    'horas_base': horas_base,
-                    'fecha_base': fecha_base,
-                    'ultimo_oh_relacionado': ultimo_oh,
-                }
+                horas_base=(oh.horas_operacion or 0) if oh else 0,
+                fecha_base=oh.fecha_oh if oh else hoy,
+                ultimo_oh_relacionado=oh,
             )
-            
-            if creado:
-                creados += 1
-                self.stdout.write(f"  ✅ Creado: {balancin.codigo}")
-            else:
-                # Recalcular horas actuales
-                control.recalcular_horas()
-                control.save()
-                actualizados += 1
-                self.stdout.write(f"  🔄 Actualizado: {balancin.codigo}")
-        
+            control.recalcular_horas(hoy)
+            nuevos.append(control)
+
+        # Controles existentes: solo se recalculan las horas en vivo
+        ahora = timezone.now()
+        controles = list(
+            ControlHorasBalancin.objects.select_related('balancin__torre').only(
+                'id', 'horas_base', 'fecha_base', 'horas_actuales', 'backlog_actual',
+                'balancin__codigo', 'balancin__rango_horas_cambio_oh', 'balancin__torre__linea',
+            )
+        )
+        for control in controles:
+            control.recalcular_horas(hoy)
+            # bulk_update no aplica auto_now
+            control.ultima_actualizacion = ahora
+
+        with transaction.atomic():
+            ControlHorasBalancin.objects.bulk_create(nuevos, batch_size=lote, ignore_conflicts=True)
+            ControlHorasBalancin.objects.bulk_update(
+                controles, ['horas_actuales', 'backlog_actual', 'ultima_actualizacion'], batch_size=lote
+            )
+            incrementar(ControlHorasBalancin)
+            ServicioTableroOH.invalidar_todo()
+
         self.stdout.write(self.style.SUCCESS(
-            f"\n✅ Procesados: {total} balancines"
+            f"\n✅ Procesados: {len(balancines)} balancines en {time.perf_counter() - inicio:.2f}s"
         ))
-        self.stdout.write(f"   Nuevos controles creados: {creados}")
-        self.stdout.write(f"   Controles actualizados: {actualizados}")
\ No newline at end of file
+        self.stdout.write(f"   Nuevos controles creados: {len(nuevos)}")
+        self.stdout.write(f"   Controles actualizados: {len(controles)}")
@@ -1,37 +1,73 @@
-# Crear el comando
+# apps/balancines/management/commands/recalcular_backlogs.py
+
+import time
+
 from django.core.management.base import BaseCommand
+
 from ...models import HistorialOH
+from ...services.campos_derivados import ServicioCamposDerivados
+
 
 class Command(BaseCommand):
-    help = 'Recalcula todos los backlogs de HistorialOH basado en rango_oh_horas - horas_operacion'
-    
+    help = 'Recalcula los campos derivados de HistorialOH (backlog = rango_oh_horas - horas_operacion, anio, dia_semana)'
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--balancin',
             type=str,
             help='Recalcular solo para un balancín específico'
         )
-    
+        parser.add_argument(
+            '--campo',
+            action='append',
+            choices=list(ServicioCamposDerivados.CAMPOS),
+            help='Campo a recalcular (se puede repetir). Por defecto solo backlog'
+        )
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Recalcular todos los campos derivados (backlog, anio, dia_semana)'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=0,
+            help='Procesar por rangos de ID de este tamaño, confirmando cada rango (tablas grandes)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo contar los registros desactualizados, sin modificar'
+        )
+
     def handle(self, *args, **options):
         historiales = HistorialOH.objects.all()
-        
+
         if options['balancin']:
             historiales = historiales.filter(balancin__codigo=options['balancin'])
-        
-        total = historiales.count()
-        actualizados = 0
-        
-        self.stdout.write(f"Recalculando backlogs para {total} registros...")
-        
-        for h in historiales:
-            if h.horas_operacion is not None and h.rango_oh_horas:
-                nuevo_backlog = h.rango_oh_horas - h.horas_operacion
-                if h.backlog != nuevo_backlog:
-                    self.stdout.write(f"  ID {h.id}: {h.backlog} → {nuevo_backlog} (rango={h.rango_oh_horas}, horas={h.horas_operacion})")
-                    h.backlog = nuevo_backlog
-                    h.save(update_fields=['backlog'])
-                    actualizados += 1
-        
+
+        campos = None if options['todos'] else (options['campo'] or ['backlog'])
+        inicio = time.perf_counter()
+
+        conteo = ServicioCamposDerivados.contar_desactualizados(historiales, campos)
+        total = conteo.pop('total')
+        self.stdout.write(f"Revisando {total} registros de HistorialOH...")
+        for campo, cantidad in conteo.items():
+            self.stdout.write(f"  {campo}: {cantidad} desactualizados")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("⚠️ Dry-run: no se modificó ningún registro"))
+            return
+
+        if not any(conteo.values()):
+            self.stdout.write(self.style.SUCCESS(f"✅ Todos los campos están al día ({total} registros)"))
+            return
+
+        actualizados = ServicioCamposDerivados.recalcular(
+            historiales, campos=list(conteo), lote=options['lote'] or None
+        )
+
+        detalle = ', '.join(f"{campo}: {filas}" for campo, filas in actualizados.items())
         self.stdout.write(self.style.SUCCESS(
-            f"✅ {actualizados} backlogs actualizados de {total} registros"
+            f"✅ Actualizados de {total} registros ({detalle}) en {time.perf_counter() - inicio:.2f}s"
         ))
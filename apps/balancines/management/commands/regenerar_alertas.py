@@ -1,18 +1,22 @@
 # apps/balancines/management/commands/regenerar_alertas.py
 
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 from apps.balancines.models import AlertaOH
 from apps.balancines.services.alertas_oh import ServicioAlertasOH
+from apps.balancines.services.archivo import ServicioArchivo
 
 
 class Command(BaseCommand):
-    help = 'Elimina todas las alertas existentes y las regenera desde cero con envío de emails'
+    help = (
+        'Archiva las alertas resueltas, elimina las activas y las regenera desde cero con envío de emails'
+    )
     
     def add_arguments(self, parser):
         parser.add_argument(
             '--confirmar',
             action='store_true',
-            help='Confirma que quieres eliminar todas las alertas existentes'
+            help='Confirma que quieres eliminar las alertas activas existentes'
         )
         parser.add_argument(
             '--no-email',
@@ -30,32 +34,39 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING('⚠️  REGENERACIÓN DE ALERTAS ⚠️'))
         self.stdout.write(self.style.WARNING('=' * 60))
         
-        # Contar alertas existentes
-        total_existentes = AlertaOH.objects.count()
-        self.stdout.write(f"\n📊 Alertas existentes: {total_existentes}")
+        # Contar alertas existentes (las resueltas no se borran: van al archivo en frío)
+        activas = AlertaOH.objects.filter(resuelta=False)
+        total_existentes = activas.count()
+        total_resueltas = AlertaOH.objects.filter(resuelta=True).count()
+        self.stdout.write(f"\n📊 Alertas activas: {total_existentes}, resueltas: {total_resueltas}")
         
         # Confirmar si no se pasó el flag
         if not options['confirmar']:
-            self.stdout.write(self.style.ERROR('\n❌ Para eliminar todas las alertas, ejecuta con --confirmar'))
+            self.stdout.write(self.style.ERROR('\n❌ Para eliminar las alertas activas, ejecuta con --confirmar'))
             self.stdout.write(self.style.WARNING('   Ejemplo: python manage.py regenerar_alertas --confirmar'))
             return
         
         # Confirmación adicional (excepto si es --no-input)
         if not options['no_input'] and total_existentes > 0:
-            self.stdout.write(self.style.WARNING(f'\n⚠️  Se eliminarán {total_existentes} alertas existentes.'))
+            self.stdout.write(self.style.WARNING(f'\n⚠️  Se eliminarán {total_existentes} alertas activas.'))
             confirmacion = input('¿Estás seguro? (escribe "SI" para continuar): ')
             
             if confirmacion != 'SI':
                 self.stdout.write(self.style.ERROR('Operación cancelada'))
                 return
         
-        # Eliminar todas las alertas
+        # Archivar las resueltas (cualquier antigüedad) y eliminar las activas
+        if total_resueltas > 0:
+            self.stdout.write('\n📦 Archivando alertas resueltas...')
+            archivadas = ServicioArchivo.archivar('balancines.AlertaOH', limite=timezone.now())
+            self.stdout.write(self.style.SUCCESS(f'✅ {archivadas} alertas resueltas archivadas'))
+        
         if total_existentes > 0:
-            self.stdout.write('\n🗑️  Eliminando alertas existentes...')
-            AlertaOH.objects.all().delete()
+            self.stdout.write('\n🗑️  Eliminando alertas activas...')
+            activas.delete()
             self.stdout.write(self.style.SUCCESS(f'✅ {total_existentes} alertas eliminadas'))
         else:
-            self.stdout.write('\n✅ No hay alertas para eliminar')
+            self.stdout.write('\n✅ No hay alertas activas para eliminar')
         
         # Regenerar alertas
         self.stdout.write('\n🔍 Generando nuevas alertas...')
@@ -69,7 +80,8 @@ class Command(BaseCommand):
         
         resultados = ServicioAlertasOH.generar_todas_las_alertas(
             forzar=True,
-            enviar_email=enviar_email
+            enviar_email=enviar_email,
+            completa=True
         )
         
         # Mostrar resultados
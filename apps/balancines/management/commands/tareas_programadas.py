@@ -0,0 +1,81 @@
+# apps/balancines/management/commands/tareas_programadas.py
+
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+
+def _proxima_ejecucion(hora, ahora):
+    """Próximo datetime (hora local) en que corresponde ejecutar una tarea diaria 'HH:MM'"""
+    horas, minutos = (int(parte) for parte in hora.split(':'))
+    proxima = ahora.replace(hour=horas, minute=minutos, second=0, microsecond=0)
+    if proxima <= ahora:
+        proxima += timedelta(days=1)
+    return proxima
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta en segundo plano los comandos de settings.TAREAS_PROGRAMADAS a su hora diaria '
+        '(servicio "tareas" de docker compose). Reemplaza generar_alertas_oh al arrancar el servidor'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--al-iniciar', action='store_true',
+                            help='Ejecutar todas las tareas una vez al iniciar, antes de esperar su hora')
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Ejecutar todas las tareas una vez y salir (para cron del sistema)')
+
+    def handle(self, *args, **options):
+        tareas = getattr(settings, 'TAREAS_PROGRAMADAS', {})
+        if not tareas:
+            raise CommandError('❌ No hay tareas en settings.TAREAS_PROGRAMADAS')
+
+        for nombre, hora in tareas.items():
+            try:
+                datetime.strptime(hora, '%H:%M')
+            except (TypeError, ValueError):
+                raise CommandError(f'❌ Hora inválida para {nombre}: {hora!r} (formato HH:MM)')
+
+        if options['una_vez'] or options['al_iniciar']:
+            for nombre in tareas:
+                self._ejecutar(nombre)
+            if options['una_vez']:
+                return
+
+        ahora = timezone.localtime()
+        proximas = {nombre: _proxima_ejecucion(hora, ahora) for nombre, hora in tareas.items()}
+        for nombre, proxima in proximas.items():
+            self.stdout.write(f'🕒 {nombre}: próxima ejecución {proxima:%d/%m/%Y %H:%M}')
+
+        while True:
+            nombre = min(proximas, key=proximas.get)
+            espera = (proximas[nombre] - timezone.localtime()).total_seconds()
+            if espera > 0:
+                # Esperas cortas: tolera cambios de hora del sistema y suspensiones
+                time.sleep(min(espera, 60))
+                continue
+
+            self._ejecutar(nombre)
+            proximas[nombre] = _proxima_ejecucion(tareas[nombre], timezone.localtime())
+
+    def _ejecutar(self, nombre):
+        """Una tarea que falla se registra y no detiene el programador"""
+        inicio = time.perf_counter()
+        self.stdout.write(f'▶️ {nombre} ({timezone.localtime():%d/%m/%Y %H:%M})')
+        try:
+            call_command(nombre, stdout=self.stdout, stderr=self.stderr)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'❌ {nombre}: {type(e).__name__}: {e}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {nombre} terminado en {time.perf_counter() - inicio:.1f}s'
+            ))
+        finally:
+            # Proceso de larga duración: no conservar conexiones abiertas mientras espera
+            connections.close_all()
@@ -0,0 +1,178 @@
+# apps/balancines/metricas.py
+"""
+Instrumentación de consultas SQL y latencia por vista.
+
+El middleware MetricasRendimientoMiddleware registra por cada request:
+número de consultas, tiempo total en BD, consultas duplicadas (N+1) y
+tiempo total, etiquetado por el nombre de URL. Las métricas se guardan en
+un buffer circular en memoria (uno por proceso/worker).
+
+Para tests:
+
+    from apps.balancines.metricas import presupuesto_consultas
+
+    with presupuesto_consultas('dashboard_oh_nuevo'):
+        self.client.get(reverse('dashboard_oh_nuevo'))
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+# ============================================================
+# HUELLAS DE CONSULTAS
+# ============================================================
+
+_RE_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTAS = re.compile(r'\((?:\s*(?:\?|%s)\s*,)+\s*(?:\?|%s)\s*\)')
+_RE_ESPACIOS = re.compile(r'\s+')
+
+
+def huella_sql(sql):
+    """
+    Normaliza una consulta SQL quitando literales, para que dos consultas
+    que solo difieren en parámetros tengan la misma huella.
+    """
+    sql = _RE_CADENAS.sub('?', sql)
+    sql = _RE_NUMEROS.sub('?', sql)
+    sql = _RE_LISTAS.sub('(...)', sql)
+    return _RE_ESPACIOS.sub(' ', sql).strip()
+
+
+class RegistroConsultas:
+    """Execute wrapper que acumula huella y duración de cada consulta"""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((huella_sql(sql), time.perf_counter() - inicio))
+
+    @property
+    def total(self):
+        return len(self.consultas)
+
+    @property
+    def tiempo_bd_ms(self):
+        return sum(duracion for _, duracion in self.consultas) * 1000
+
+    def duplicadas(self, limite=5):
+        """Huellas repetidas (posibles N+1), de mayor a menor frecuencia"""
+        conteo = Counter(huella for huella, _ in self.consultas)
+        return [(huella, n) for huella, n in conteo.most_common(limite) if n > 1]
+
+
+@contextmanager
+def capturar_consultas():
+    """Captura las consultas de todas las conexiones configuradas"""
+    registro = RegistroConsultas()
+    with ExitStack() as stack:
+        for conexion in connections.all():
+            stack.enter_context(conexion.execute_wrapper(registro))
+        yield registro
+
+
+# ============================================================
+# BUFFER CIRCULAR
+# ============================================================
+
+_buffer = deque(maxlen=getattr(settings, 'METRICAS_BUFFER_TAMANO', 500))
+_buffer_lock = threading.Lock()
+
+
+def registrar_metrica(metrica):
+    with _buffer_lock:
+        _buffer.append(metrica)
+
+
+def obtener_metricas():
+    """Copia de las métricas del buffer (más recientes primero)"""
+    with _buffer_lock:
+        return list(reversed(_buffer))
+
+
+def limpiar_metricas():
+    with _buffer_lock:
+        _buffer.clear()
+
+
+def resumen_por_vista(metricas):
+    """Agrega las métricas por nombre de URL"""
+    resumen = {}
+    for m in metricas:
+        r = resumen.setdefault(m['url_name'], {
+            'url_name': m['url_name'],
+            'requests': 0,
+            'consultas_total': 0,
+            'consultas_max': 0,
+            'bd_ms_total': 0.0,
+            'total_ms': [],
+            'con_duplicadas': 0,
+            'excedidas': 0,
+            'presupuesto': presupuesto_para(m['url_name']),
+        })
+        r['requests'] += 1
+        r['consultas_total'] += m['consultas']
+        r['consultas_max'] = max(r['consultas_max'], m['consultas'])
+        r['bd_ms_total'] += m['bd_ms']
+        r['total_ms'].append(m['total_ms'])
+        r['con_duplicadas'] += 1 if m['duplicadas'] else 0
+        r['excedidas'] += 1 if m['excede_presupuesto'] else 0
+
+    filas = []
+    for r in resumen.values():
+        tiempos = sorted(r.pop('total_ms'))
+        r['consultas_promedio'] = r['consultas_total'] / r['requests']
+        r['bd_ms_promedio'] = r['bd_ms_total'] / r['requests']
+        r['total_ms_p50'] = tiempos[len(tiempos) // 2]
+        r['total_ms_p95'] = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+        filas.append(r)
+
+    filas.sort(key=lambda r: r['total_ms_p95'], reverse=True)
+    return filas
+
+
+# ============================================================
+# PRESUPUESTOS
+# ============================================================
+
+class PresupuestoExcedido(AssertionError):
+    """Una vista superó su presupuesto de consultas"""
+
+
+def presupuesto_para(url_name):
+    """Máximo de consultas configurado en settings.PRESUPUESTOS_CONSULTAS"""
+    return getattr(settings, 'PRESUPUESTOS_CONSULTAS', {}).get(url_name)
+
+
+def verificar_presupuesto(url_name, registro, max_consultas=None):
+    """Lanza PresupuestoExcedido si el registro supera el presupuesto de la vista"""
+    limite = max_consultas if max_consultas is not None else presupuesto_para(url_name)
+    if limite is not None and registro.total > limite:
+        duplicadas = '\n'.join(f'  {n}x {huella[:200]}' for huella, n in registro.duplicadas())
+        raise PresupuestoExcedido(
+            f'{url_name or "consulta"}: {registro.total} consultas (presupuesto: {limite})'
+            + (f'\nDuplicadas:\n{duplicadas}' if duplicadas else '')
+        )
+
+
+@contextmanager
+def presupuesto_consultas(url_name=None, max_consultas=None):
+    """
+    Helper para tests: falla si el bloque ejecuta más consultas que el
+    presupuesto configurado para url_name (o que max_consultas).
+    """
+    with capturar_consultas() as registro:
+        yield registro
+    verificar_presupuesto(url_name, registro, max_consultas=max_consultas)
@@ -0,0 +1,122 @@
+# apps/balancines/middleware.py
+
+import logging
+import time
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+
+from .metricas import (
+    capturar_consultas, registrar_metrica,
+    presupuesto_para, verificar_presupuesto, PresupuestoExcedido,
+)
+
+logger = logging.getLogger('apps.balancines.metricas')
+
+
+class MetricasRendimientoMiddleware:
+    """
+    Registra consultas SQL, tiempo en BD, consultas duplicadas y tiempo
+    total de cada request, etiquetado por el nombre de URL.
+
+    settings.METRICAS_RENDIMIENTO_ACTIVAS: activa/desactiva el registro.
+    settings.METRICAS_PRESUPUESTO_ESTRICTO: lanza PresupuestoExcedido
+    cuando una vista supera su presupuesto (pensado para tests).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, 'METRICAS_RENDIMIENTO_ACTIVAS', True)
+        self.estricto = getattr(settings, 'METRICAS_PRESUPUESTO_ESTRICTO', False)
+
+    def __call__(self, request):
+        if not self.activo or request.path.startswith(settings.STATIC_URL):
+            return self.get_response(request)
+
+        inicio = time.perf_counter()
+        with capturar_consultas() as registro:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - inicio) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.url_name if match and match.url_name else request.path
+        presupuesto = presupuesto_para(url_name)
+        duplicadas = registro.duplicadas()
+
+        metrica = {
+            'fecha': timezone.now(),
+            'url_name': url_name,
+            'metodo': request.method,
+            'ruta': request.get_full_path(),
+            'status': response.status_code,
+            'consultas': registro.total,
+            'bd_ms': round(registro.tiempo_bd_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'duplicadas': duplicadas,
+            'presupuesto': presupuesto,
+            'excede_presupuesto': presupuesto is not None and registro.total > presupuesto,
+        }
+        registrar_metrica(metrica)
+
+        if metrica['excede_presupuesto']:
+            logger.warning(
+                f"⚠️ {url_name}: {registro.total} consultas (presupuesto {presupuesto}), "
+                f"{metrica['bd_ms']} ms BD, {metrica['total_ms']} ms total"
+            )
+            if self.estricto:
+                verificar_presupuesto(url_name, registro)
+        else:
+            logger.debug(
+                f"{url_name}: {registro.total} consultas, {metrica['bd_ms']} ms BD, {metrica['total_ms']} ms total"
+            )
+
+        return response
+
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se usa gzip
+    brotli = None
+
+
+class CompresionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware que no comprime el stream SSE (los eventos deben llegar
+    sin buffer) y usa brotli para JSON cuando el cliente lo acepta y el
+    paquete está instalado. Brotli se limita a JSON: las páginas HTML llevan
+    el token CSRF y solo gzip incluye la mitigación de BREACH de Django.
+    """
+
+    TIPOS_SIN_COMPRESION = ('text/event-stream',)
+
+    def process_response(self, request, response):
+        tipo = response.get('Content-Type', '')
+        if tipo.startswith(self.TIPOS_SIN_COMPRESION):
+            return response
+
+        if (
+            brotli is not None
+            and not response.streaming
+            and tipo.startswith('application/json')
+            and 'br' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+            and not response.has_header('Content-Encoding')
+            and len(response.content) >= 200
+        ):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            comprimido = brotli.compress(response.content, quality=5)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response.headers['Content-Length'] = str(len(comprimido))
+            etag = response.get('ETag')
+            if etag and etag.startswith('"'):
+                response.headers['ETag'] = 'W/' + etag
+            response.headers['Content-Encoding'] = 'br'
+            return response
+
+        return super().process_response(request, response)
+
+
+__all__ = ['MetricasRendimientoMiddleware', 'CompresionMiddleware', 'PresupuestoExcedido']
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:59
+
+from django.db import migrations, models
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0017_alter_registrotallerdiario_cantidad_balancines_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historialadicional',
+            index=models.Index(fields=['-fecha_movimiento'], name='histadi_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialadicional',
+            index=models.Index(fields=['tipo_movimiento', '-fecha_movimiento'], name='histadi_tipo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialadicional',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('fecha_movimiento'), models.F('tipo_movimiento'), name='histadi_dia_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialoh',
+            index=models.Index(fields=['balancin', '-fecha_oh'], name='histoh_balancin_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialrepuesto',
+            index=models.Index(fields=['-fecha_movimiento'], name='histrep_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialrepuesto',
+            index=models.Index(fields=['tipo_movimiento', '-fecha_movimiento'], name='histrep_tipo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historialrepuesto',
+            index=models.Index(django.db.models.functions.datetime.TruncDate('fecha_movimiento'), models.F('tipo_movimiento'), name='histrep_dia_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registrotallerdiario',
+            index=models.Index(fields=['fecha', 'area', 'turno'], name='taller_fecha_area_turno_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registrotallerdiario',
+            index=models.Index(fields=['-fecha', '-fecha_registro'], name='taller_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repuestoadicional',
+            index=models.Index(fields=['cantidad'], name='repadi_cantidad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repuestoadicional',
+            index=models.Index(condition=models.Q(('cantidad__lt', 5)), fields=['cantidad'], name='repadi_stock_bajo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repuestobalancin',
+            index=models.Index(fields=['cantidad'], name='repbal_cantidad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repuestobalancin',
+            index=models.Index(condition=models.Q(('cantidad__lt', 5)), fields=['cantidad'], name='repbal_stock_bajo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='torre',
+            index=models.Index(fields=['tipo_balancin_ascendente'], name='torre_tipo_asc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='torre',
+            index=models.Index(fields=['tipo_balancin_descendente'], name='torre_tipo_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0018_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='controlhorasbalancin',
+            index=models.Index(fields=['backlog_actual'], name='ctrlhoras_backlog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='controlhorasbalancin',
+            index=models.Index(fields=['horas_actuales'], name='ctrlhoras_horas_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0019_indices_control_horas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorCambios',
+            fields=[
+                ('tabla', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Tabla')),
+                ('version', models.BigIntegerField(default=0, verbose_name='Versión')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Contador de cambios',
+                'verbose_name_plural': 'Contadores de cambios',
+                'db_table': 'app_contador_cambios',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0020_contador_cambios'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formularioreacondicionamiento',
+            index=models.Index(fields=['-fecha_creacion', '-codigo_formulario'], name='formrec_creacion_idx'),
+        ),
+    ]
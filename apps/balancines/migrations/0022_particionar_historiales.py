@@ -0,0 +1,133 @@
+# Convierte las tablas de historial en tablas particionadas por rango de fecha (PostgreSQL)
+
+from datetime import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+# Tabla -> columna de la clave de partición. Las consultas de estas tablas
+# filtran u ordenan por esa fecha. app_historial_oh queda fuera: la
+# referencian claves foráneas (formularios, control de horas) que en una
+# tabla particionada tendrían que incluir la fecha, y sus consultas son por
+# balancín, no por ventana de fechas.
+TABLAS = {
+    'app_historialrepuesto': 'fecha_movimiento',
+    'app_historialadicional': 'fecha_movimiento',
+    'app_historialbalancin': 'fecha_cambio',
+    'app_activitylog': 'created_at',
+}
+
+# Particiones mensuales creadas por adelantado (después las crea gestionar_particiones)
+MESES_FUTUROS = 3
+
+
+def _inicio_mes(anio, mes):
+    anio, mes = anio + (mes - 1) // 12, (mes - 1) % 12 + 1
+    return timezone.make_aware(datetime(anio, mes, 1))
+
+
+def _rangos(primera_fecha):
+    """
+    (sufijo, desde, hasta): un año por partición para la historia anterior al
+    año en curso, un mes por partición desde enero hasta MESES_FUTUROS meses
+    después del actual.
+    """
+    hoy = timezone.localdate()
+    rangos = []
+    if primera_fecha is not None:
+        for anio in range(timezone.localtime(primera_fecha).year, hoy.year):
+            rangos.append((f'p{anio}', _inicio_mes(anio, 1), _inicio_mes(anio + 1, 1)))
+    for mes in range(1, hoy.month + MESES_FUTUROS + 1):
+        desde = _inicio_mes(hoy.year, mes)
+        rangos.append((f'p{desde.year}_{desde.month:02d}', desde, _inicio_mes(hoy.year, mes + 1)))
+    return rangos
+
+
+def _estructura(cursor, tabla):
+    """Nombre de la PK, índices (sin el de la PK) y claves foráneas de la tabla"""
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'", [tabla]
+    )
+    pk = cursor.fetchone()[0]
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(indexrelid) FROM pg_index
+        WHERE indrelid = to_regclass(%s) AND NOT indisprimary
+        """,
+        [tabla],
+    )
+    indices = [fila[0] for fila in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype = 'f'
+        """,
+        [tabla],
+    )
+    return pk, indices, cursor.fetchall()
+
+
+def _recrear(schema_editor, tabla, columna, particionada):
+    """
+    Copia la tabla a una nueva (particionada o no) con las mismas columnas,
+    restricciones, índices y claves foráneas. En una tabla particionada la
+    PK debe incluir la clave de partición: pasa a ser (id, fecha).
+    """
+    qn = schema_editor.quote_name
+    anterior = f'{tabla}__anterior'
+    with schema_editor.connection.cursor() as cursor:
+        pk, indices, foraneas = _estructura(cursor, tabla)
+        cursor.execute(f'ALTER TABLE {qn(tabla)} RENAME TO {qn(anterior)}')
+        particion = f' PARTITION BY RANGE ({qn(columna)})' if particionada else ''
+        cursor.execute(f'CREATE TABLE {qn(tabla)} (LIKE {qn(anterior)} INCLUDING CONSTRAINTS){particion}')
+        cursor.execute(f'ALTER TABLE {qn(tabla)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+
+        if particionada:
+            cursor.execute(f'SELECT MIN({qn(columna)}) FROM {qn(anterior)}')
+            for sufijo, desde, hasta in _rangos(cursor.fetchone()[0]):
+                cursor.execute(
+                    f'CREATE TABLE {qn(f"{tabla}_{sufijo}")} PARTITION OF {qn(tabla)} '
+                    f"FOR VALUES FROM ('{desde.isoformat()}') TO ('{hasta.isoformat()}')"
+                )
+            cursor.execute(f'CREATE TABLE {qn(f"{tabla}_pdefault")} PARTITION OF {qn(tabla)} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {qn(tabla)} SELECT * FROM {qn(anterior)}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {qn(tabla)}",
+            [tabla],
+        )
+        cursor.execute(f'DROP TABLE {qn(anterior)}')
+
+        clave = f'id, {qn(columna)}' if particionada else 'id'
+        cursor.execute(f'ALTER TABLE {qn(tabla)} ADD CONSTRAINT {qn(pk)} PRIMARY KEY ({clave})')
+        # Las definiciones se leyeron antes de renombrar: ya nombran la tabla nueva
+        for indice in indices:
+            cursor.execute(indice.replace(' ON ONLY ', ' ON ', 1))
+        for nombre, definicion in foraneas:
+            cursor.execute(f'ALTER TABLE {qn(tabla)} ADD CONSTRAINT {qn(nombre)} {definicion}')
+        cursor.execute(f'ANALYZE {qn(tabla)}')
+
+
+def particionar(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabla, columna in TABLAS.items():
+        _recrear(schema_editor, tabla, columna, particionada=True)
+
+
+def desparticionar(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for tabla, columna in TABLAS.items():
+        _recrear(schema_editor, tabla, columna, particionada=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0021_indice_formularios_cursor'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar, desparticionar),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0022_particionar_historiales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoteArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=60, verbose_name='Modelo')),
+                ('balancin', models.CharField(help_text='Valor de la clave foránea al balancín en el modelo archivado', max_length=50, verbose_name='Balancín')),
+                ('mes', models.DateField(help_text='Primer día del mes de las filas', verbose_name='Mes')),
+                ('cantidad', models.PositiveIntegerField(default=0, verbose_name='Filas')),
+                ('datos', models.BinaryField(verbose_name='Datos (JSONL.gz)')),
+                ('archivado_en', models.DateTimeField(auto_now=True, verbose_name='Archivado')),
+            ],
+            options={
+                'verbose_name': 'Lote archivado',
+                'verbose_name_plural': 'Lotes archivados',
+                'db_table': 'app_lote_archivado',
+                'indexes': [models.Index(fields=['modelo', 'mes'], name='lote_archivado_mes_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='lotearchivado',
+            constraint=models.UniqueConstraint(fields=('modelo', 'balancin', 'mes'), name='lote_archivado_unico'),
+        ),
+    ]
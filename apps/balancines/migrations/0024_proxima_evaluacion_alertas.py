@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0023_archivo_en_frio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='controlhorasbalancin',
+            name='proxima_evaluacion',
+            field=models.DateField(blank=True, default=django.utils.timezone.localdate, help_text='Día en que el backlog proyectado cruza el siguiente umbral de alerta (vacío: ya vencido)', null=True, verbose_name='Próxima evaluación'),
+        ),
+        migrations.AddIndex(
+            model_name='controlhorasbalancin',
+            index=models.Index(fields=['proxima_evaluacion'], name='ctrlhoras_prox_eval_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:02
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('balancines', '0024_proxima_evaluacion_alertas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExcepcionOperacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('tipo', models.CharField(choices=[('FERIADO', 'Feriado'), ('PARADA', 'Parada registrada'), ('HORARIO_ESPECIAL', 'Horario especial')], default='FERIADO', max_length=20, verbose_name='Tipo')),
+                ('horas_operadas', models.PositiveSmallIntegerField(default=0, help_text='Horas que operó la línea ese día (0: no operó)', verbose_name='Horas operadas')),
+                ('hora_inicio', models.TimeField(blank=True, help_text='Solo horario especial; vacío: la del calendario de la línea', null=True, verbose_name='Hora de inicio')),
+                ('motivo', models.CharField(blank=True, max_length=200, verbose_name='Motivo')),
+                ('linea', models.ForeignKey(blank=True, help_text='Vacío: todas las líneas', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='excepciones_operacion', to='balancines.linea', verbose_name='Línea')),
+            ],
+            options={
+                'verbose_name': 'Excepción de operación',
+                'verbose_name_plural': 'Excepciones de operación',
+                'db_table': 'app_excepcion_operacion',
+                'ordering': ['-fecha'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CalendarioLinea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hora_inicio', models.TimeField(default=datetime.time(6, 30), verbose_name='Hora de inicio')),
+                ('horas_dia', models.PositiveSmallIntegerField(default=16, verbose_name='Horas de operación por día')),
+                ('dias_semana', models.CharField(default='1234567', help_text='Días de la semana que opera (1 = lunes ... 7 = domingo)', max_length=7, verbose_name='Días de operación')),
+                ('linea', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='calendario', to='balancines.linea', verbose_name='Línea')),
+            ],
+            options={
+                'verbose_name': 'Calendario de línea',
+                'verbose_name_plural': 'Calendarios de líneas',
+                'db_table': 'app_calendario_linea',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='excepcionoperacion',
+            constraint=models.UniqueConstraint(fields=('linea', 'fecha'), name='excepcion_operacion_linea_fecha'),
+        ),
+        migrations.AddConstraint(
+            model_name='excepcionoperacion',
+            constraint=models.UniqueConstraint(condition=models.Q(('linea__isnull', True)), fields=('fecha',), name='excepcion_operacion_general_fecha'),
+        ),
+    ]
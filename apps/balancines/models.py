@@ -4,12 +4,14 @@
 
 # ========== DJANGO CORE ==========
 from django.db import models
+from django.db.models import Case, F, Func, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce, TruncDate
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # ========== PYTHON STANDARD LIBRARY ==========
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 import re
 
 
@@ -171,6 +173,10 @@ class Torre(models.Model):
         verbose_name_plural = 'Torres'
         ordering = ['linea', 'numero_torre']
         unique_together = ['linea', 'numero_torre', 'seccion']
+        indexes = [
+            models.Index(fields=['tipo_balancin_ascendente'], name='torre_tipo_asc_idx'),
+            models.Index(fields=['tipo_balancin_descendente'], name='torre_tipo_desc_idx'),
+        ]
     
     def __str__(self):
         return f"L{self.linea_id}-T{self.numero_torre} (Secc:{self.seccion.nombre})"
@@ -180,6 +186,19 @@ class Torre(models.Model):
 # TIPOS / MODELOS DE BALANCINES
 # ============================================================
 
+class TipoBalancinQuerySet(models.QuerySet):
+
+    def with_installed_counts(self):
+        """Anota total_instalados (usado por la propiedad balancines_instalados)"""
+        instalados = BalancinIndividual.objects.filter(
+            Q(torre__tipo_balancin_ascendente=OuterRef('codigo')) |
+            Q(torre__tipo_balancin_descendente=OuterRef('codigo'))
+        ).order_by().annotate(
+            total=Func(F('codigo'), function='COUNT', output_field=models.IntegerField())
+        ).values('total')
+        return self.annotate(total_instalados=Coalesce(Subquery(instalados), 0))
+
+
 class TipoBalancin(models.Model):
     """Modelos/tipos de balancines (catálogo)"""
     
@@ -194,6 +213,8 @@ class TipoBalancin(models.Model):
     fecha_registro = models.DateTimeField('Fecha de registro', auto_now_add=True)
     fecha_actualizacion = models.DateTimeField('Última actualización', auto_now=True)
     
+    objects = TipoBalancinQuerySet.as_manager()
+    
     class Meta:
         db_table = 'app_tipobalancin'
         verbose_name = 'Modelo de Balancín'
@@ -210,8 +231,8 @@ class TipoBalancin(models.Model):
     @property
     def balancines_instalados(self):
         """Contar balancines de este tipo instalados en torres"""
-        from .models import BalancinIndividual
-        from django.db.models import Q
+        if 'total_instalados' in self.__dict__:
+            return self.total_instalados
         return BalancinIndividual.objects.filter(
             Q(torre__tipo_balancin_ascendente=self.codigo) |
             Q(torre__tipo_balancin_descendente=self.codigo)
@@ -222,6 +243,31 @@ class TipoBalancin(models.Model):
 # BALANCINES INDIVIDUALES INSTALADOS EN TORRES
 # ============================================================
 
+class BalancinIndividualQuerySet(models.QuerySet):
+
+    def with_status(self):
+        """
+        Anota en la misma consulta lo que calculan las propiedades
+        tipo_balancin_codigo, tipo_balancin y tiene_oh_pendiente. Del
+        TipoBalancin se anota el tipo; el resto de sus campos queda diferido
+        (como con .only('codigo', 'tipo')).
+        """
+        ultimo_oh = BalancinOH.objects.filter(
+            balancin=OuterRef('pk')
+        ).order_by('-fecha_oh').values('horas_operacion')[:1]
+        tipo = TipoBalancin.objects.filter(codigo=OuterRef('codigo_tipo')).values('tipo')[:1]
+
+        return self.annotate(
+            codigo_tipo=Case(
+                When(sentido='ASCENDENTE', then=F('torre__tipo_balancin_ascendente')),
+                default=F('torre__tipo_balancin_descendente'),
+            ),
+            horas_ultimo_oh=Subquery(ultimo_oh),
+        ).annotate(
+            tipo_de_tipo_balancin=Subquery(tipo),
+        )
+
+
 class BalancinIndividual(models.Model):
     """Balancines individuales instalados en torres"""
     
@@ -290,6 +336,8 @@ class BalancinIndividual(models.Model):
     observaciones = models.TextField('Observaciones', blank=True, null=True)
     fecha_registro = models.DateTimeField('Fecha de registro', auto_now_add=True)
     
+    objects = BalancinIndividualQuerySet.as_manager()
+    
     class Meta:
         db_table = 'app_balancinindividual'
         verbose_name = 'Balancín Individual'
@@ -302,9 +350,13 @@ class BalancinIndividual(models.Model):
     def __str__(self):
         return f"{self.codigo} - {self.torre}"
     
+    # Las propiedades usan las anotaciones de BalancinIndividual.objects.with_status() si existen
+    
     @property
     def tipo_balancin_codigo(self):
         """Obtener el código del tipo de balancín desde la torre"""
+        if 'codigo_tipo' in self.__dict__:
+            return self.codigo_tipo
         if self.sentido == 'ASCENDENTE':
             return self.torre.tipo_balancin_ascendente
         return self.torre.tipo_balancin_descendente
@@ -312,6 +364,12 @@ class BalancinIndividual(models.Model):
     @property
     def tipo_balancin(self):
         """Obtener el objeto TipoBalancin si existe"""
+        if 'tipo_de_tipo_balancin' in self.__dict__:
+            if self.tipo_de_tipo_balancin is None:
+                return None
+            return TipoBalancin.from_db(
+                self._state.db, ['codigo', 'tipo'], [self.codigo_tipo, self.tipo_de_tipo_balancin]
+            )
         codigo = self.tipo_balancin_codigo
         if codigo:
             try:
@@ -323,9 +381,13 @@ class BalancinIndividual(models.Model):
     @property
     def tiene_oh_pendiente(self):
         """Verificar si necesita cambio de OH"""
-        ultimo_oh = self.ordenes_horas.order_by('-fecha_oh').first()
-        if ultimo_oh and ultimo_oh.horas_operacion:
-            return ultimo_oh.horas_operacion >= self.rango_horas_cambio_oh
+        if 'horas_ultimo_oh' in self.__dict__:
+            horas = self.horas_ultimo_oh
+        else:
+            ultimo_oh = self.ordenes_horas.order_by('-fecha_oh').first()
+            horas = ultimo_oh.horas_operacion if ultimo_oh else None
+        if horas:
+            return horas >= self.rango_horas_cambio_oh
         return False
 
 
@@ -389,6 +451,7 @@ class HistorialBalancin(models.Model):
     )
     
     class Meta:
+        # En PostgreSQL, particionada por mes de fecha_cambio (services/particiones.py)
         db_table = 'app_historialbalancin'
         verbose_name = 'Historial de Balancín'
         verbose_name_plural = 'Historial de Balancines'
@@ -419,6 +482,11 @@ class RepuestoBalancin(models.Model):
         verbose_name = 'Repuesto para Balancín'
         verbose_name_plural = 'Repuestos para Balancines'
         ordering = ['item']
+        indexes = [
+            models.Index(fields=['cantidad'], name='repbal_cantidad_idx'),
+            # Stock bajo (0 < cantidad < 5) y agotado (cantidad = 0)
+            models.Index(fields=['cantidad'], name='repbal_stock_bajo_idx', condition=Q(cantidad__lt=5)),
+        ]
     
     def __str__(self):
         return f"{self.item} - Stock: {self.cantidad}"
@@ -445,6 +513,11 @@ class RepuestoAdicional(models.Model):
         verbose_name = 'Repuesto Adicional'
         verbose_name_plural = 'Repuestos Adicionales'
         ordering = ['item']
+        indexes = [
+            models.Index(fields=['cantidad'], name='repadi_cantidad_idx'),
+            # Stock bajo (0 < cantidad < 5) y agotado (cantidad = 0)
+            models.Index(fields=['cantidad'], name='repadi_stock_bajo_idx', condition=Q(cantidad__lt=5)),
+        ]
     
     def __str__(self):
         return f"{self.item} - Stock: {self.cantidad}"
@@ -475,10 +548,17 @@ class HistorialRepuesto(models.Model):
     fecha_movimiento = models.DateTimeField('Fecha', default=timezone.now)
     
     class Meta:
+        # En PostgreSQL, particionada por mes de fecha_movimiento (services/particiones.py)
         db_table = 'app_historialrepuesto'
         verbose_name = 'Historial de Repuesto'
         verbose_name_plural = 'Historial de Repuestos'
         ordering = ['-fecha_movimiento']
+        indexes = [
+            models.Index(fields=['-fecha_movimiento'], name='histrep_fecha_idx'),
+            models.Index(fields=['tipo_movimiento', '-fecha_movimiento'], name='histrep_tipo_fecha_idx'),
+            # Filtros por fecha_movimiento__date (día en la zona horaria local)
+            models.Index(TruncDate('fecha_movimiento'), 'tipo_movimiento', name='histrep_dia_tipo_idx'),
+        ]
     
     def __str__(self):
         return f"{self.repuesto.item} - {self.tipo_movimiento} ({self.cantidad})"
@@ -514,10 +594,17 @@ class HistorialAdicional(models.Model):
     fecha_movimiento = models.DateTimeField('Fecha', default=timezone.now)
     
     class Meta:
+        # En PostgreSQL, particionada por mes de fecha_movimiento (services/particiones.py)
         db_table = 'app_historialadicional'
         verbose_name = 'Historial de Repuesto Adicional'
         verbose_name_plural = 'Historial de Repuestos Adicionales'
         ordering = ['-fecha_movimiento']
+        indexes = [
+            models.Index(fields=['-fecha_movimiento'], name='histadi_fecha_idx'),
+            models.Index(fields=['tipo_movimiento', '-fecha_movimiento'], name='histadi_tipo_fecha_idx'),
+            # Filtros por fecha_movimiento__date (día en la zona horaria local)
+            models.Index(TruncDate('fecha_movimiento'), 'tipo_movimiento', name='histadi_dia_tipo_idx'),
+        ]
     
     def __str__(self):
         return f"{self.repuesto.item} - {self.tipo_movimiento} ({self.cantidad})"
@@ -527,6 +614,32 @@ class HistorialAdicional(models.Model):
 # ACTIVITY LOG
 # ============================================================
 
+class ActivityLogQuerySet(models.QuerySet):
+    """Filtros de la auditoría; cada uno va sobre un índice de la tabla"""
+
+    def recientes(self, dias=None, desde=None, hasta=None):
+        if dias is not None:
+            desde = timezone.now() - timedelta(days=dias)
+        queryset = self
+        if desde is not None:
+            queryset = queryset.filter(created_at__gte=desde)
+        if hasta is not None:
+            queryset = queryset.filter(created_at__lt=hasta)
+        return queryset
+
+    def de_usuario(self, usuario):
+        return self.filter(user=usuario)
+
+    def de_objeto(self, modulo, object_id):
+        return self.filter(object_id=str(object_id), module=modulo)
+
+    def de_modulo(self, *modulos):
+        return self.filter(module__in=modulos)
+
+    def de_accion(self, *acciones):
+        return self.filter(action__in=acciones)
+
+
 class ActivityLog(models.Model):
     """Registro de todas las actividades del sistema"""
     
@@ -576,7 +689,10 @@ class ActivityLog(models.Model):
     old_values = models.JSONField(null=True, blank=True)
     new_values = models.JSONField(null=True, blank=True)
     
+    objects = ActivityLogQuerySet.as_manager()
+    
     class Meta:
+        # En PostgreSQL, particionada por mes de created_at (services/particiones.py)
         db_table = 'app_activitylog'
         verbose_name = "Registro de Actividad"
         verbose_name_plural = "Registros de Actividades"
@@ -644,13 +760,15 @@ class HistorialOH(models.Model):
             models.Index(fields=['fecha_oh']),
             models.Index(fields=['anio']),
             models.Index(fields=['backlog']),
+            # Último OH por balancín (el orden por numero_oh ya lo cubre unique_together)
+            models.Index(fields=['balancin', '-fecha_oh'], name='histoh_balancin_fecha_idx'),
         ]
         ordering = ['linea_nombre', 'torre_numero', 'sentido', 'numero_oh']
     
     def save(self, *args, **kwargs):
         # Calcular día de la semana automáticamente
         if self.fecha_oh and not self.dia_semana:
-            dias = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+            dias = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             self.dia_semana = dias[self.fecha_oh.weekday()]
         
         # Calcular año
@@ -844,6 +962,10 @@ class FormularioReacondicionamiento(models.Model):
         verbose_name = 'Formulario de Reacondicionamiento'
         verbose_name_plural = 'Formularios de Reacondicionamiento'
         ordering = ['-fecha', '-fecha_creacion']
+        indexes = [
+            # Paginación por cursor de lista_formularios
+            models.Index(fields=['-fecha_creacion', '-codigo_formulario'], name='formrec_creacion_idx'),
+        ]
     
     def __str__(self):
         return self.codigo_formulario
@@ -1140,6 +1262,10 @@ class RegistroTallerDiario(models.Model):
         verbose_name = 'Registro de Taller'
         verbose_name_plural = 'Registros del Taller'
         ordering = ['-fecha', '-fecha_registro']
+        indexes = [
+            models.Index(fields=['fecha', 'area', 'turno'], name='taller_fecha_area_turno_idx'),
+            models.Index(fields=['-fecha', '-fecha_registro'], name='taller_orden_idx'),
+        ]
     
     def __str__(self):
         return f"{self.fecha} - {self.get_area_display()}: {self.descripcion[:50]}"
@@ -1251,9 +1377,155 @@ class RegistroRepuestoAdicional(models.Model):
         
         
         # ============================================================
+# CALENDARIO DE OPERACIÓN
+# ============================================================
+
+# Ventana de servicio de las líneas sin CalendarioLinea
+HORA_INICIO_OPERACION = time(6, 30)
+HORAS_OPERACION_DIA = 16
+
+
+class CalendarioLinea(models.Model):
+    """
+    Ventana de servicio de una línea: desde qué hora, cuántas horas y qué
+    días de la semana opera. Ver apps/balancines/services/calendario.py
+    """
+    
+    linea = models.OneToOneField(
+        Linea,
+        on_delete=models.CASCADE,
+        related_name='calendario',
+        verbose_name='Línea'
+    )
+    hora_inicio = models.TimeField('Hora de inicio', default=HORA_INICIO_OPERACION)
+    horas_dia = models.PositiveSmallIntegerField('Horas de operación por día', default=HORAS_OPERACION_DIA)
+    dias_semana = models.CharField(
+        'Días de operación',
+        max_length=7,
+        default='1234567',
+        help_text='Días de la semana que opera (1 = lunes ... 7 = domingo)'
+    )
+    
+    class Meta:
+        db_table = 'app_calendario_linea'
+        verbose_name = 'Calendario de línea'
+        verbose_name_plural = 'Calendarios de líneas'
+    
+    def __str__(self):
+        return f"{self.linea.nombre}: {self.hora_inicio:%H:%M} + {self.horas_dia}h ({self.dias_semana})"
+    
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        
+        if not re.fullmatch(r'[1-7]{0,7}', self.dias_semana) or len(set(self.dias_semana)) != len(self.dias_semana):
+            raise ValidationError({'dias_semana': 'Use dígitos del 1 (lunes) al 7 (domingo) sin repetir'})
+        if self.horas_dia > 24:
+            raise ValidationError({'horas_dia': 'Un día no tiene más de 24 horas'})
+
+
+class ExcepcionOperacion(models.Model):
+    """Día en que una línea (o todas) no sigue su calendario: feriado, parada u horario especial"""
+    
+    TIPO_CHOICES = [
+        ('FERIADO', 'Feriado'),
+        ('PARADA', 'Parada registrada'),
+        ('HORARIO_ESPECIAL', 'Horario especial'),
+    ]
+    
+    linea = models.ForeignKey(
+        Linea,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='excepciones_operacion',
+        verbose_name='Línea',
+        help_text='Vacío: todas las líneas'
+    )
+    fecha = models.DateField('Fecha')
+    tipo = models.CharField('Tipo', max_length=20, choices=TIPO_CHOICES, default='FERIADO')
+    horas_operadas = models.PositiveSmallIntegerField(
+        'Horas operadas',
+        default=0,
+        help_text='Horas que operó la línea ese día (0: no operó)'
+    )
+    hora_inicio = models.TimeField(
+        'Hora de inicio',
+        null=True,
+        blank=True,
+        help_text='Solo horario especial; vacío: la del calendario de la línea'
+    )
+    motivo = models.CharField('Motivo', max_length=200, blank=True)
+    
+    class Meta:
+        db_table = 'app_excepcion_operacion'
+        verbose_name = 'Excepción de operación'
+        verbose_name_plural = 'Excepciones de operación'
+        ordering = ['-fecha']
+        constraints = [
+            models.UniqueConstraint(fields=['linea', 'fecha'], name='excepcion_operacion_linea_fecha'),
+            models.UniqueConstraint(
+                fields=['fecha'], condition=Q(linea__isnull=True), name='excepcion_operacion_general_fecha'
+            ),
+        ]
+    
+    def __str__(self):
+        linea = self.linea.nombre if self.linea_id else 'Todas las líneas'
+        return f"{linea} - {self.fecha:%d/%m/%Y} - {self.get_tipo_display()} ({self.horas_operadas}h)"
+
+
+# ============================================================
 # CONTROL DE HORAS EN VIVO
 # ============================================================
 
+class ControlHorasQuerySet(models.QuerySet):
+
+    def avanzar(self, fecha_referencia=None, lote=1000):
+        """
+        Proyecta horas_actuales y backlog_actual a la fecha de referencia.
+        Las horas de toda la selección salen de una pasada contra las horas
+        acumuladas por línea (services/calendario.py) y se guardan con
+        bulk_update, solo las que cambiaron. Devuelve el número de controles
+        actualizados.
+        """
+        from .services.calendario import ServicioCalendario
+        from .versiones import incrementar
+
+        if not fecha_referencia:
+            fecha_referencia = timezone.now().date()
+
+        filas = list(self.order_by().values_list(
+            'pk', 'horas_base', 'fecha_base', 'horas_actuales', 'backlog_actual',
+            'balancin__torre__linea_id', 'balancin__rango_horas_cambio_oh',
+        ))
+        horas = ServicioCalendario.horas_flota(
+            [(fila[5], fila[2]) for fila in filas], fecha_referencia
+        )
+
+        ahora = timezone.now()
+        cambiados = []
+        for fila, adicionales in zip(filas, horas):
+            pk, horas_base, horas_previas, backlog_previo, rango = fila[0], fila[1], fila[3], fila[4], fila[6]
+            horas_actuales = horas_base + adicionales
+            if (horas_actuales, rango - horas_actuales) != (horas_previas, backlog_previo):
+                cambiados.append(self.model(
+                    pk=pk, horas_actuales=horas_actuales, backlog_actual=rango - horas_actuales,
+                    ultima_actualizacion=ahora,
+                ))
+
+        self.model.objects.bulk_update(
+            cambiados, ['horas_actuales', 'backlog_actual', 'ultima_actualizacion'], batch_size=lote
+        )
+        # bulk_update no dispara señales
+        incrementar(self.model)
+        return len(cambiados)
+
+    def pendientes(self, fecha_referencia=None):
+        """Controles cuyo nivel de alerta puede haber cambiado a la fecha de referencia"""
+        if not fecha_referencia:
+            fecha_referencia = timezone.now().date()
+        return self.filter(proxima_evaluacion__lte=fecha_referencia)
+
+
 class ControlHorasBalancin(models.Model):
     """
     Control de horas acumuladas de los balancines para cálculo en vivo.
@@ -1305,10 +1577,28 @@ class ControlHorasBalancin(models.Model):
         verbose_name='Último OH relacionado'
     )
     
+    # Cola de evaluación de alertas (ver ServicioAlertasOH.generar_todas_las_alertas)
+    proxima_evaluacion = models.DateField(
+        'Próxima evaluación',
+        null=True,
+        blank=True,
+        default=timezone.localdate,
+        help_text='Día en que el backlog proyectado cruza el siguiente umbral de alerta (vacío: ya vencido)'
+    )
+    
+    objects = ControlHorasQuerySet.as_manager()
+    
     class Meta:
         db_table = 'app_control_horas_balancin'
         verbose_name = 'Control de Horas de Balancín'
         verbose_name_plural = 'Controles de Horas de Balancines'
+        indexes = [
+            # "Balancines con backlog < X" (alertas, dashboards)
+            models.Index(fields=['backlog_actual'], name='ctrlhoras_backlog_idx'),
+            models.Index(fields=['horas_actuales'], name='ctrlhoras_horas_idx'),
+            # Controles pendientes de evaluar (proxima_evaluacion <= hoy)
+            models.Index(fields=['proxima_evaluacion'], name='ctrlhoras_prox_eval_idx'),
+        ]
     
     def __str__(self):
         return f"{self.balancin.codigo} - {self.horas_actuales}h"
@@ -1320,14 +1610,35 @@ class ControlHorasBalancin(models.Model):
         if not fecha_referencia:
             fecha_referencia = timezone.now().date()
         
-        dias_transcurridos = (fecha_referencia - self.fecha_base).days
-        horas_adicionales = dias_transcurridos * 16  # 16 horas por día
+        horas_adicionales = self.calendario().horas_entre(self.fecha_base, fecha_referencia)
         
         self.horas_actuales = self.horas_base + horas_adicionales
         self.backlog_actual = self.balancin.rango_horas_cambio_oh - self.horas_actuales
         
         return self.horas_actuales
     
+    def calendario(self):
+        """Calendario de operación de la línea del balancín"""
+        from .services.calendario import ServicioCalendario
+        
+        return ServicioCalendario.de_balancin(self.balancin)
+    
+    def programar_evaluacion(self, fecha_referencia=None):
+        """
+        Calcula proxima_evaluacion: el primer día posterior a la fecha de
+        referencia en que el backlog proyectado cambia de nivel de alerta.
+        """
+        from .services.alertas_oh import ServicioAlertasOH
+        
+        if not fecha_referencia:
+            fecha_referencia = timezone.now().date()
+        
+        self.proxima_evaluacion = ServicioAlertasOH.fecha_cambio_nivel(
+            self.balancin.rango_horas_cambio_oh, self.horas_base, self.fecha_base, fecha_referencia,
+            self.calendario()
+        )
+        return self.proxima_evaluacion
+    
     def actualizar_base(self, nuevas_horas, nueva_fecha=None, nuevo_oh=None):
         """
         Actualiza la base (cuando se hace un nuevo OH o se reinicia el contador)
@@ -1341,6 +1652,8 @@ class ControlHorasBalancin(models.Model):
         if nuevo_oh:
             self.ultimo_oh_relacionado = nuevo_oh
         
+        # Con la nueva base el nivel se evalúa de nuevo hoy
+        self.proxima_evaluacion = timezone.now().date()
         self.recalcular_horas()
         self.save()
     
@@ -1367,4 +1680,63 @@ class ControlHorasBalancin(models.Model):
         control.recalcular_horas()
         control.save()
         
-        return control
\ No newline at end of file
+        return control
+
+
+# ============================================================
+# CONTADORES DE CAMBIOS (versionado de respuestas)
+# ============================================================
+
+class ContadorCambios(models.Model):
+    """
+    Versión por tabla, incrementada en cada cambio. Ver apps/balancines/versiones.py
+    """
+    
+    tabla = models.CharField('Tabla', max_length=100, primary_key=True)
+    version = models.BigIntegerField('Versión', default=0)
+    actualizado = models.DateTimeField('Actualizado', auto_now=True)
+    
+    class Meta:
+        db_table = 'app_contador_cambios'
+        verbose_name = 'Contador de cambios'
+        verbose_name_plural = 'Contadores de cambios'
+    
+    def __str__(self):
+        return f"{self.tabla} v{self.version}"
+
+
+# ============================================================
+# ARCHIVO EN FRÍO (alertas resueltas e historial antiguo)
+# ============================================================
+
+class LoteArchivado(models.Model):
+    """
+    Filas archivadas de un modelo, un balancín y un mes: JSONL comprimido
+    con gzip. Ver apps/balancines/services/archivo.py
+    """
+    
+    modelo = models.CharField('Modelo', max_length=60)
+    balancin = models.CharField(
+        'Balancín',
+        max_length=50,
+        help_text='Valor de la clave foránea al balancín en el modelo archivado'
+    )
+    mes = models.DateField('Mes', help_text='Primer día del mes de las filas')
+    cantidad = models.PositiveIntegerField('Filas', default=0)
+    datos = models.BinaryField('Datos (JSONL.gz)')
+    archivado_en = models.DateTimeField('Archivado', auto_now=True)
+    
+    class Meta:
+        db_table = 'app_lote_archivado'
+        verbose_name = 'Lote archivado'
+        verbose_name_plural = 'Lotes archivados'
+        constraints = [
+            models.UniqueConstraint(fields=['modelo', 'balancin', 'mes'], name='lote_archivado_unico'),
+        ]
+        # La restricción única sirve también para leer los lotes de un balancín
+        indexes = [
+            models.Index(fields=['modelo', 'mes'], name='lote_archivado_mes_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.modelo} {self.balancin} {self.mes:%m/%Y} ({self.cantidad})"
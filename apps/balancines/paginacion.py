@@ -0,0 +1,334 @@
+# apps/balancines/paginacion.py
+"""
+Paginación para tablas grandes.
+
+PaginadorEstimado evita el COUNT(*) completo en cada página: si el
+queryset no tiene filtros y la tabla es grande, usa la estimación de filas
+del planificador de PostgreSQL (pg_class.reltuples, sumada por partición
+en las tablas particionadas). Con filtros o en tablas pequeñas hace el
+conteo exacto.
+
+paginar_keyset pagina por cursor en lugar de OFFSET y paginar_combinado
+hace lo mismo sobre varias tablas a la vez (ver más abajo).
+"""
+
+import base64
+import binascii
+import datetime
+import heapq
+import itertools
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+def filas_estimadas(modelo, using='default'):
+    """Filas estimadas de la tabla del modelo (None si la BD no lo soporta o no hay estadísticas)"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        # Las tablas particionadas no se analizan solas (autovacuum solo
+        # analiza las particiones): se suman las estimaciones de las hijas
+        cursor.execute(
+            """
+            SELECT CASE WHEN padre.relkind = 'p' THEN (
+                       SELECT sum(greatest(hija.reltuples, 0))::bigint
+                       FROM pg_inherits
+                       JOIN pg_class hija ON hija.oid = pg_inherits.inhrelid
+                       WHERE pg_inherits.inhparent = padre.oid
+                   ) ELSE padre.reltuples::bigint END
+            FROM pg_class padre
+            WHERE padre.oid = to_regclass(%s)
+            """,
+            [modelo._meta.db_table],
+        )
+        fila = cursor.fetchone()
+    # reltuples es -1 (PG 14+) o 0 si la tabla nunca fue analizada
+    if not fila or fila[0] is None or fila[0] <= 0:
+        return None
+    return fila[0]
+
+
+class PaginadorEstimado(Paginator):
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            umbral = getattr(settings, 'PAGINACION_UMBRAL_ESTIMADO', 10000)
+            estimado = filas_estimadas(queryset.model, queryset.db)
+            if estimado is not None and estimado > umbral:
+                return estimado
+        return super().count
+
+
+# ============================================================
+# PAGINACIÓN POR CURSOR (KEYSET)
+# ============================================================
+#
+# En vez de OFFSET, cada página continúa desde los valores de orden del
+# último registro de la anterior: WHERE (fecha, id) < (:fecha, :id).
+# Con un índice sobre las columnas de orden, la página 1.000 cuesta lo
+# mismo que la primera. El cursor es base64 (url-safe) de un JSON con los
+# valores y la dirección.
+
+MAX_POR_PAGINA = 100
+
+
+def limitar_por_pagina(valor, defecto=10, maximo=MAX_POR_PAGINA):
+    """Tamaño de página pedido por el usuario, acotado a [1, maximo]"""
+    try:
+        valor = int(valor)
+    except (TypeError, ValueError):
+        return defecto
+    return max(1, min(valor, maximo))
+
+
+class _CodificadorCursor(DjangoJSONEncoder):
+    """DjangoJSONEncoder recorta las fechas a milisegundos; el cursor necesita el valor exacto"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def codificar_cursor(valores, direccion='sig'):
+    carga = json.dumps({'v': valores, 'd': direccion}, cls=_CodificadorCursor, separators=(',', ':'))
+    return base64.urlsafe_b64encode(carga.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """(valores, direccion) o None si el cursor no es válido"""
+    if not cursor:
+        return None
+    try:
+        carga = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        valores, direccion = carga['v'], carga.get('d', 'sig')
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+    if not isinstance(valores, list) or direccion not in ('sig', 'ant'):
+        return None
+    return valores, direccion
+
+
+class PaginaKeyset:
+    """Resultado de paginar_keyset (iterable como una página de Paginator)"""
+
+    def __init__(self, objetos, por_pagina, siguiente_cursor=None, anterior_cursor=None):
+        self.object_list = objetos
+        self.por_pagina = por_pagina
+        self.siguiente_cursor = siguiente_cursor
+        self.anterior_cursor = anterior_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.siguiente_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.anterior_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def url(self, request, cursor):
+        """URL actual con otro cursor (conserva filtros y tamaño de página)"""
+        parametros = request.GET.copy()
+        parametros.pop('cursor', None)
+        if cursor:
+            parametros['cursor'] = cursor
+        return f'{request.path}?{parametros.urlencode()}'
+
+    def con_urls(self, request):
+        """Agrega url_siguiente, url_anterior y url_primera para las plantillas"""
+        self.url_siguiente = self.url(request, self.siguiente_cursor) if self.has_next else None
+        self.url_anterior = self.url(request, self.anterior_cursor) if self.has_previous else None
+        self.url_primera = self.url(request, None)
+        return self
+
+
+def _valor_orden(objeto, campo):
+    valor = objeto
+    for parte in campo.split('__'):
+        valor = valor[parte] if isinstance(valor, dict) else getattr(valor, parte)
+    return valor
+
+
+def _condicion_despues(campos, valores):
+    """
+    Q para "después de `valores`" en el orden `campos`:
+    (a > x) OR (a = x AND b > y) OR ..., con < para los campos descendentes.
+    """
+    condicion = Q()
+    for i, campo in enumerate(campos):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        iguales = {c.lstrip('-'): valores[j] for j, c in enumerate(campos[:i])}
+        condicion |= Q(**iguales, **{f'{nombre}__{operador}': valores[i]})
+
+    # Cota redundante sobre el primer campo: permite recorrer su índice desde
+    # el cursor y cortar en el LIMIT en vez de combinar los OR con bitmaps
+    primero = campos[0]
+    cota = 'lte' if primero.startswith('-') else 'gte'
+    return Q(**{f'{primero.lstrip("-")}__{cota}': valores[0]}) & condicion
+
+
+def _invertir(campo):
+    return campo[1:] if campo.startswith('-') else f'-{campo}'
+
+
+def paginar_keyset(queryset, orden, cursor=None, por_pagina=10):
+    """
+    Página del queryset en el orden `orden` (p. ej. ('-fecha_oh', '-id')),
+    continuando desde `cursor`. Los campos no pueden ser nulos y el último
+    debe ser único (id) para que el orden sea total. Un cursor inválido se
+    trata como la primera página.
+    """
+    orden = list(orden)
+    modelo = queryset.model
+    decodificado = decodificar_cursor(cursor)
+    valores, direccion = decodificado if decodificado else (None, 'sig')
+    if valores is not None and len(valores) != len(orden):
+        valores, direccion = None, 'sig'
+
+    if valores is not None:
+        valores = _convertir_valores(modelo, orden, valores)
+        if valores is None:
+            direccion = 'sig'
+
+    if direccion == 'ant':
+        orden_consulta = [_invertir(campo) for campo in orden]
+    else:
+        orden_consulta = orden
+
+    queryset = queryset.order_by(*orden_consulta)
+    if valores is not None:
+        queryset = queryset.filter(_condicion_despues(orden_consulta, valores))
+
+    objetos = list(queryset[:por_pagina + 1])
+    hay_mas = len(objetos) > por_pagina
+    objetos = objetos[:por_pagina]
+
+    if direccion == 'ant':
+        objetos.reverse()
+        hay_siguiente, hay_anterior = True, hay_mas
+    else:
+        hay_siguiente, hay_anterior = hay_mas, valores is not None
+
+    def cursor_de(objeto, sentido):
+        return codificar_cursor([_valor_orden(objeto, campo.lstrip('-')) for campo in orden], sentido)
+
+    return PaginaKeyset(
+        objetos,
+        por_pagina,
+        siguiente_cursor=cursor_de(objetos[-1], 'sig') if objetos and hay_siguiente else None,
+        anterior_cursor=cursor_de(objetos[0], 'ant') if objetos and hay_anterior else None,
+    )
+
+
+def _campo_modelo(modelo, ruta):
+    """Campo final de una ruta con __ (p. ej. 'repuesto__item')"""
+    partes = ruta.split('__')
+    for parte in partes[:-1]:
+        modelo = modelo._meta.get_field(parte).related_model
+    campo = modelo._meta.get_field(partes[-1])
+    # Para claves foráneas el valor guardado es el de la clave del modelo relacionado
+    return campo.target_field if campo.is_relation else campo
+
+
+def _convertir_valores(modelo, orden, valores):
+    """
+    Valores de un cursor convertidos al tipo de cada campo de `orden`.
+    None si alguno no es válido: el cursor viene del usuario y puede traer
+    cualquier JSON (nulos, listas, fechas mal formadas).
+    """
+    try:
+        convertidos = [
+            _campo_modelo(modelo, campo.lstrip('-')).to_python(valor)
+            for campo, valor in zip(orden, valores)
+        ]
+    except (ValidationError, TypeError, ValueError):
+        return None
+    # Los campos de orden no son nulos; un None no sirve como cota del filtro
+    if any(valor is None for valor in convertidos):
+        return None
+    return convertidos
+
+
+# ============================================================
+# PAGINACIÓN POR CURSOR SOBRE VARIAS TABLAS
+# ============================================================
+
+def paginar_combinado(querysets, orden, cursor=None, por_pagina=10):
+    """
+    Página de la unión de varios querysets con las mismas columnas de orden
+    (p. ej. dos tablas de historial por ('-fecha_movimiento', '-id')).
+
+    Cada queryset se lee con su índice desde el cursor y se piden solo
+    por_pagina + 1 filas de cada uno; heapq.merge los intercala y se toman
+    las primeras. Los empates entre tablas se ordenan por la posición del
+    queryset en la lista, que también va en el cursor. Solo se avanza hacia
+    adelante ("Cargar más"). Los objetos devueltos llevan el atributo
+    `indice_fuente` con la posición de su queryset.
+    """
+    orden = list(orden)
+    descendente = orden[0].startswith('-')
+    if any(campo.startswith('-') != descendente for campo in orden):
+        raise ValueError('paginar_combinado requiere que todos los campos tengan la misma dirección')
+    campos = [campo.lstrip('-') for campo in orden]
+
+    decodificado = decodificar_cursor(cursor)
+    valores, fuente_cursor = None, None
+    if decodificado and decodificado[1] == 'sig' and len(decodificado[0]) == len(orden) + 1:
+        *valores, fuente_cursor = decodificado[0]
+        if not isinstance(fuente_cursor, int):
+            valores, fuente_cursor = None, None
+
+    def lote(indice, queryset):
+        queryset = queryset.order_by(*orden)
+        if valores is not None:
+            convertidos = _convertir_valores(queryset.model, campos, valores)
+            if convertidos is not None:
+                condicion = _condicion_despues(orden, convertidos)
+                if indice > fuente_cursor:
+                    # En un empate exacto, las fuentes posteriores van después
+                    condicion |= Q(**dict(zip(campos, convertidos)))
+                queryset = queryset.filter(condicion)
+        for objeto in queryset[:por_pagina + 1]:
+            objeto.indice_fuente = indice
+            yield objeto
+
+    def clave(objeto):
+        posicion = -objeto.indice_fuente if descendente else objeto.indice_fuente
+        return (*[_valor_orden(objeto, campo) for campo in campos], posicion)
+
+    combinados = heapq.merge(
+        *[lote(indice, queryset) for indice, queryset in enumerate(querysets)],
+        key=clave, reverse=descendente,
+    )
+    objetos = list(itertools.islice(combinados, por_pagina + 1))
+    hay_mas = len(objetos) > por_pagina
+    objetos = objetos[:por_pagina]
+
+    siguiente = None
+    if objetos and hay_mas:
+        ultimo = objetos[-1]
+        siguiente = codificar_cursor([_valor_orden(ultimo, campo) for campo in campos] + [ultimo.indice_fuente])
+
+    return PaginaKeyset(objetos, por_pagina, siguiente_cursor=siguiente)
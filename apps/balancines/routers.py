@@ -0,0 +1,81 @@
+# apps/balancines/routers.py
+"""
+Enrutamiento de lecturas a la réplica.
+
+Las vistas de solo lectura pesadas (tableros, historiales, reportes) se
+marcan con @solo_lectura y sus consultas van al alias 'replica'; todo lo
+demás, incluidas todas las escrituras, va a 'default'. Así los reportes no
+esperan detrás de las transacciones de stock (select_for_update) de los
+formularios, y cada alias tiene su propio pool de conexiones (pgbouncer,
+ver docker-compose.prod.yml).
+
+Las vistas que escriben no se marcan: leer de la réplica justo después de
+escribir en 'default' puede devolver datos con retraso de replicación.
+
+    @login_required
+    @solo_lectura
+    def dashboard_oh_nuevo(request): ...
+
+    with usar_replica():
+        ...  # comandos o servicios
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+ALIAS_ESCRITURA = 'default'
+ALIAS_LECTURA = 'replica'
+
+_leer_replica = ContextVar('leer_replica', default=False)
+
+
+def replica_configurada():
+    return ALIAS_LECTURA in settings.DATABASES
+
+
+@contextmanager
+def usar_replica():
+    """Las lecturas dentro del bloque van a la réplica (si está configurada)"""
+    token = _leer_replica.set(True)
+    try:
+        yield
+    finally:
+        _leer_replica.reset(token)
+
+
+def solo_lectura(vista):
+    """Decorador para vistas que no escriben: sus consultas van a la réplica"""
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        with usar_replica():
+            response = vista(request, *args, **kwargs)
+            # Las TemplateResponse se renderizan después; forzarlo aquí
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+            return response
+    return envoltura
+
+
+class RouterLecturaEscritura:
+    """Lecturas de las vistas @solo_lectura a 'replica'; el resto a 'default'"""
+
+    def db_for_read(self, model, **hints):
+        if _leer_replica.get() and replica_configurada():
+            return ALIAS_LECTURA
+        return ALIAS_ESCRITURA
+
+    def db_for_write(self, model, **hints):
+        return ALIAS_ESCRITURA
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y principal tienen los mismos datos
+        alias = {ALIAS_ESCRITURA, ALIAS_LECTURA}
+        if obj1._state.db in alias and obj2._state.db in alias:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == ALIAS_ESCRITURA
@@ -0,0 +1,151 @@
+# apps/balancines/selectors.py
+"""
+Consultas de lectura compartidas por las vistas.
+
+Las vistas de distintos dominios (views/) repetían las mismas consultas:
+conteos del inventario, filtros de repuestos por stock, el siguiente número
+de OH de un balancín, las torres de una línea con un tipo de balancín...
+Aquí quedan en un solo lugar. Solo leen; las escrituras siguen en las
+vistas y en services/. Respetan el router: dentro de una vista
+@solo_lectura van a la réplica.
+"""
+
+from django.db.models import Count, Q
+
+from .models import (
+    BalancinIndividual, HistorialAdicional, HistorialOH, HistorialRepuesto,
+    Linea, RepuestoAdicional, RepuestoBalancin, TipoBalancin, Torre,
+)
+
+# Por debajo de esta cantidad (y mayor que 0) un repuesto tiene stock bajo
+UMBRAL_STOCK_BAJO = 5
+
+
+# ============================================================
+# INVENTARIO
+# ============================================================
+
+def conteos_inventario():
+    """Totales de tipos, balancines (por sentido), torres, líneas y repuestos"""
+    balancines = BalancinIndividual.objects.aggregate(
+        total=Count('pk'),
+        asc=Count('pk', filter=Q(sentido='ASCENDENTE')),
+        desc=Count('pk', filter=Q(sentido='DESCENDENTE')),
+    )
+    repuestos_balancin = RepuestoBalancin.objects.count()
+    repuestos_adicional = RepuestoAdicional.objects.count()
+    return {
+        'total_tipos': TipoBalancin.objects.count(),
+        'total_balancines': balancines['total'],
+        'balancines_asc': balancines['asc'],
+        'balancines_desc': balancines['desc'],
+        'total_torres': Torre.objects.count(),
+        'total_lineas': Linea.objects.count(),
+        'repuestos_balancin': repuestos_balancin,
+        'repuestos_adicional': repuestos_adicional,
+        'total_repuestos': repuestos_balancin + repuestos_adicional,
+    }
+
+
+def filtrar_repuestos(modelo, query='', stock=''):
+    """Repuestos (RepuestoBalancin o RepuestoAdicional) por texto y estado de stock ('bajo' / 'agotado')"""
+    repuestos = modelo.objects.all().order_by('item')
+    if query:
+        repuestos = repuestos.filter(
+            Q(item__icontains=query) | Q(descripcion__icontains=query) |
+            Q(ubicacion__icontains=query) | Q(observaciones__icontains=query)
+        )
+    if stock == 'bajo':
+        repuestos = repuestos.filter(cantidad__lt=UMBRAL_STOCK_BAJO, cantidad__gt=0)
+    elif stock == 'agotado':
+        repuestos = repuestos.filter(cantidad=0)
+    return repuestos
+
+
+def repuestos_bajo_stock(modelo):
+    return modelo.objects.filter(cantidad__lt=UMBRAL_STOCK_BAJO, cantidad__gt=0)
+
+
+def repuestos_sin_stock(modelo):
+    return modelo.objects.filter(cantidad=0)
+
+
+def ultimas_actividades_repuestos(limite=5):
+    """Últimos movimientos de stock de repuestos de balancín (para las listas de repuestos)"""
+    historiales = HistorialRepuesto.objects.select_related('repuesto').order_by('-fecha_movimiento')[:limite]
+    return [
+        {
+            'fecha': h.fecha_movimiento,
+            'tipo': h.tipo_movimiento,
+            'repuesto': h.repuesto.item,
+            'cantidad': h.cantidad,
+            'stock_restante': h.stock_restante,
+            'observaciones': h.observaciones,
+            'tipo_actividad': 'movimiento_stock',
+            'icono': 'fa-exchange-alt' if h.tipo_movimiento == 'entrada' else 'fa-external-link-alt',
+            'color': 'success' if h.tipo_movimiento == 'entrada' else 'danger',
+        }
+        for h in historiales
+    ]
+
+
+def ultimas_actividades_adicionales(limite=5):
+    """Últimos movimientos de stock de repuestos adicionales, con el usuario que los hizo"""
+    historiales = HistorialAdicional.objects.select_related(
+        'repuesto', 'usuario'
+    ).order_by('-fecha_movimiento')[:limite]
+    return [
+        {
+            'fecha': h.fecha_movimiento,
+            'tipo': h.tipo_movimiento,
+            'repuesto': h.repuesto.item,
+            'cantidad': h.cantidad,
+            'stock_restante': h.stock_restante,
+            'observaciones': h.observaciones,
+            'usuario': h.usuario.nombre if h.usuario else 'Sistema',
+        }
+        for h in historiales
+    ]
+
+
+# ============================================================
+# BALANCINES, OH Y TORRES
+# ============================================================
+
+def ultimo_oh(balancin):
+    return HistorialOH.objects.filter(balancin=balancin).order_by('-numero_oh').first()
+
+
+def siguiente_numero_oh(balancin):
+    ultimo = ultimo_oh(balancin)
+    return (ultimo.numero_oh + 1) if ultimo else 1
+
+
+def torres_con_tipo(linea_nombre, tipo_balancin):
+    """
+    Torres de la línea que llevan el tipo de balancín en algún sentido, por
+    número. None si la línea no existe.
+    """
+    linea = Linea.objects.filter(nombre=linea_nombre).first()
+    if linea is None:
+        return None
+    return Torre.objects.filter(linea=linea).filter(
+        Q(tipo_balancin_ascendente=tipo_balancin) |
+        Q(tipo_balancin_descendente=tipo_balancin)
+    ).select_related('seccion').order_by('numero_torre')
+
+
+def _orden_por_torre(balancin):
+    """Línea, número de torre (numérico, '12A' -> 12) y sentido"""
+    torre = balancin.torre
+    numero = int(''.join(filter(str.isdigit, torre.numero_torre)) or 0)
+    return (torre.linea_id, numero, torre.numero_torre, balancin.sentido)
+
+
+def balancines_por_torre(*estados):
+    """Balancines en los estados dados, ordenados por línea, torre y sentido"""
+    balancines = list(
+        BalancinIndividual.objects.filter(estado__in=estados).select_related('torre__linea')
+    )
+    balancines.sort(key=_orden_por_torre)
+    return balancines
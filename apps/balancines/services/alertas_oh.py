@@ -1,7 +1,6 @@
 # apps/balancines/services/alertas_oh.py
 
 from django.utils import timezone
-from datetime import timedelta
 from django.core.mail import send_mail
 from django.conf import settings
 import logging
@@ -16,6 +15,7 @@ class ServicioAlertasOH:
     """
     
     UMBRAL_ALERTA = 5000
+    UMBRAL_CRITICO = 50
     
     @classmethod
     def determinar_nivel(cls, backlog):
@@ -26,13 +26,29 @@ class ServicioAlertasOH:
             return None
         elif backlog < 0:
             return 'VENCIDO'
-        elif backlog <= 50:
+        elif backlog <= cls.UMBRAL_CRITICO:
             return 'CRITICO'
-        elif backlog <= 5000:
+        elif backlog <= cls.UMBRAL_ALERTA:
             return 'ALERTA'
         else:
             return 'VERDE'
     
+    @classmethod
+    def fecha_cambio_nivel(cls, rango, horas_base, fecha_base, fecha_referencia, calendario):
+        """
+        Primer día posterior a fecha_referencia en que el backlog proyectado
+        (rango - horas_base - horas operadas desde fecha_base según el
+        calendario de la línea) entra en el nivel siguiente. None si ya está
+        VENCIDO (no cambia más hasta que cambie la base) o si la línea no
+        vuelve a operar.
+        """
+        backlog = rango - horas_base - calendario.horas_entre(fecha_base, fecha_referencia)
+        # Backlog con el que empieza cada nivel: ALERTA, CRITICO, VENCIDO
+        umbral = next((u for u in (cls.UMBRAL_ALERTA, cls.UMBRAL_CRITICO, -1) if u < backlog), None)
+        if umbral is None:
+            return None
+        return calendario.fecha_al_acumular(fecha_base, rango - horas_base - umbral)
+    
     @classmethod
     def obtener_control_horas(cls, balancin):
         """
@@ -40,7 +56,8 @@ class ServicioAlertasOH:
         """
         from apps.balancines.models import ControlHorasBalancin
         try:
-            return ControlHorasBalancin.objects.get(balancin=balancin)
+            # Usa el control ya cargado si vino con select_related('control_horas')
+            return balancin.control_horas
         except ControlHorasBalancin.DoesNotExist:
             return None
     
@@ -167,10 +184,16 @@ Fecha: {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}
             print(f"⚠️ {balancin.codigo} no tiene registro de control de horas")
             return None
         
-        # Recalcular horas en vivo
+        # Recalcular horas en vivo y la próxima evaluación; persistirlas si cambiaron
         hoy = timezone.now().date()
+        previos = (control.horas_actuales, control.backlog_actual, control.proxima_evaluacion)
         horas_actuales = control.recalcular_horas(hoy)
         backlog = control.backlog_actual
+        control.programar_evaluacion(hoy)
+        if (horas_actuales, backlog, control.proxima_evaluacion) != previos:
+            control.save(update_fields=[
+                'horas_actuales', 'backlog_actual', 'proxima_evaluacion', 'ultima_actualizacion'
+            ])
         
         print(f"📊 {balancin.codigo}: Horas actuales={horas_actuales}, Backlog={backlog}")
         
@@ -195,12 +218,11 @@ Fecha: {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}
                 cls._enviar_email_inmediato(alerta_existente)
             return alerta_existente
         
-        # Calcular fecha estimada de vencimiento
+        # Calcular fecha estimada de vencimiento (días de operación de la línea)
         if backlog < 0:
-            fecha_estimada = timezone.now().date()
+            fecha_estimada = hoy
         else:
-            dias_estimados = backlog / 16
-            fecha_estimada = timezone.now().date() + timedelta(days=int(dias_estimados))
+            fecha_estimada = control.calendario().fecha_al_acumular(hoy, backlog)
         
         # Crear nueva alerta
         alerta = AlertaOH.objects.create(
@@ -223,9 +245,14 @@ Fecha: {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}
         return alerta
     
     @classmethod
-    def generar_todas_las_alertas(cls, forzar=False, enviar_email=True):
+    def generar_todas_las_alertas(cls, forzar=False, enviar_email=True, completa=False):
         """
-        Genera alertas para todos los balancines basado en ControlHorasBalancin
+        Genera alertas basado en ControlHorasBalancin. Solo se evalúan los
+        balancines cuya proxima_evaluacion llegó (su backlog cruzó un umbral
+        o cambió su base): el costo depende de los cambios de nivel, no del
+        tamaño de la flota. Antes se proyectan todos los controles a hoy.
+        Con completa=True se evalúan todos los que están bajo el umbral
+        (p. ej. después de borrar las alertas).
         """
         from apps.balancines.models import BalancinIndividual, ControlHorasBalancin
         
@@ -242,7 +269,25 @@ Fecha: {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}
         
         print("🔍 Generando alertas basadas en ControlHorasBalancin...")
         
-        for balancin in BalancinIndividual.objects.all():
+        hoy = timezone.now().date()
+        # Proyectar todos los controles a hoy aunque solo se evalúen los pendientes:
+        # esta tarea diaria es la que mantiene al día horas_actuales/backlog_actual
+        # para los filtros SQL por backlog (índice ctrlhoras_backlog_idx)
+        ControlHorasBalancin.objects.avanzar(hoy)
+        if completa:
+            # Solo se revisan los que están bajo el umbral (rango del índice de backlog_actual)
+            candidatos = BalancinIndividual.objects.filter(
+                control_horas__backlog_actual__lte=cls.UMBRAL_ALERTA
+            )
+            resultados['omitidos_verde'] = ControlHorasBalancin.objects.filter(
+                backlog_actual__gt=cls.UMBRAL_ALERTA
+            ).count()
+        else:
+            # Rango del índice de proxima_evaluacion; cada evaluación programa la siguiente
+            candidatos = BalancinIndividual.objects.filter(control_horas__proxima_evaluacion__lte=hoy)
+        candidatos = candidatos.select_related('control_horas', 'torre__linea')
+        
+        for balancin in candidatos:
             try:
                 resultados['procesados'] += 1
                 alerta = cls.generar_alerta_para_balancin(
@@ -0,0 +1,229 @@
+# apps/balancines/services/archivo.py
+"""
+Archivo en frío de alertas resueltas e historial antiguo.
+
+Las filas que ya no se consultan en el día a día salen de sus tablas y se
+guardan en LoteArchivado: un lote por modelo, balancín y mes, con las filas
+serializadas como JSONL comprimido con gzip. Así los badges y contadores
+(alertas sin resolver, últimos movimientos) recorren solo filas vivas.
+
+    AlertaOH            resueltas hace más de ARCHIVO_ALERTAS_DIAS días
+    HistorialBalancin   movimientos de hace más de ARCHIVO_HISTORIAL_MESES meses
+
+Las vistas de detalle leen lo archivado con del_balancin() y completar():
+las filas vuelven como instancias del modelo (sin guardar, con
+archivado=True). El movimiento lo hace manage.py archivar_historial; con
+--exportar deja además copias <modelo>/<AAAA-MM>.jsonl.gz en
+MEDIA_ROOT/archivo/ para respaldos fuera de la base de datos.
+
+HistorialOH no se archiva: la numeración de OH, los tableros y los
+formularios dependen de todas sus filas.
+"""
+
+import gzip
+import json
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import LoteArchivado
+from .particiones import inicio_mes
+
+logger = logging.getLogger(__name__)
+
+
+class ServicioArchivo:
+
+    # Modelo -> campo de fecha que decide el mes del lote y el orden de lectura
+    MODELOS = {
+        'balancines.AlertaOH': 'fecha_resolucion',
+        'balancines.HistorialBalancin': 'fecha_cambio',
+    }
+
+    # ============================================================
+    # SERIALIZACIÓN
+    # ============================================================
+
+    @staticmethod
+    def _campos(modelo):
+        return modelo._meta.concrete_fields
+
+    @classmethod
+    def _comprimir(cls, filas):
+        lineas = ''.join(json.dumps(fila, cls=DjangoJSONEncoder) + '\n' for fila in filas)
+        return gzip.compress(lineas.encode('utf-8'))
+
+    @staticmethod
+    def _descomprimir(datos):
+        return [json.loads(linea) for linea in gzip.decompress(bytes(datos)).decode('utf-8').splitlines()]
+
+    @classmethod
+    def como_dict(cls, instancia):
+        """Columnas de la fila por attname (lo que se guarda en el lote)"""
+        return {campo.attname: campo.value_from_object(instancia) for campo in cls._campos(type(instancia))}
+
+    @classmethod
+    def _a_instancia(cls, modelo, fila):
+        """Instancia sin guardar; las claves foráneas se resuelven al acceder, como siempre"""
+        valores = {
+            campo.attname: campo.to_python(fila[campo.attname])
+            for campo in cls._campos(modelo) if campo.attname in fila
+        }
+        instancia = modelo(**valores)
+        instancia._state.adding = False
+        instancia.archivado = True
+        return instancia
+
+    @classmethod
+    def _fecha(cls, label, instancia):
+        fecha = getattr(instancia, cls.MODELOS[label])
+        if fecha is None:
+            # Alertas resueltas antes de que se guardara la fecha de resolución
+            fecha = instancia.fecha_generacion
+        return fecha
+
+    @staticmethod
+    def _clave_balancin(modelo, balancin):
+        """Valor que guarda la FK `balancin` del modelo (id o código según el modelo)"""
+        return str(getattr(balancin, modelo._meta.get_field('balancin').target_field.attname))
+
+    # ============================================================
+    # ARCHIVADO
+    # ============================================================
+
+    @classmethod
+    def limite(cls, label):
+        """Fecha antes de la cual las filas del modelo se archivan"""
+        if label == 'balancines.AlertaOH':
+            return timezone.now() - timedelta(days=getattr(settings, 'ARCHIVO_ALERTAS_DIAS', 90))
+        hoy = timezone.localdate()
+        return inicio_mes(hoy.year, hoy.month - getattr(settings, 'ARCHIVO_HISTORIAL_MESES', 24))
+
+    @classmethod
+    def candidatas(cls, label, limite=None):
+        """Filas del modelo que se archivarían con el límite dado"""
+        modelo = apps.get_model(label)
+        limite = limite or cls.limite(label)
+        campo = cls.MODELOS[label]
+        if label == 'balancines.AlertaOH':
+            return modelo.objects.filter(
+                Q(fecha_resolucion__lt=limite) | Q(fecha_resolucion__isnull=True, fecha_generacion__lt=limite),
+                resuelta=True,
+            )
+        return modelo.objects.filter(**{f'{campo}__lt': limite})
+
+    @classmethod
+    def archivar(cls, label, limite=None, lote=1000):
+        """
+        Mueve las filas candidatas a LoteArchivado, `lote` filas por
+        transacción: se agregan a los lotes de su balancín y mes y se borran
+        de la tabla. Devuelve el total archivado.
+        """
+        modelo = apps.get_model(label)
+        queryset = cls.candidatas(label, limite).order_by('pk')
+        total = 0
+        while True:
+            with transaction.atomic():
+                filas = list(queryset.select_for_update(skip_locked=True)[:lote])
+                if not filas:
+                    return total
+
+                grupos = defaultdict(list)
+                for fila in filas:
+                    fecha = timezone.localtime(cls._fecha(label, fila))
+                    grupos[(str(fila.balancin_id), fecha.date().replace(day=1))].append(cls.como_dict(fila))
+
+                for (balancin, mes), nuevas in grupos.items():
+                    cls._agregar(label, balancin, mes, nuevas)
+                modelo.objects.filter(pk__in=[fila.pk for fila in filas]).delete()
+            total += len(filas)
+            logger.info(f"Archivadas {total} filas de {label}")
+
+    @classmethod
+    def _agregar(cls, label, balancin, mes, nuevas):
+        lote, creado = LoteArchivado.objects.select_for_update().get_or_create(
+            modelo=label, balancin=balancin, mes=mes, defaults={'datos': b''}
+        )
+        filas = [] if creado else cls._descomprimir(lote.datos)
+        filas.extend(nuevas)
+        lote.datos = cls._comprimir(filas)
+        lote.cantidad = len(filas)
+        lote.save(update_fields=['datos', 'cantidad', 'archivado_en'])
+
+    # ============================================================
+    # LECTURA
+    # ============================================================
+
+    @classmethod
+    def del_balancin(cls, label, balancin, limite=None):
+        """
+        Filas archivadas del balancín como instancias del modelo, de la más
+        reciente a la más antigua. Con `limite` solo descomprime los lotes
+        necesarios.
+        """
+        modelo = apps.get_model(label)
+        lotes = LoteArchivado.objects.filter(
+            modelo=label, balancin=cls._clave_balancin(modelo, balancin)
+        ).order_by('-mes').only('datos')
+
+        instancias = []
+        for lote in lotes.iterator():
+            del_mes = [cls._a_instancia(modelo, fila) for fila in cls._descomprimir(lote.datos)]
+            del_mes.sort(key=lambda instancia: (cls._fecha(label, instancia), instancia.pk), reverse=True)
+            instancias.extend(del_mes)
+            if limite is not None and len(instancias) >= limite:
+                return instancias[:limite]
+        return instancias
+
+    @classmethod
+    def completar(cls, filas, label, balancin, cantidad):
+        """Completa con filas archivadas una lista de filas vivas que no llega a `cantidad`"""
+        filas = list(filas)
+        if len(filas) < cantidad:
+            filas.extend(cls.del_balancin(label, balancin, limite=cantidad - len(filas)))
+        return filas
+
+    @classmethod
+    def contar(cls, balancin):
+        """Filas archivadas del balancín por modelo ({label: cantidad})"""
+        claves = Q()
+        for label in cls.MODELOS:
+            claves |= Q(modelo=label, balancin=cls._clave_balancin(apps.get_model(label), balancin))
+        conteos = {label: 0 for label in cls.MODELOS}
+        for lote in LoteArchivado.objects.filter(claves).values('modelo', 'cantidad'):
+            conteos[lote['modelo']] += lote['cantidad']
+        return conteos
+
+    # ============================================================
+    # EXPORTACIÓN
+    # ============================================================
+
+    @classmethod
+    def directorio(cls):
+        return Path(settings.MEDIA_ROOT) / 'archivo'
+
+    @classmethod
+    def exportar(cls, label, mes):
+        """
+        Escribe todas las filas archivadas del modelo en ese mes en
+        MEDIA_ROOT/archivo/<modelo>/<AAAA-MM>.jsonl.gz. Devuelve la ruta, o
+        None si el mes no tiene filas archivadas.
+        """
+        lotes = LoteArchivado.objects.filter(modelo=label, mes=mes).order_by('balancin')
+        if not lotes.exists():
+            return None
+        ruta = cls.directorio() / label.split('.')[-1].lower() / f'{mes:%Y-%m}.jsonl.gz'
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        # Los lotes ya son JSONL.gz: se concatenan como miembros gzip sin recomprimir
+        with open(ruta, 'wb') as archivo:
+            for lote in lotes.only('datos').iterator():
+                archivo.write(bytes(lote.datos))
+        return ruta
@@ -0,0 +1,209 @@
+# apps/balancines/services/calendario.py
+"""
+Calendario de operación por línea y horas acumuladas por suma de prefijos.
+
+Cada línea opera en una ventana de servicio (CalendarioLinea: hora de
+inicio, horas por día y días de la semana). ExcepcionOperacion registra
+feriados, paradas y horarios especiales de una línea o de todas. Las líneas
+sin calendario operan HORAS_OPERACION_DIA desde HORA_INICIO_OPERACION
+todos los días.
+
+Por línea se precalcula un arreglo de horas acumuladas desde ORIGEN:
+
+    acumuladas[i] = horas operadas en los días [ORIGEN, ORIGEN + i)
+
+"Horas entre A y B" es acumuladas[B] - acumuladas[A] (O(1)). "Día en que
+se completan N horas desde A" es una búsqueda binaria. Los arreglos viven
+en cada proceso y se reconstruyen cuando cambian los calendarios
+(contadores de versiones.py, revisados cada REVISION_SEGUNDOS).
+"""
+
+import bisect
+import threading
+import time as reloj
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+# Primer día de los arreglos; antes se cuentan días completos de la ventana
+ORIGEN = date(2000, 1, 1)
+# Días que se agregan a los arreglos cada vez que una consulta los supera
+EXTENSION_DIAS = 366 * 2
+
+
+def _a_horas(hora):
+    """time -> horas decimales (06:30 -> 6.5)"""
+    return hora.hour + hora.minute / 60
+
+
+def horas_transcurridas(hora_inicio, horas, ahora):
+    """Horas de la ventana [hora_inicio, hora_inicio + horas) transcurridas a la hora de `ahora`"""
+    hora_actual = ahora.hour + ahora.minute / 60
+    return min(horas, max(0, hora_actual - hora_inicio))
+
+
+class CalendarioOperacion:
+    """Ventana de servicio de una línea con sus horas acumuladas por día"""
+
+    def __init__(self, hora_inicio, horas_dia, dias_semana, excepciones=None):
+        self.hora_inicio = hora_inicio
+        self.horas_dia = horas_dia
+        self.dias_semana = frozenset(int(dia) for dia in dias_semana)
+        # {fecha: (horas operadas, hora de inicio o None)}
+        self.excepciones = excepciones or {}
+        self.acumuladas = array('q', [0])
+        self._lock = threading.Lock()
+        self._extender(timezone.now().date() + timedelta(days=EXTENSION_DIAS))
+
+    def ventana(self, fecha):
+        """(hora de inicio, horas de operación) del día"""
+        if fecha in self.excepciones:
+            horas, inicio = self.excepciones[fecha]
+            return (self.hora_inicio if inicio is None else inicio), horas
+        if fecha.isoweekday() in self.dias_semana:
+            return self.hora_inicio, self.horas_dia
+        return self.hora_inicio, 0
+
+    def _extender(self, hasta):
+        with self._lock:
+            fecha = ORIGEN + timedelta(days=len(self.acumuladas) - 1)
+            total = self.acumuladas[-1]
+            nuevas = []
+            while fecha < hasta:
+                total += self.ventana(fecha)[1]
+                nuevas.append(total)
+                fecha += timedelta(days=1)
+            self.acumuladas.extend(nuevas)
+
+    def _acumuladas(self, fecha):
+        dias = (fecha - ORIGEN).days
+        if dias < 0:
+            return dias * self.horas_dia
+        if dias >= len(self.acumuladas):
+            self._extender(fecha + timedelta(days=EXTENSION_DIAS))
+        return self.acumuladas[dias]
+
+    def horas_entre(self, desde, hasta):
+        """Horas operadas en los días [desde, hasta); 0 si hasta <= desde"""
+        if hasta <= desde:
+            return 0
+        return self._acumuladas(hasta) - self._acumuladas(desde)
+
+    def fecha_al_acumular(self, desde, horas):
+        """
+        Primer día D con horas_entre(desde, D) >= horas. None si la línea
+        no vuelve a operar (sin horas ni días de operación).
+        """
+        if horas <= 0:
+            return desde
+        if not self.horas_dia or not self.dias_semana:
+            return None
+        objetivo = self._acumuladas(max(desde, ORIGEN)) + horas
+        while self.acumuladas[-1] < objetivo:
+            self._extender(ORIGEN + timedelta(days=len(self.acumuladas) - 1 + EXTENSION_DIAS))
+        return ORIGEN + timedelta(days=bisect.bisect_left(self.acumuladas, objetivo))
+
+    def horas_transcurridas(self, ahora):
+        """Horas operadas en el día de `ahora` hasta esa hora"""
+        return horas_transcurridas(*self.ventana(ahora.date()), ahora)
+
+
+class ServicioCalendario:
+
+    REVISION_SEGUNDOS = 60
+
+    _calendarios = None
+    _token = None
+    _revisado = 0
+    _lock = threading.Lock()
+
+    # ============================================================
+    # CALENDARIOS POR LÍNEA
+    # ============================================================
+
+    @classmethod
+    def calendarios(cls):
+        """{linea_id: CalendarioOperacion}; la clave None es el calendario por defecto"""
+        from apps.balancines.models import CalendarioLinea, ExcepcionOperacion
+        from apps.balancines.versiones import token_version
+
+        ahora = reloj.monotonic()
+        if cls._calendarios is not None and ahora - cls._revisado < cls.REVISION_SEGUNDOS:
+            return cls._calendarios
+
+        token = token_version(CalendarioLinea, ExcepcionOperacion)
+        with cls._lock:
+            if cls._calendarios is None or token != cls._token:
+                cls._calendarios = cls._construir()
+                cls._token = token
+            cls._revisado = ahora
+        return cls._calendarios
+
+    @classmethod
+    def _construir(cls):
+        from apps.balancines.models import (
+            CalendarioLinea, ExcepcionOperacion, HORA_INICIO_OPERACION, HORAS_OPERACION_DIA,
+        )
+
+        generales = {}
+        por_linea = defaultdict(dict)
+        for excepcion in ExcepcionOperacion.objects.values('linea_id', 'fecha', 'horas_operadas', 'hora_inicio'):
+            destino = por_linea[excepcion['linea_id']] if excepcion['linea_id'] else generales
+            inicio = excepcion['hora_inicio']
+            destino[excepcion['fecha']] = (excepcion['horas_operadas'], _a_horas(inicio) if inicio else None)
+
+        defecto = CalendarioOperacion(_a_horas(HORA_INICIO_OPERACION), HORAS_OPERACION_DIA, '1234567', generales)
+        calendarios = {None: defecto}
+        ventanas = {ventana.linea_id: ventana for ventana in CalendarioLinea.objects.all()}
+        # Las líneas sin calendario ni excepciones propias comparten el de defecto
+        for linea_id in set(ventanas) | set(por_linea):
+            ventana = ventanas.get(linea_id)
+            calendarios[linea_id] = CalendarioOperacion(
+                _a_horas(ventana.hora_inicio) if ventana else defecto.hora_inicio,
+                ventana.horas_dia if ventana else defecto.horas_dia,
+                ventana.dias_semana if ventana else '1234567',
+                {**generales, **por_linea[linea_id]},
+            )
+        return calendarios
+
+    @classmethod
+    def invalidar(cls):
+        """Fuerza reconstruir los calendarios de este proceso en la próxima consulta"""
+        with cls._lock:
+            cls._calendarios = None
+            cls._token = None
+
+    @classmethod
+    def de_linea(cls, linea_id):
+        calendarios = cls.calendarios()
+        return calendarios.get(linea_id) or calendarios[None]
+
+    @classmethod
+    def de_balancin(cls, balancin):
+        """Calendario de la línea de la torre del balancín (usa la torre ya cargada si la hay)"""
+        return cls.de_linea(balancin.torre.linea_id if balancin.torre_id else None)
+
+    # ============================================================
+    # CÁLCULO PARA LA FLOTA
+    # ============================================================
+
+    @classmethod
+    def horas_flota(cls, filas, fecha_referencia):
+        """
+        [(linea_id, fecha_base), ...] -> horas operadas desde cada fecha_base
+        hasta la fecha de referencia, en una pasada (dos lecturas de arreglo
+        por balancín).
+        """
+        calendarios = cls.calendarios()
+        defecto = calendarios[None]
+        return [
+            calendarios.get(linea_id, defecto).horas_entre(fecha_base, fecha_referencia)
+            for linea_id, fecha_base in filas
+        ]
+
+    @classmethod
+    def horas_hoy(cls, linea_id=None, ahora=None):
+        """Horas de operación transcurridas hoy en la línea"""
+        return cls.de_linea(linea_id).horas_transcurridas(ahora or datetime.now())
@@ -0,0 +1,127 @@
+# apps/balancines/services/campos_derivados.py
+
+import logging
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Min, Q, Value, When
+from django.db.models.functions import ExtractYear
+
+from apps.balancines.versiones import incrementar
+
+logger = logging.getLogger(__name__)
+
+
+class CampoDerivado:
+    """
+    Campo calculado a partir de otras columnas del mismo registro.
+
+    expresion: expresión SQL que da el valor correcto
+    condicion: Q con las filas donde el campo se puede calcular
+    """
+
+    def __init__(self, nombre, expresion, condicion):
+        self.nombre = nombre
+        self.expresion = expresion
+        self.condicion = condicion
+
+    @property
+    def desactualizado(self):
+        """Q de las filas calculables cuyo valor difiere (IS DISTINCT FROM) del correcto"""
+        return self.condicion & ~Q(**{self.nombre: self.expresion})
+
+
+class ServicioCamposDerivados:
+    """
+    Recalcula en BD los campos derivados de HistorialOH (backlog, anio y
+    dia_semana) con UPDATE por conjuntos, sin cargar los registros en Python.
+    """
+
+    CAMPOS = {
+        'backlog': CampoDerivado(
+            'backlog',
+            F('rango_oh_horas') - F('horas_operacion'),
+            Q(horas_operacion__isnull=False) & ~Q(rango_oh_horas=0),
+        ),
+        'anio': CampoDerivado(
+            'anio',
+            ExtractYear('fecha_oh', output_field=IntegerField()),
+            Q(fecha_oh__isnull=False),
+        ),
+        'dia_semana': CampoDerivado(
+            'dia_semana',
+            # iso_week_day: 1 = lunes ... 7 = domingo
+            Case(*[
+                When(fecha_oh__iso_week_day=numero, then=Value(nombre))
+                for numero, nombre in enumerate(
+                    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], start=1
+                )
+            ]),
+            Q(fecha_oh__isnull=False),
+        ),
+    }
+
+    @classmethod
+    def _campos(cls, nombres):
+        if nombres is None:
+            return list(cls.CAMPOS.values())
+        desconocidos = [n for n in nombres if n not in cls.CAMPOS]
+        if desconocidos:
+            raise ValueError(f"Campos derivados desconocidos: {', '.join(desconocidos)}")
+        return [cls.CAMPOS[n] for n in nombres]
+
+    @classmethod
+    def _queryset_base(cls, queryset):
+        from apps.balancines.models import HistorialOH
+        return queryset if queryset is not None else HistorialOH.objects.all()
+
+    @classmethod
+    def contar_desactualizados(cls, queryset=None, campos=None):
+        """
+        Cuenta con una sola agregación cuántas filas tiene desactualizadas cada campo.
+        Devuelve {'total': N, '<campo>': n, ...}
+        """
+        queryset = cls._queryset_base(queryset)
+        agregados = {'total': Count('pk')}
+        for campo in cls._campos(campos):
+            agregados[campo.nombre] = Count('pk', filter=campo.desactualizado)
+        return queryset.order_by().aggregate(**agregados)
+
+    @classmethod
+    def recalcular(cls, queryset=None, campos=None, lote=None):
+        """
+        Actualiza los campos desactualizados con un UPDATE por campo.
+        Con `lote`, divide la tabla en rangos de PK y confirma cada rango por separado.
+        Devuelve {'<campo>': filas_actualizadas, ...}
+        """
+        queryset = cls._queryset_base(queryset).order_by()
+        campos = cls._campos(campos)
+        actualizados = {campo.nombre: 0 for campo in campos}
+
+        for rango in cls._rangos_pk(queryset, lote):
+            with transaction.atomic():
+                for campo in campos:
+                    filas = rango.filter(campo.desactualizado).update(**{campo.nombre: campo.expresion})
+                    actualizados[campo.nombre] += filas
+
+        if any(actualizados.values()):
+            from apps.balancines.services.tablero_oh import ServicioTableroOH
+            incrementar(queryset.model)
+            ServicioTableroOH.invalidar_todo()
+
+        logger.info(f"Campos derivados recalculados: {actualizados}")
+        return actualizados
+
+    @classmethod
+    def _rangos_pk(cls, queryset, lote):
+        if not lote:
+            yield queryset
+            return
+
+        limites = queryset.aggregate(minimo=Min('pk'), maximo=Max('pk'))
+        if limites['minimo'] is None:
+            return
+
+        inicio = limites['minimo']
+        while inicio <= limites['maximo']:
+            yield queryset.filter(pk__gte=inicio, pk__lt=inicio + lote)
+            inicio += lote
@@ -0,0 +1,256 @@
+# apps/balancines/services/formulario_control.py
+"""
+Plantilla única del formulario de control de reacondicionamiento.
+
+En lugar de una plantilla por tipo de balancín, cada tipo tiene un
+descriptor de layout (tablas de torque y de lubricación) que se genera de
+CONFIG_TORQUE, y los repuestos se agrupan desde ConfiguracionRepuestosPorTipo.
+La plantilla balancines/formularios/formulario_control.html recorre el
+descriptor y guarda en cache los fragmentos estáticos por tipo.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+
+# Configuración de torque y lubricación por tipo de balancín
+CONFIG_TORQUE = {
+    '4T-501C': {
+        'poleas': 4, 'segmentos_2p': 2, 'segmentos_4p': 1, 'seg_SE': 2,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2], 's4p': [1,2], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '6T-501C': {
+        'poleas': 6, 'segmentos_2p': 3, 'segmentos_4p': 1, 'seg_SE': 3,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6], 's4p': [1,2], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '8T-501C': {
+        'poleas': 8, 'segmentos_2p': 4, 'segmentos_4p': 1, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '10T-501C': {
+        'poleas': 10, 'segmentos_2p': 3, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': True,
+        'lubricacion': {'s2p': [1,2,3,4,5], 's4p': [1,2], 'cs': [1]},
+        'lubricacion_extra': {'s4p_extra': [1,2], 'etiqueta': 'Bastidor 6P', 'posicion': 'despues_s4p'}
+    },
+    '12T-501C': {
+        'poleas': 12, 'segmentos_2p': 3, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': True,
+        'lubricacion': {'s2p': [1,2,3,4,5,6], 's4p': [1,2], 'cs': [1]},
+        'lubricacion_extra': {'s4p_extra': [1,2], 'etiqueta': 'Bastidor 6P', 'posicion': 'despues_s4p'}
+    },
+    '8N/4TR-420C': {
+        'poleas': 16, 'segmentos_2p': 4, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '10N/4TR-420C': {
+        'poleas': 16, 'segmentos_2p': 4, 'segmentos_4p': 8, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '12N/4TR-420C': {
+        'poleas': 16, 'segmentos_2p': 4, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '14N/4TR-420C': {
+        'poleas': 16, 'segmentos_2p': 4, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '16N/4TR-420C': {
+        'poleas': 16, 'segmentos_2p': 4, 'segmentos_4p': 4, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '4T/4N-420C': {
+        'poleas': 8, 'segmentos_2p': 4, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+    '8T/8N-420C': {
+        'poleas': 8, 'segmentos_2p': 4, 'segmentos_4p': 2, 'seg_SE': 4,
+        'consola': 2, 'tiene_bastidor_6p': False,
+        'lubricacion': {'s2p': [1,2,3,4,5,6,7,8], 's4p': [1,2,3,4], 'cs': [1]},
+        'lubricacion_extra': None
+    },
+}
+
+TIPO_POR_DEFECTO = '4T-501C'
+
+# Columnas de las tablas de torque (las que el tipo no usa van en gris)
+MAX_POLEAS = 16
+MAX_SEGMENTOS_2P = 4
+MAX_SEGMENTOS_4P = 4
+MAX_SEGMENTOS_SE = 4
+
+
+def obtener_config_torque(tipo):
+    """Obtiene la configuración de torque para un tipo de balancín."""
+    return CONFIG_TORQUE.get(tipo, CONFIG_TORQUE[TIPO_POR_DEFECTO])
+
+
+def _tabla(etiqueta, grupos, activas, titulo=None, nombres=None):
+    """
+    Tabla de puntos: `grupos` columnas por grupo (lista de cantidades de
+    columnas), las primeras `activas` celdas habilitadas y el resto en gris.
+    `nombres` son los encabezados de grupo (PR1, SE1...); sin nombres la
+    tabla tiene un solo grupo sin encabezado.
+    """
+    celdas_grupos = []
+    contador = 0
+    for indice, columnas in enumerate(grupos):
+        celdas = []
+        for numero in range(1, columnas + 1):
+            contador += 1
+            celdas.append({'numero': numero, 'activa': contador <= activas})
+        celdas_grupos.append({'nombre': nombres[indice] if nombres else '', 'celdas': celdas})
+    return {
+        'titulo': titulo,
+        'etiqueta': etiqueta,
+        'con_grupos': bool(nombres),
+        'grupos': celdas_grupos,
+    }
+
+
+def _tabla_puntos(etiqueta, puntos, titulo):
+    """Tabla de lubricación: una columna habilitada por punto"""
+    return _tabla(etiqueta, [len(puntos)], len(puntos), titulo=titulo)
+
+
+@lru_cache(maxsize=None)
+def _layout(tipo):
+    config = obtener_config_torque(tipo)
+    lubricacion = config['lubricacion']
+    extra = config['lubricacion_extra']
+    segmentos_4p = min(config['segmentos_4p'], MAX_SEGMENTOS_4P)
+    segmentos_se = min(config['seg_SE'], MAX_SEGMENTOS_SE)
+
+    fila_segmentos = [
+        _tabla(
+            'Segmentos 4P', [2] * MAX_SEGMENTOS_4P, segmentos_4p * 2,
+            nombres=[f'PR{i}' for i in range(1, MAX_SEGMENTOS_4P + 1)],
+        ),
+        _tabla(
+            '', [2] * MAX_SEGMENTOS_SE, segmentos_se * 2,
+            nombres=[f'SE{i}' for i in range(1, MAX_SEGMENTOS_SE + 1)],
+        ),
+    ]
+    if config['tiene_bastidor_6p']:
+        fila_segmentos.append(_tabla(
+            'Bastidor 6P', [2] * segmentos_se, segmentos_se * 2,
+            nombres=[f'SE{i}' for i in range(1, segmentos_se + 1)],
+        ))
+    fila_segmentos.append(_tabla(
+        'Consola de suspensión', [2] * config['consola'], config['consola'] * 2,
+        nombres=[f'CS-SE{i}' for i in range(1, config['consola'] + 1)],
+    ))
+
+    tablas_lubricacion = [
+        _tabla_puntos('Segmentos 2P', lubricacion['s2p'], 'PL-S2P'),
+        _tabla_puntos('Segmentos 4P', lubricacion['s4p'], 'PL-S4P'),
+    ]
+    if extra:
+        tablas_lubricacion.append(_tabla_puntos(extra['etiqueta'], extra['s4p_extra'], 'PL-S4P'))
+    tablas_lubricacion.append(_tabla_puntos('Consola de suspensión', lubricacion['cs'], 'PL-CS'))
+
+    return [
+        {
+            'titulo': 'TORQUE, MARCADO DE PERNOS Y TUERCAS',
+            'filas': [
+                [
+                    _tabla('Poleas', [MAX_POLEAS], config['poleas'], titulo='P'),
+                    _tabla(
+                        'Segmentos 2P', [MAX_SEGMENTOS_2P * 2],
+                        min(config['segmentos_2p'], MAX_SEGMENTOS_2P) * 2, titulo='S2P',
+                    ),
+                ],
+                fila_segmentos,
+            ],
+        },
+        {
+            'titulo': 'Puntos de lubricacion (gramos)',
+            'filas': [tablas_lubricacion],
+        },
+    ]
+
+
+class ServicioFormularioControl:
+
+    TIEMPO_CACHE_FRAGMENTOS = 60 * 60 * 24
+
+    # ============================================================
+    # DESCRIPTOR DE LAYOUT (TORQUE Y LUBRICACIÓN)
+    # ============================================================
+
+    @classmethod
+    def layout(cls, tipo):
+        """
+        Secciones de torque y lubricación del tipo: [{'titulo', 'filas'}],
+        cada fila es una lista de tablas (ver _tabla). Se calcula una vez por
+        tipo y no depende de la BD.
+        """
+        return _layout(tipo)
+
+    # ============================================================
+    # REPUESTOS CONFIGURADOS
+    # ============================================================
+
+    @staticmethod
+    def _item(config):
+        return {
+            'id': config.id,
+            'id_original': config.id_original,
+            'descripcion': config.descripcion,
+            'es_conjunto': config.es_conjunto,
+            'cantidad': config.cantidad_por_balancin,
+            'cantidad_total': config.cantidad_total,
+            'orden': config.orden,
+        }
+
+    @classmethod
+    def repuestos_agrupados(cls, tipo):
+        """
+        Filas de repuestos del tipo por grupo: {grupo: [items]}. Cada conjunto
+        va seguido de sus componentes, así la plantilla recorre una sola lista.
+        """
+        from apps.balancines.models import ConfiguracionRepuestosPorTipo
+
+        configs = list(
+            ConfiguracionRepuestosPorTipo.objects.filter(tipo_balancin__codigo=tipo).order_by('grupo', 'orden')
+        )
+        conjuntos = {config.id for config in configs if config.es_conjunto}
+        componentes = {}
+        for config in configs:
+            if config.conjunto_padre_id in conjuntos:
+                componentes.setdefault(config.conjunto_padre_id, []).append(config)
+
+        agrupados = OrderedDict()
+        for config in configs:
+            if config.conjunto_padre_id in conjuntos:
+                continue
+            filas = agrupados.setdefault(config.grupo or 'OTROS', [])
+            filas.append(cls._item(config))
+            filas.extend(cls._item(componente) for componente in componentes.get(config.id, []))
+        return agrupados
+
+    @staticmethod
+    def version_repuestos():
+        """Token de la configuración de repuestos, para la clave del fragmento en cache"""
+        from apps.balancines.models import ConfiguracionRepuestosPorTipo
+        from apps.balancines.versiones import token_version
+
+        return token_version(ConfiguracionRepuestosPorTipo)
@@ -0,0 +1,195 @@
+# apps/balancines/services/horas_en_vivo.py
+
+import re
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .calendario import ServicioCalendario, horas_transcurridas
+
+
+class ServicioHorasEnVivo:
+    """
+    Cálculo de las horas en vivo de los balancines (API, dashboard y stream SSE).
+    Las horas incluyen las horas parciales del día actual, según la ventana
+    de servicio de cada línea (services/calendario.py).
+    """
+
+    UMBRAL_ALERTA = 5000
+
+    # MODO DESARROLLO: ignora horas_base y fecha_base, las horas totales son solo las de hoy
+    MODO_DESARROLLO = True  # Cambia a False cuando quieras modo producción
+
+    @classmethod
+    def horas_hoy(cls, base, ahora=None):
+        """Horas de operación transcurridas hoy en la ventana del balancín (datos_base)"""
+        return horas_transcurridas(base['hora_inicio_dia'], base['horas_dia'], ahora or datetime.now())
+
+    @classmethod
+    def controles(cls, linea=''):
+        from apps.balancines.models import ControlHorasBalancin
+
+        controles = ControlHorasBalancin.objects.select_related(
+            'balancin',
+            'balancin__torre__linea',
+            'ultimo_oh_relacionado'
+        ).only(
+            'balancin__codigo',
+            'balancin__sentido',
+            'balancin__rango_horas_cambio_oh',
+            'balancin__torre__linea__nombre',
+            'balancin__torre__numero_torre',
+            'horas_base',
+            'fecha_base',
+            'ultimo_oh_relacionado__fecha_oh',
+            'ultimo_oh_relacionado__horas_operacion',
+        )
+        if linea:
+            controles = controles.filter(balancin__torre__linea__nombre=linea)
+        return controles
+
+    @classmethod
+    def datos_base(cls, control, hoy):
+        """
+        Parte de los datos que no depende de la hora del día (se puede guardar
+        en cache hasta el cambio de fecha o de control).
+        """
+        torre = control.balancin.torre
+        calendario = ServicioCalendario.de_linea(torre.linea_id if torre else None)
+        hora_inicio_dia, horas_dia = calendario.ventana(hoy)
+
+        if cls.MODO_DESARROLLO:
+            horas_sin_hoy = 0
+        else:
+            horas_sin_hoy = control.horas_base + calendario.horas_entre(control.fecha_base, hoy)
+
+        # Extraer número de torre para ordenamiento
+        torre_numero = torre.numero_torre if torre else '0'
+        match = re.search(r'\d+', torre_numero)
+
+        return {
+            'codigo': control.balancin.codigo,
+            'linea_nombre': torre.linea.nombre if torre else 'N/A',
+            'torre_numero': torre_numero,
+            'numero_torre_int': int(match.group()) if match else 0,
+            'sentido': control.balancin.sentido,
+            'horas_sin_hoy': horas_sin_hoy,
+            'ultimo_oh_fecha': control.ultimo_oh_relacionado.fecha_oh.strftime('%d/%m/%Y') if control.ultimo_oh_relacionado else '-',
+            'ultimo_oh_horas': control.horas_base,
+            'rango_oh': control.balancin.rango_horas_cambio_oh,
+            # Ventana de hoy de la línea: el cliente interpola las horas de hoy con ella
+            'hora_inicio_dia': hora_inicio_dia,
+            'horas_dia': horas_dia,
+        }
+
+    @classmethod
+    def aplicar_horas_hoy(cls, base, horas_hoy):
+        """Completa los datos base con las horas parciales de hoy"""
+        horas_actuales = base['horas_sin_hoy'] + horas_hoy
+        rango = base['rango_oh']
+        backlog = rango - horas_actuales
+
+        # Determinar estado
+        if backlog < 0:
+            estado = 'critico'
+            color = '#dc3545'
+        elif backlog <= cls.UMBRAL_ALERTA:
+            estado = 'alerta'
+            color = '#ffc107'
+        else:
+            estado = 'normal'
+            color = '#28a745'
+
+        porcentaje = min(100, (horas_actuales / rango) * 100) if rango else 0
+
+        return {
+            **base,
+            'horas_actuales': round(horas_actuales, 0),
+            'backlog': round(backlog, 0),
+            'estado': estado,
+            'color': color,
+            'porcentaje': round(porcentaje, 1),
+            'horas_hoy': round(horas_hoy, 2),
+        }
+
+    @classmethod
+    def datos_control(cls, control, hoy, ahora=None):
+        """
+        Datos en vivo de un balancín. 'horas_sin_hoy' permite al cliente
+        interpolar: horas_actuales = horas_sin_hoy + horas de hoy.
+        """
+        base = cls.datos_base(control, hoy)
+        return cls.aplicar_horas_hoy(base, cls.horas_hoy(base, ahora))
+
+    @classmethod
+    def datos_base_linea(cls, linea_id, hoy):
+        """Fragmento por línea para ServicioTableroOH (None: balancines sin torre)"""
+        controles = cls.controles()
+        if linea_id is None:
+            controles = controles.filter(balancin__torre__isnull=True)
+        else:
+            controles = controles.filter(balancin__torre__linea_id=linea_id)
+        return [cls.datos_base(control, hoy) for control in controles]
+
+    @classmethod
+    def datos_balancin(cls, balancin_codigo):
+        """Datos en vivo de un solo balancín (para deltas), o None si no tiene control"""
+        control = cls.controles().filter(balancin_id=balancin_codigo).first()
+        if not control:
+            return None
+        return cls.datos_control(control, timezone.now().date())
+
+    @classmethod
+    def snapshot(cls, linea=''):
+        """Estado completo de la flota (payload de api_horas_en_vivo)"""
+        from apps.balancines.models import Linea
+
+        from .tablero_oh import ServicioTableroOH
+
+        hoy = timezone.now().date()
+        ahora = datetime.now()
+
+        # Cache de líneas
+        lineas = cache.get('lineas_list')
+        if lineas is None:
+            lineas = list(Linea.objects.values_list('nombre', flat=True))
+            cache.set('lineas_list', lineas, 3600)
+
+        # Datos base por línea (cache por fragmento, válida durante el día)
+        if linea:
+            lineas_ids = list(Linea.objects.filter(nombre=linea).values_list('id', flat=True))
+        else:
+            lineas_ids = ServicioTableroOH.lineas_ids()
+        fragmentos = ServicioTableroOH.obtener_fragmentos(
+            'horas_en_vivo:base',
+            lambda linea_id: cls.datos_base_linea(linea_id, hoy),
+            lineas_ids,
+            extra=f':{hoy.isoformat()}',
+        )
+
+        datos = [
+            cls.aplicar_horas_hoy(base, cls.horas_hoy(base, ahora))
+            for linea_id in lineas_ids
+            for base in fragmentos[linea_id]
+        ]
+        datos.sort(key=lambda x: (x['linea_nombre'], x['numero_torre_int'], x['torre_numero'], x['sentido']))
+
+        # Ventana general (la de la línea filtrada, o la de defecto): reloj del dashboard
+        calendario = ServicioCalendario.de_linea(lineas_ids[0] if linea and lineas_ids else None)
+        hora_inicio_dia, horas_dia = calendario.ventana(hoy)
+
+        return {
+            'fecha_actual': hoy.strftime('%d/%m/%Y'),
+            'horas_hoy': round(horas_transcurridas(hora_inicio_dia, horas_dia, ahora), 2),
+            'hora_inicio_dia': hora_inicio_dia,
+            'horas_dia': horas_dia,
+            'lineas': list(lineas),
+            'resumen': {
+                'total': len(datos),
+                'normal': sum(1 for d in datos if d['estado'] == 'normal'),
+                'alerta': sum(1 for d in datos if d['estado'] == 'alerta'),
+                'critico': sum(1 for d in datos if d['estado'] == 'critico'),
+            },
+            'datos': datos,
+        }
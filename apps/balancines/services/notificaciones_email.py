@@ -1,9 +1,4 @@
-import sys
-import io
-# Forzar UTF-8 para la salida estándar
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 import time
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 from django.core.mail import send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
@@ -107,6 +102,6 @@ class ServicioNotificacionesEmail:
                 enviadas += 1
             # Pausa de 2 segundos entre cada envío (excepto el último)
             if i < len(alertas) - 1:
-                time.sleep(1000)
+                time.sleep(2)
         
         return enviadas
\ No newline at end of file
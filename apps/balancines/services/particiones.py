@@ -0,0 +1,209 @@
+# apps/balancines/services/particiones.py
+"""
+Particiones por rango de fecha de las tablas de historial (PostgreSQL).
+
+Las tablas de settings.PARTICIONES_TABLAS están particionadas por la
+columna de fecha (migración 0022_particionar_historiales). Nombres de las
+particiones:
+
+    <tabla>_p2019       año completo (historia anterior a la migración)
+    <tabla>_p2026_10    un mes
+    <tabla>_pdefault    fechas sin partición (no debería tener filas)
+
+Los límites son medianoche local (settings.TIME_ZONE). Las consultas con
+filtro por fecha solo leen las particiones del rango; Django no nota la
+diferencia. El mantenimiento lo hace manage.py gestionar_particiones.
+"""
+
+import logging
+import re
+from datetime import datetime
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_RE_PARTICION = re.compile(r'_p(\d{4})(?:_(\d{2}))?$')
+
+
+def inicio_mes(anio, mes):
+    """Primer instante del mes (hora local); acepta meses fuera de 1..12"""
+    anio, mes = anio + (mes - 1) // 12, (mes - 1) % 12 + 1
+    return timezone.make_aware(datetime(anio, mes, 1))
+
+
+class ServicioParticiones:
+
+    ESQUEMA_ARCHIVO = 'archivo'
+    ACCIONES = ('archivar', 'separar', 'eliminar')
+
+    # ============================================================
+    # CONSULTA
+    # ============================================================
+
+    @staticmethod
+    def esta_particionada(tabla, using='default'):
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+                [tabla],
+            )
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def columna(tabla, using='default'):
+        """Columna de la clave de partición ('RANGE (fecha_movimiento)' -> 'fecha_movimiento')"""
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT pg_get_partkeydef(to_regclass(%s))', [tabla])
+            definicion = cursor.fetchone()[0]
+        return re.search(r'\((\w+)\)', definicion).group(1)
+
+    @staticmethod
+    def limites(nombre):
+        """(desde, hasta) de una partición por su nombre; None para la default"""
+        match = _RE_PARTICION.search(nombre)
+        if not match:
+            return None
+        anio, mes = int(match.group(1)), match.group(2)
+        if mes is None:
+            return inicio_mes(anio, 1), inicio_mes(anio + 1, 1)
+        return inicio_mes(anio, int(mes)), inicio_mes(anio, int(mes) + 1)
+
+    @classmethod
+    def particiones(cls, tabla, using='default'):
+        """Particiones de la tabla en orden, con sus límites y filas estimadas"""
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT hija.relname, hija.reltuples::bigint
+                FROM pg_inherits
+                JOIN pg_class hija ON hija.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(%s)
+                """,
+                [tabla],
+            )
+            filas = cursor.fetchall()
+
+        particiones = []
+        for nombre, estimadas in filas:
+            limites = cls.limites(nombre)
+            particiones.append({
+                'nombre': nombre,
+                'desde': limites[0] if limites else None,
+                'hasta': limites[1] if limites else None,
+                # reltuples es -1 mientras la partición no se analiza
+                'filas_estimadas': max(estimadas, 0),
+            })
+        return sorted(particiones, key=lambda p: (p['desde'] is None, p['desde'] or 0))
+
+    # ============================================================
+    # CREACIÓN
+    # ============================================================
+
+    @classmethod
+    def crear(cls, tabla, nombre, desde, hasta, using='default'):
+        """
+        Crea la partición [desde, hasta). Si la default tiene filas de ese
+        rango, PostgreSQL no permite crearla: se separa la default, se mueven
+        las filas y se vuelve a adjuntar.
+        """
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        columna = cls.columna(tabla, using)
+        default = f'{tabla}_pdefault'
+        rango = f"FOR VALUES FROM ('{desde.isoformat()}') TO ('{hasta.isoformat()}')"
+
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [default])
+            hay_default = cursor.fetchone()[0]
+            pendientes = 0
+            if hay_default:
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM {qn(default)} WHERE {qn(columna)} >= %s AND {qn(columna)} < %s',
+                    [desde, hasta],
+                )
+                pendientes = cursor.fetchone()[0]
+
+            if not pendientes:
+                cursor.execute(f'CREATE TABLE {qn(nombre)} PARTITION OF {qn(tabla)} {rango}')
+                return 0
+
+            cursor.execute(f'ALTER TABLE {qn(tabla)} DETACH PARTITION {qn(default)}')
+            cursor.execute(f'CREATE TABLE {qn(nombre)} PARTITION OF {qn(tabla)} {rango}')
+            cursor.execute(
+                f'WITH movidas AS (DELETE FROM {qn(default)} WHERE {qn(columna)} >= %s AND {qn(columna)} < %s '
+                f'RETURNING *) INSERT INTO {qn(nombre)} SELECT * FROM movidas',
+                [desde, hasta],
+            )
+            cursor.execute(f'ALTER TABLE {qn(tabla)} ATTACH PARTITION {qn(default)} DEFAULT')
+        logger.warning(f"{pendientes} filas de {default} movidas a {nombre}")
+        return pendientes
+
+    @classmethod
+    def crear_meses(cls, tabla, hasta, using='default'):
+        """
+        Crea las particiones mensuales que faltan desde la última existente
+        (o el mes actual) hasta el mes de `hasta`, inclusive. Devuelve los
+        nombres creados.
+        """
+        existentes = [p for p in cls.particiones(tabla, using) if p['desde'] is not None]
+        hoy = timezone.localdate()
+        desde = existentes[-1]['hasta'] if existentes else inicio_mes(hoy.year, hoy.month)
+        limite = inicio_mes(hasta.year, hasta.month + 1)
+
+        creadas = []
+        while desde < limite:
+            local = timezone.localtime(desde)
+            siguiente = inicio_mes(local.year, local.month + 1)
+            nombre = f'{tabla}_p{local.year}_{local.month:02d}'
+            cls.crear(tabla, nombre, desde, siguiente, using)
+            creadas.append(nombre)
+            desde = siguiente
+        return creadas
+
+    # ============================================================
+    # RETENCIÓN
+    # ============================================================
+
+    @classmethod
+    def retirar_anteriores(cls, tabla, limite, accion='archivar', using='default'):
+        """
+        Saca de la tabla las particiones que terminan antes de `limite`:
+        'archivar' las mueve al esquema ESQUEMA_ARCHIVO (se siguen pudiendo
+        consultar o respaldar con pg_dump), 'separar' las deja como tablas
+        sueltas y 'eliminar' las borra. Devuelve los nombres.
+        """
+        if accion not in cls.ACCIONES:
+            raise ValueError(f'Acción desconocida: {accion}')
+        connection = connections[using]
+        qn = connection.ops.quote_name
+
+        retiradas = []
+        for particion in cls.particiones(tabla, using):
+            if particion['hasta'] is None or particion['hasta'] > limite:
+                continue
+            nombre = particion['nombre']
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {qn(tabla)} DETACH PARTITION {qn(nombre)}')
+                if accion == 'archivar':
+                    cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(cls.ESQUEMA_ARCHIVO)}')
+                    cursor.execute(f'ALTER TABLE {qn(nombre)} SET SCHEMA {qn(cls.ESQUEMA_ARCHIVO)}')
+                elif accion == 'eliminar':
+                    cursor.execute(f'DROP TABLE {qn(nombre)}')
+            retiradas.append(nombre)
+        return retiradas
+
+    @classmethod
+    def filas_default(cls, tabla, using='default'):
+        """Filas en la partición default (fechas fuera de las particiones creadas)"""
+        qn = connections[using].ops.quote_name
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [f'{tabla}_pdefault'])
+            if not cursor.fetchone()[0]:
+                return 0
+            cursor.execute(f'SELECT COUNT(*) FROM {qn(tabla + "_pdefault")}')
+            return cursor.fetchone()[0]
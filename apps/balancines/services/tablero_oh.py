@@ -0,0 +1,198 @@
+# apps/balancines/services/tablero_oh.py
+"""
+Cálculo por línea (fragmentos) de los tableros OH.
+
+Las líneas son independientes: cada fragmento (línea -> filas de estado de
+sus balancines) se calcula, se guarda en cache y se invalida por separado.
+La versión de cada fragmento sale de los contadores de cambios
+(apps/balancines/versiones.py):
+
+    tablero_oh.linea.<id>   cambios de OH, balancines, torres o controles de la línea
+    tablero_oh              cambios masivos que afectan a todas las líneas
+
+Con settings.TABLERO_OH_HILOS > 1 los fragmentos que no están en cache se
+calculan en paralelo, cada hilo con su propia conexión a la BD.
+"""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Prefetch
+
+logger = logging.getLogger(__name__)
+
+CLAVE_GLOBAL = 'tablero_oh'
+SIN_LINEA = 'sin_linea'
+
+
+def _numero_torre(torre_numero):
+    match = re.search(r'\d+', torre_numero)
+    return int(match.group()) if match else 0
+
+
+class ServicioTableroOH:
+
+    UMBRAL_ALERTA = 5000
+    TIEMPO_CACHE = 60 * 60 * 6
+
+    # ============================================================
+    # VERSIONES E INVALIDACIÓN
+    # ============================================================
+
+    @staticmethod
+    def clave_linea(linea_id):
+        return f'{CLAVE_GLOBAL}.linea.{linea_id if linea_id is not None else SIN_LINEA}'
+
+    @classmethod
+    def invalidar_linea(cls, *lineas_ids):
+        from apps.balancines.versiones import incrementar
+        incrementar(*[cls.clave_linea(linea_id) for linea_id in set(lineas_ids)])
+
+    @classmethod
+    def invalidar_todo(cls):
+        from apps.balancines.versiones import incrementar
+        incrementar(CLAVE_GLOBAL)
+
+    @classmethod
+    def _versiones(cls, lineas_ids):
+        """{linea_id: 'vGlobal.vLinea'} con una sola consulta"""
+        from apps.balancines.versiones import obtener_versiones
+
+        claves = {linea_id: cls.clave_linea(linea_id) for linea_id in lineas_ids}
+        versiones = obtener_versiones(CLAVE_GLOBAL, *claves.values())
+        return {
+            linea_id: f'{versiones[CLAVE_GLOBAL]}.{versiones[clave]}'
+            for linea_id, clave in claves.items()
+        }
+
+    # ============================================================
+    # FRAGMENTOS
+    # ============================================================
+
+    @classmethod
+    def obtener_fragmentos(cls, nombre, calcular, lineas_ids, extra=''):
+        """
+        Devuelve {linea_id: filas} usando la cache. `calcular(linea_id)` calcula
+        un fragmento; `extra` se agrega a la clave (p. ej. un bucket de tiempo).
+        """
+        lineas_ids = list(lineas_ids)
+        versiones = cls._versiones(lineas_ids)
+        claves = {
+            linea_id: f'{nombre}:{linea_id}:{versiones[linea_id]}{extra}'
+            for linea_id in lineas_ids
+        }
+
+        en_cache = cache.get_many(list(claves.values()))
+        fragmentos = {
+            linea_id: en_cache[clave] for linea_id, clave in claves.items() if clave in en_cache
+        }
+        faltantes = [linea_id for linea_id in lineas_ids if linea_id not in fragmentos]
+
+        if faltantes:
+            calculados = cls._calcular(calcular, faltantes)
+            cache.set_many({claves[linea_id]: filas for linea_id, filas in calculados.items()}, cls.TIEMPO_CACHE)
+            fragmentos.update(calculados)
+            logger.debug(f"{nombre}: {len(faltantes)} de {len(lineas_ids)} líneas recalculadas")
+
+        return fragmentos
+
+    @classmethod
+    def _calcular(cls, calcular, lineas_ids):
+        hilos = getattr(settings, 'TABLERO_OH_HILOS', 0)
+        if hilos <= 1 or len(lineas_ids) <= 1:
+            return {linea_id: calcular(linea_id) for linea_id in lineas_ids}
+
+        def calcular_en_hilo(linea_id):
+            try:
+                return calcular(linea_id)
+            finally:
+                # Cada hilo abre su propia conexión: cerrarla al terminar
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=min(hilos, len(lineas_ids))) as pool:
+            return dict(zip(lineas_ids, pool.map(calcular_en_hilo, lineas_ids)))
+
+    @staticmethod
+    def lineas_ids():
+        """Ids de todas las líneas, más None para los balancines sin torre"""
+        from apps.balancines.models import Linea
+        return [None] + list(Linea.objects.order_by('id').values_list('id', flat=True))
+
+    # ============================================================
+    # DASHBOARD OH (dashboard_oh_nuevo)
+    # ============================================================
+
+    @classmethod
+    def filas_linea(cls, linea_id):
+        """Filas de estado OH de los balancines de una línea (con al menos un OH)"""
+        from apps.balancines.models import BalancinIndividual, HistorialOH
+
+        balancines = BalancinIndividual.objects.select_related('torre__linea').annotate(
+            total_oh=Count('historial_oh_completo')
+        ).filter(
+            total_oh__gt=0
+        ).prefetch_related(Prefetch(
+            'historial_oh_completo',
+            queryset=HistorialOH.objects.order_by('numero_oh').only(
+                'balancin_id', 'numero_oh', 'fecha_oh', 'anio', 'horas_operacion', 'backlog', 'dia_semana'
+            ),
+        ))
+        if linea_id is None:
+            balancines = balancines.filter(torre__isnull=True)
+        else:
+            balancines = balancines.filter(torre__linea_id=linea_id)
+
+        filas = []
+        for b in balancines:
+            ohs = list(b.historial_oh_completo.all())
+            ultimo_oh = max(ohs, key=lambda oh: oh.fecha_oh)
+
+            backlog_actual = ultimo_oh.backlog
+            if backlog_actual is None:
+                backlog_actual = b.rango_horas_cambio_oh - (ultimo_oh.horas_operacion or 0)
+
+            if backlog_actual < 0:
+                estado = 'critico'
+            elif backlog_actual < cls.UMBRAL_ALERTA:
+                estado = 'alerta'
+            else:
+                estado = 'normal'
+
+            filas.append({
+                'linea_nombre': b.torre.linea.nombre if b.torre else 'N/A',
+                'torre_numero': b.torre.numero_torre if b.torre else '0',
+                'sentido': b.sentido,
+                'tipo_balancin': b.tipo_balancin_codigo or '',
+                'rango_oh_horas': b.rango_horas_cambio_oh,
+                'inicio_oc': 'May-14',
+                'balancin_codigo': b.codigo,
+                'total_ohs': b.total_oh,
+                'todos_oh': [
+                    {
+                        'numero': oh.numero_oh,
+                        'fecha': oh.fecha_oh.strftime('%b-%y'),
+                        'anio': oh.anio,
+                        'horas': oh.horas_operacion,
+                        'backlog': oh.backlog,
+                        'dia': oh.dia_semana,
+                    }
+                    for oh in ohs
+                ],
+                'horas_actuales': ultimo_oh.horas_operacion,
+                'backlog_actual': backlog_actual,
+                'estado': estado,
+            })
+
+        filas.sort(key=lambda f: (_numero_torre(f['torre_numero']), f['torre_numero'], f['sentido']))
+        return filas
+
+    @classmethod
+    def historial(cls, linea_id=None):
+        """Filas de todas las líneas (o de una), en orden de línea, torre y sentido"""
+        lineas_ids = [linea_id] if linea_id is not None else cls.lineas_ids()
+        fragmentos = cls.obtener_fragmentos('tablero_oh:filas', cls.filas_linea, lineas_ids)
+        return [fila for linea_id in lineas_ids for fila in fragmentos[linea_id]]
@@ -1,6 +1,7 @@
 # apps/balancines/signals.py
 
-from django.db.models.signals import post_save
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 import logging
 
@@ -65,4 +66,356 @@ def enviar_email_al_crear_alerta(sender, instance, created, **kwargs):
             logger.info(f"📧 Enviando email para nueva alerta {instance.id}")
             ServicioAlertasOH._enviar_email_inmediato(instance)
         except Exception as e:
-            logger.error(f"Error enviando email: {e}")
\ No newline at end of file
+            logger.error(f"Error enviando email: {e}")
+
+# ============================================================
+# EVENTOS PARA EL STREAM SSE DE HORAS EN VIVO
+# ============================================================
+
+def _publicar_al_confirmar(tipo, obtener_datos):
+    """Publica el evento cuando la transacción se confirma, solo si hay conexiones abiertas"""
+    from django.db import transaction
+    from .eventos import canal_horas
+
+    if not canal_horas.hay_suscriptores:
+        return
+
+    def publicar():
+        try:
+            datos = obtener_datos()
+            if datos:
+                canal_horas.publicar(tipo, datos)
+        except Exception as e:
+            logger.error(f"Error publicando evento {tipo}: {e}")
+
+    transaction.on_commit(publicar)
+
+
+@receiver(post_save, sender='balancines.ControlHorasBalancin')
+def publicar_cambio_control(sender, instance, **kwargs):
+    """Reinicios de contador y nuevos OH cambian la base de horas del balancín"""
+    from .services.horas_en_vivo import ServicioHorasEnVivo
+
+    _publicar_al_confirmar('control', lambda: ServicioHorasEnVivo.datos_balancin(instance.balancin_id))
+
+
+@receiver(post_save, sender='balancines.HistorialOH')
+def publicar_nuevo_oh(sender, instance, created, **kwargs):
+    if created:
+        _publicar_al_confirmar('oh', lambda: {
+            'codigo': instance.balancin_id,
+            'linea_nombre': instance.linea_nombre,
+            'numero_oh': instance.numero_oh,
+            'fecha_oh': instance.fecha_oh,
+            'horas_operacion': instance.horas_operacion,
+        })
+
+
+@receiver(post_save, sender='balancines.BalancinIndividual')
+def publicar_cambio_estado(sender, instance, created, **kwargs):
+    """Solo altas y cambios reales de estado (valores anteriores de recordar_torre_anterior)"""
+    anteriores = getattr(instance, '_valores_anteriores', None)
+    if not created and (not anteriores or anteriores['estado'] == instance.estado):
+        return
+    _publicar_al_confirmar('estado', lambda: {
+        'codigo': instance.codigo,
+        'estado': instance.estado,
+    })
+
+
+@receiver(post_save, sender='balancines.AlertaOH')
+def publicar_nueva_alerta(sender, instance, created, **kwargs):
+    if created:
+        _publicar_al_confirmar('alerta', lambda: {
+            'codigo': instance.balancin_id,
+            'nivel': instance.nivel,
+            'backlog': instance.backlog_momento,
+        })
+
+
+# ============================================================
+# CONTADORES DE CAMBIOS (ETag de las APIs)
+# ============================================================
+
+def incrementar_contador_cambios(sender, **kwargs):
+    """Incrementa la versión de la tabla al confirmar la transacción"""
+    from django.db import transaction
+    from .versiones import incrementar
+
+    transaction.on_commit(lambda: incrementar(sender))
+
+
+# Conectado solo a los modelos versionados: un receptor de post_delete sin
+# sender desactivaría el borrado rápido (fast delete) de todos los modelos
+def _conectar_contadores():
+    from .versiones import MODELOS_VERSIONADOS
+
+    for modelo in MODELOS_VERSIONADOS:
+        post_save.connect(incrementar_contador_cambios, sender=modelo)
+        post_delete.connect(incrementar_contador_cambios, sender=modelo)
+
+
+_conectar_contadores()
+
+
+# ============================================================
+# FRAGMENTOS POR LÍNEA DE LOS TABLEROS OH
+# ============================================================
+
+def _invalidar_lineas_al_confirmar(*lineas_ids):
+    from django.db import transaction
+    from .services.tablero_oh import ServicioTableroOH
+
+    transaction.on_commit(lambda: ServicioTableroOH.invalidar_linea(*lineas_ids))
+
+
+def _linea_de_torre(torre_id):
+    from .models import Torre
+
+    if torre_id is None:
+        return None
+    return Torre.objects.filter(pk=torre_id).values_list('linea_id', flat=True).first()
+
+
+def _linea_de_balancin(codigo):
+    from .models import BalancinIndividual
+
+    return BalancinIndividual.objects.filter(pk=codigo).values_list('torre__linea_id', flat=True).first()
+
+
+# Campos del balancín cuyo cambio queda en la auditoría (se leen junto con la torre anterior)
+CAMPOS_AUDITADOS_BALANCIN = ('torre_id', 'sentido', 'rango_horas_cambio_oh', 'estado', 'observaciones_estado')
+
+
+@receiver(pre_save, sender='balancines.BalancinIndividual')
+def recordar_torre_anterior(sender, instance, **kwargs):
+    """
+    Si el balancín cambia de torre, también hay que invalidar la línea de
+    origen. La misma consulta guarda los valores anteriores para la auditoría.
+    """
+    anteriores = None
+    if not instance._state.adding:
+        anteriores = sender.objects.filter(pk=instance.pk).values(*CAMPOS_AUDITADOS_BALANCIN).first()
+    instance._valores_anteriores = anteriores
+    instance._torre_anterior_id = anteriores['torre_id'] if anteriores else None
+
+
+@receiver(post_save, sender='balancines.BalancinIndividual')
+def reprogramar_evaluacion_por_rango(sender, instance, created, **kwargs):
+    """Con otro rango de OH el backlog cruza los umbrales en otras fechas: se evalúa de nuevo hoy"""
+    anteriores = getattr(instance, '_valores_anteriores', None)
+    if created or not anteriores or anteriores['rango_horas_cambio_oh'] == instance.rango_horas_cambio_oh:
+        return
+    from django.utils import timezone
+    from .models import ControlHorasBalancin
+
+    ControlHorasBalancin.objects.filter(balancin=instance).update(proxima_evaluacion=timezone.now().date())
+
+
+@receiver(post_save, sender='balancines.BalancinIndividual')
+@receiver(post_delete, sender='balancines.BalancinIndividual')
+def invalidar_linea_balancin(sender, instance, **kwargs):
+    torres = {instance.torre_id, getattr(instance, '_torre_anterior_id', instance.torre_id)}
+    _invalidar_lineas_al_confirmar(*[_linea_de_torre(torre_id) for torre_id in torres])
+
+
+@receiver(post_save, sender='balancines.HistorialOH')
+@receiver(post_delete, sender='balancines.HistorialOH')
+@receiver(post_save, sender='balancines.ControlHorasBalancin')
+@receiver(post_delete, sender='balancines.ControlHorasBalancin')
+def invalidar_linea_registro_balancin(sender, instance, update_fields=None, **kwargs):
+    # Las horas proyectadas del control no forman parte de los fragmentos
+    if update_fields and set(update_fields) <= {
+        'horas_actuales', 'backlog_actual', 'proxima_evaluacion', 'ultima_actualizacion'
+    }:
+        return
+    _invalidar_lineas_al_confirmar(_linea_de_balancin(instance.balancin_id))
+
+
+@receiver(post_save, sender='balancines.Torre')
+@receiver(post_delete, sender='balancines.Torre')
+def invalidar_linea_torre(sender, instance, **kwargs):
+    _invalidar_lineas_al_confirmar(instance.linea_id)
+
+
+@receiver(post_save, sender='balancines.Linea')
+def invalidar_linea(sender, instance, **kwargs):
+    _invalidar_lineas_al_confirmar(instance.pk)
+
+
+# ============================================================
+# CALENDARIO DE OPERACIÓN (services/calendario.py)
+# ============================================================
+
+@receiver(post_save, sender='balancines.CalendarioLinea')
+@receiver(post_delete, sender='balancines.CalendarioLinea')
+@receiver(post_save, sender='balancines.ExcepcionOperacion')
+@receiver(post_delete, sender='balancines.ExcepcionOperacion')
+def recalcular_por_calendario(sender, instance, **kwargs):
+    """
+    Otro calendario cambia las horas acumuladas de la línea (o de todas, si
+    la excepción es general): se reconstruyen los arreglos de este proceso,
+    se invalidan los fragmentos de horas en vivo y los controles de la línea
+    vuelven a la cola de evaluación de alertas.
+    """
+    from django.db import transaction
+    from django.utils import timezone
+    from .models import ControlHorasBalancin
+    from .services.calendario import ServicioCalendario
+    from .services.tablero_oh import ServicioTableroOH
+
+    linea_id = instance.linea_id
+
+    def recalcular():
+        ServicioCalendario.invalidar()
+        controles = ControlHorasBalancin.objects.all()
+        if linea_id is None:
+            ServicioTableroOH.invalidar_todo()
+        else:
+            ServicioTableroOH.invalidar_linea(linea_id)
+            controles = controles.filter(balancin__torre__linea_id=linea_id)
+        controles.update(proxima_evaluacion=timezone.now().date())
+
+    transaction.on_commit(recalcular)
+
+
+
+# ============================================================
+# AUDITORÍA (ActivityLog, ver auditoria.py)
+# ============================================================
+
+# Catálogos: altas y bajas. Los cambios de stock se auditan por sus
+# historiales y los del balancín por los campos que cambian (más abajo)
+MODELOS_AUDITADOS = {
+    'balancines.TipoBalancin': ('TIPO_BALANCIN', 'codigo'),
+    'balancines.BalancinIndividual': ('BALANCIN_INDIVIDUAL', 'codigo'),
+    'balancines.RepuestoBalancin': ('REPUESTO_BALANCIN', 'descripcion'),
+    'balancines.RepuestoAdicional': ('REPUESTO_ADICIONAL', 'descripcion'),
+    'balancines.Torre': ('TORRE', 'numero_torre'),
+    'balancines.Linea': ('LINEA', 'nombre'),
+    'balancines.Usuario': ('USER', 'email'),
+}
+
+ACCIONES_MOVIMIENTO = {'entrada': 'CHECKIN', 'salida': 'CHECKOUT', 'actualizacion': 'UPDATE'}
+
+
+def _registrar_catalogo(accion, descripcion, sender, instance):
+    from .auditoria import registrar
+
+    modulo, campo_nombre = MODELOS_AUDITADOS[sender._meta.label]
+    registrar(
+        accion, modulo, f"{descripcion} de {sender._meta.verbose_name} {instance.pk}",
+        objeto_id=instance.pk,
+        objeto_nombre=getattr(instance, campo_nombre),
+    )
+
+
+def auditar_alta(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _registrar_catalogo('CREATE', 'Alta', sender, instance)
+
+
+def auditar_baja(sender, instance, **kwargs):
+    _registrar_catalogo('DELETE', 'Eliminación', sender, instance)
+
+
+def _conectar_auditoria():
+    for modelo in MODELOS_AUDITADOS:
+        post_save.connect(auditar_alta, sender=modelo)
+        post_delete.connect(auditar_baja, sender=modelo)
+
+
+_conectar_auditoria()
+
+
+@receiver(post_save, sender='balancines.BalancinIndividual')
+def auditar_cambio_balancin(sender, instance, created, raw=False, **kwargs):
+    from .auditoria import registrar
+
+    anteriores = getattr(instance, '_valores_anteriores', None)
+    if created or raw or not anteriores:
+        return
+    cambios = [campo for campo in CAMPOS_AUDITADOS_BALANCIN if getattr(instance, campo) != anteriores[campo]]
+    if not cambios:
+        return
+
+    if 'estado' in cambios:
+        accion, descripcion = 'STATUS_CHANGE', f"{instance.codigo}: {anteriores['estado']} → {instance.estado}"
+    else:
+        accion, descripcion = 'UPDATE', f"{instance.codigo}: cambia {', '.join(cambios)}"
+    registrar(
+        accion, 'BALANCIN_INDIVIDUAL', descripcion,
+        objeto_id=instance.codigo,
+        objeto_nombre=instance.codigo,
+        anteriores={campo: anteriores[campo] for campo in cambios},
+        nuevos={campo: getattr(instance, campo) for campo in cambios},
+    )
+
+
+@receiver(post_save, sender='balancines.HistorialRepuesto')
+@receiver(post_save, sender='balancines.HistorialAdicional')
+def auditar_movimiento_stock(sender, instance, created, raw=False, **kwargs):
+    from .auditoria import registrar
+
+    accion = ACCIONES_MOVIMIENTO.get(instance.tipo_movimiento)
+    if not created or raw or accion is None:
+        return
+    anteriores = None
+    if accion == 'CHECKIN':
+        anteriores = {'cantidad': instance.stock_restante - instance.cantidad}
+    elif accion == 'CHECKOUT':
+        anteriores = {'cantidad': instance.stock_restante + instance.cantidad}
+    registrar(
+        accion,
+        'REPUESTO_ADICIONAL' if sender._meta.model_name == 'historialadicional' else 'REPUESTO_BALANCIN',
+        f"{instance.get_tipo_movimiento_display()} de {instance.cantidad} unidades de {instance.repuesto_id}",
+        objeto_id=instance.repuesto_id,
+        objeto_nombre=instance.repuesto_id,
+        anteriores=anteriores,
+        nuevos={'cantidad': instance.stock_restante, 'observaciones': instance.observaciones},
+        usuario_id=getattr(instance, 'usuario_id', None),
+    )
+
+
+@receiver(post_save, sender='balancines.HistorialOH')
+def auditar_nuevo_oh(sender, instance, created, raw=False, **kwargs):
+    from .auditoria import registrar
+
+    if not created or raw:
+        return
+    registrar(
+        'CREATE', 'BALANCIN_INDIVIDUAL',
+        f"OH #{instance.numero_oh} de {instance.balancin_id} ({instance.horas_operacion} h)",
+        objeto_id=instance.balancin_id,
+        objeto_nombre=instance.balancin_id,
+        nuevos={
+            'numero_oh': instance.numero_oh,
+            'fecha_oh': instance.fecha_oh,
+            'horas_operacion': instance.horas_operacion,
+            'backlog': instance.backlog,
+        },
+    )
+
+
+def _registrar_sesion(accion, descripcion, request, user):
+    from .auditoria import contexto_de_request, registrar
+
+    if user is None:
+        return
+    registrar(
+        accion, 'USER', f"{descripcion} de {user.email}",
+        objeto_id=user.pk,
+        objeto_nombre=user.email,
+        usuario_id=user.pk,
+        contexto=contexto_de_request(request) if request is not None else None,
+    )
+
+
+@receiver(user_logged_in)
+def auditar_inicio_sesion(sender, request, user, **kwargs):
+    _registrar_sesion('LOGIN', 'Inicio de sesión', request, user)
+
+
+@receiver(user_logged_out)
+def auditar_cierre_sesion(sender, request, user, **kwargs):
+    _registrar_sesion('LOGOUT', 'Cierre de sesión', request, user)
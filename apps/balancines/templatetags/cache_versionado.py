@@ -0,0 +1,30 @@
+# apps/balancines/templatetags/cache_versionado.py
+"""
+Versiones para claves de {% cache %}.
+
+Los fragmentos estáticos de las páginas (filtros, listas de líneas,
+leyendas) solo cambian cuando cambian las tablas de las que salen. La
+versión de esas tablas (contadores de apps/balancines/versiones.py) va en
+la clave del fragmento, así que no hace falta invalidarlo:
+
+    {% load cache cache_versionado %}
+    {% version_cache 'balancines.linea' as version_lineas %}
+    {% cache 86400 'filtro_lineas' version_lineas %}...{% endcache %}
+"""
+
+from django import template
+
+from apps.balancines.versiones import MODELOS_VERSIONADOS, token_version
+
+register = template.Library()
+
+
+@register.simple_tag
+def version_cache(*modelos, extra=''):
+    """Token de versión de los modelos indicados ('app.modelo'), con una sola consulta"""
+    no_versionados = set(modelos) - MODELOS_VERSIONADOS
+    if no_versionados:
+        raise template.TemplateSyntaxError(
+            f"version_cache: modelos sin contador de cambios: {', '.join(sorted(no_versionados))}"
+        )
+    return token_version(*modelos, extra=extra)
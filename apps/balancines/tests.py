@@ -0,0 +1,75 @@
+# apps/balancines/tests.py
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .metricas import PresupuestoExcedido, presupuesto_consultas
+from .models import HistorialAdicional, HistorialOH, HistorialRepuesto, Usuario
+from .paginacion import codificar_cursor, paginar_combinado, paginar_keyset
+
+
+class CursorInvalidoTests(SimpleTestCase):
+    """Un ?cursor= manipulado se trata como la primera página, nunca como un error"""
+
+    # none(): el filtro del cursor se arma igual, pero no se consulta la BD
+    ORDEN_OH = ('-fecha_oh', '-numero_oh', '-id')
+
+    def test_keyset_con_valor_nulo(self):
+        cursor = codificar_cursor([None, 1, 2])
+        pagina = paginar_keyset(HistorialOH.objects.none(), self.ORDEN_OH, cursor)
+        self.assertFalse(pagina.has_previous)
+
+    def test_keyset_con_valor_no_texto(self):
+        cursor = codificar_cursor([[1], 1, 2])
+        pagina = paginar_keyset(HistorialOH.objects.none(), self.ORDEN_OH, cursor)
+        self.assertFalse(pagina.has_previous)
+
+    ORDEN_MOVIMIENTOS = ('-fecha_movimiento', '-id')
+
+    def test_combinado_con_valor_nulo(self):
+        cursor = codificar_cursor([None, 1, 0])
+        querysets = [HistorialRepuesto.objects.none(), HistorialAdicional.objects.none()]
+        pagina = paginar_combinado(querysets, self.ORDEN_MOVIMIENTOS, cursor)
+        self.assertEqual(list(pagina), [])
+
+    def test_combinado_con_valor_no_texto(self):
+        cursor = codificar_cursor([{'a': 1}, 1, 0])
+        querysets = [HistorialRepuesto.objects.none(), HistorialAdicional.objects.none()]
+        pagina = paginar_combinado(querysets, self.ORDEN_MOVIMIENTOS, cursor)
+        self.assertEqual(list(pagina), [])
+
+
+class PresupuestoConsultasTests(TestCase):
+    """Las vistas con presupuesto en settings.PRESUPUESTOS_CONSULTAS no lo superan"""
+
+    # Las vistas @solo_lectura consultan el alias 'replica' (espejo de default en tests)
+    databases = '__all__'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(
+            email='presupuesto@test.com', nombre='Presupuesto', password='clave-test', is_staff=True,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.usuario)
+
+    # Renderizan plantillas que no están en el repositorio: se mide el
+    # presupuesto de las consultas previas al render, sin exigir el 200
+    SIN_PLANTILLA = {'dashboard_inventario'}
+
+    def test_vistas_dentro_del_presupuesto(self):
+        for url_name in settings.PRESUPUESTOS_CONSULTAS:
+            with self.subTest(url_name=url_name):
+                self.client.raise_request_exception = url_name not in self.SIN_PLANTILLA
+                with presupuesto_consultas(url_name):
+                    respuesta = self.client.get(reverse(url_name))
+                if url_name not in self.SIN_PLANTILLA:
+                    self.assertEqual(respuesta.status_code, 200)
+
+    @override_settings(PRESUPUESTOS_CONSULTAS={'dashboard_oh_nuevo': 1})
+    def test_presupuesto_excedido(self):
+        with self.assertRaises(PresupuestoExcedido):
+            with presupuesto_consultas('dashboard_oh_nuevo'):
+                self.client.get(reverse('dashboard_oh_nuevo'))
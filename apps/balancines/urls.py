@@ -1,136 +0,0 @@
-# apps/balancines/urls.py
-from django.urls import path, re_path
-from django.contrib.auth import views as auth_views
-from . import views
-from .forms import LoginForm
-
-urlpatterns = [
-    # ========== PÁGINAS PRINCIPALES ==========
-    path('', views.home, name='home'),
-    path('dashboard/', views.dashboard, name='dashboard'),
-    
-    # ========== AUTENTICACIÓN ==========
-    path('login/',
-         auth_views.LoginView.as_view(
-             template_name='accounts/login.html',
-             authentication_form=LoginForm,
-             redirect_authenticated_user=True,
-         ),
-         name='login'),
-    
-    path('logout/',
-         auth_views.LogoutView.as_view(
-             template_name='accounts/logout.html',
-             next_page='home'
-         ),
-         name='logout'),
-    
-    path('register/', views.register, name='register'),
-    
-    # ========== INVENTARIO - PRINCIPAL ==========
-    path('inventario/', views.inventario_principal, name='inventario_principal'),
-    path('inventario/dashboard/', views.dashboard_inventario, name='dashboard_inventario'),
-    path('inventario/buscar/', views.buscar_inventario, name='buscar_inventario'),
-    path('inventario/exportar-excel/', views.exportar_inventario_excel, name='exportar_inventario_excel'),
-    
-    # ========== INVENTARIO - TIPOS DE BALANCÍN ==========
-    path('inventario/tipos-balancin/', views.lista_tipos_balancin, name='lista_tipos_balancin'),
-    path('inventario/tipos-balancin/agregar/', views.agregar_tipo_balancin, name='agregar_tipo_balancin'),
-    re_path(r'^inventario/tipos-balancin/(?P<codigo>.+)/$', views.detalle_tipo_balancin, name='detalle_tipo_balancin'),
-    
-    # ========== INVENTARIO - BALANCINES INDIVIDUALES ==========
-    path('inventario/balancines/', views.lista_balancines_individuales, name='lista_balancines_individuales'),
-    path('inventario/balancines/agregar/', views.agregar_balancin_individual, name='agregar_balancin_individual'),
-    
-    re_path(r'^inventario/balancines/(?P<codigo>.+)/registrar-oh/$', views.registrar_oh_balancin, name='registrar_oh_balancin'),
-    re_path(r'^inventario/balancines/(?P<codigo>.+)/editar/$', views.editar_balancin_individual, name='editar_balancin_individual'),
-    re_path(r'^inventario/balancines/(?P<codigo>.+)/eliminar/$', views.eliminar_balancin_individual, name='eliminar_balancin_individual'),
-    re_path(r'^inventario/balancines/(?P<codigo>.+)/$', views.detalle_balancin, name='detalle_balancin'),
-    
-    # ========== API PARA CÓDIGOS DE BALANCINES ==========
-    path('api/ultimo-codigo-balancin/', views.ultimo_codigo_balancin, name='ultimo_codigo_balancin'),
-    
-    # ========== DASHBOARD OH ==========
-    path('inventario/dashboard-oh/', views.dashboard_oh_nuevo, name='dashboard_oh_balancines'),
-    path('inventario/dashboard-oh-nuevo/', views.dashboard_oh_nuevo, name='dashboard_oh_nuevo'),
-    
-    # ========== NUEVA URL PARA AGREGAR OH ==========
-    path('inventario/registrar_oh_balancin/', views.registrar_oh_balancin, name='registrar_oh_balancin'),
-    
-    # ========== INVENTARIO - REPUESTOS PARA BALANCINES ==========
-    path('inventario/repuestos-balancin/', views.lista_repuestos_balancin, name='lista_repuestos_balancin'),
-    path('inventario/repuestos-balancin/agregar/', views.agregar_repuesto_balancin, name='agregar_repuesto_balancin'),
-    path('inventario/repuestos-balancin/<str:item>/entrada/', views.entrada_stock_balancin, name='entrada_stock_balancin'),
-    path('inventario/repuestos-balancin/<str:item>/salida/', views.salida_stock_balancin, name='salida_stock_balancin'),    
-    
-    # ========== EXPORTAR DATOS ==========
-
-    
-    # ========== INVENTARIO - REPUESTOS ADICIONALES ==========
-    path('inventario/repuestos-adicionales/', views.lista_repuestos_adicionales, name='lista_repuestos_adicionales'),
-    path('inventario/repuestos-adicionales/agregar/', views.agregar_repuesto_adicional, name='agregar_repuesto_adicional'),
-    path('inventario/repuestos-adicionales/<str:item>/entrada/', views.entrada_stock_adicional, name='entrada_stock_adicional'),
-    path('inventario/repuestos-adicionales/<str:item>/salida/', views.salida_stock_adicional, name='salida_stock_adicional'),
-    
-    path('crear-formulario/<path:codigo>/', views.crear_formulario_control, name='crear_formulario_control'),
-    path('formularios/', views.lista_formularios, name='lista_formularios'),
-    path('formulario/<str:codigo>/', views.detalle_formulario, name='detalle_formulario'),
-    
-    # ========== API PARA BÚSQUEDA DE REPUESTOS ==========
-path('api/buscar-repuestos/', views.buscar_repuestos_api, name='buscar_repuestos_api'),
-
-path('api/buscar-usuarios/', views.buscar_usuarios_api, name='buscar_usuarios_api'),
-
-path('api/buscar-jefes/', views.buscar_jefes_api, name='buscar_jefes_api'),
-
-#=== para historial torre ==== 
-
-path('historial-torre/', views.historial_torre_con_filtros, name='historial_torre_filtros'),
-
-# === PARA HISTORIAL DE BALANCÍN ESPECÍFICO === 
-path('historial-balancin/<path:codigo>/', views.historial_balancin, name='historial_balancin'),
-
-path('api/torres-por-linea/', views.torres_por_linea_api, name='torres_por_linea_api'),
-
-
-# ========== APIS PARA HISTORIAL DE MOVIMIENTOS ==========
-# ===== APIs CON FILTROS =====
-path('api/historial-repuestos-balancin-filtros/', views.api_historial_repuestos_balancin_filtros, name='api_historial_repuestos_balancin_filtros'),
-path('api/historial-repuestos-adicionales-filtros/', views.api_historial_repuestos_adicionales_filtros, name='api_historial_repuestos_adicionales_filtros'),
-path('api/historial-completo-filtros/', views.api_historial_completo_filtros, name='api_historial_completo_filtros'),
-
-# ===== DASHBOARD =====
-path('api/dashboard-inventario/', views.api_dashboard_inventario, name='api_dashboard_inventario'),
-
-path('dashboard-alertas/', views.dashboard_alertas, name='dashboard_alertas'),
-path('api/marcar-alerta-leida/', views.marcar_alerta_leida, name='marcar_alerta_leida'),
-
-path('mantenimiento/', views.mantenimiento_balancines, name='mantenimiento_balancines'),
-path('api/cambiar-estado-mantenimiento/', views.cambiar_estado_mantenimiento, name='cambiar_estado_mantenimiento'),
-
-
-
-# ========== INTERCAMBIO DE BALANCINES ==========
-re_path(r'^intercambiar/(?P<codigo_balancin>.+)/$', views.intercambiar_balancin, name='intercambiar_balancin'),
-
-path('api/realizar-intercambio/', views.realizar_intercambio, name='realizar_intercambio'),
-
-
-
-# apps/balancines/urls.py
-
-# Agrega estas URLs al final del archivo
-path('trabajos/', views.lista_trabajos_taller, name='lista_trabajos_taller'),
-path('trabajos/nuevo/', views.crear_trabajo_taller, name='crear_trabajo_taller'),
-path('trabajos/<int:pk>/', views.detalle_trabajo_taller, name='detalle_trabajo_taller'),
-path('trabajos/<int:pk>/editar/', views.editar_trabajo_taller, name='editar_trabajo_taller'),
-
-
-# En el bloque de URLs, después de las APIs existentes
-path('api/horas-en-vivo/', views.api_horas_en_vivo, name='api_horas_en_vivo'),
-path('inventario/dashboard-oh-vivo/', views.dashboard_oh_vivo, name='dashboard_oh_vivo'),
-
-# ========== REINICIAR CONTADOR ==========
-path('api/reiniciar-contador/', views.reiniciar_contador, name='reiniciar_contador'),
-
-]
\ No newline at end of file
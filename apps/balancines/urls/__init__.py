@@ -0,0 +1,53 @@
+# apps/balancines/urls/__init__.py
+"""
+URLs de balancines: las páginas principales y la autenticación aquí, el
+resto en un módulo por dominio (mismo reparto que views/). Las vistas se
+referencian con perezosa(): cargar las URLs no importa los módulos de
+vistas, cada uno se importa con el primer request que lo usa.
+"""
+from django.urls import include, path
+from django.contrib.auth import views as auth_views
+from ..forms import LoginForm
+from ..views import perezosa
+
+urlpatterns = [
+    # ========== PÁGINAS PRINCIPALES ==========
+    path('', perezosa('principal.home'), name='home'),
+    path('dashboard/', perezosa('principal.dashboard'), name='dashboard'),
+    
+    # ========== AUTENTICACIÓN ==========
+    path('login/',
+         auth_views.LoginView.as_view(
+             template_name='accounts/login.html',
+             authentication_form=LoginForm,
+             redirect_authenticated_user=True,
+         ),
+         name='login'),
+    
+    path('logout/',
+         auth_views.LogoutView.as_view(
+             template_name='accounts/logout.html',
+             next_page='home'
+         ),
+         name='logout'),
+    
+    path('register/', perezosa('principal.register'), name='register'),
+    
+    # ========== MÉTRICAS DE RENDIMIENTO ==========
+    path('metricas/', perezosa('principal.metricas_rendimiento'), name='metricas_rendimiento'),
+    path('metricas/limpiar/', perezosa('principal.limpiar_metricas_rendimiento'), name='limpiar_metricas_rendimiento'),
+    
+    # ========== SALUD ==========
+    path('salud/', perezosa('principal.salud'), name='salud'),
+    
+    # ========== DOMINIOS ==========
+    # oh va antes que inventario: inventario/balancines/<codigo>/registrar-oh/
+    # también coincide con el detalle de balancín
+    path('', include('apps.balancines.urls.oh')),
+    path('', include('apps.balancines.urls.inventario')),
+    path('', include('apps.balancines.urls.formularios')),
+    path('', include('apps.balancines.urls.taller')),
+    path('', include('apps.balancines.urls.alertas')),
+    path('', include('apps.balancines.urls.mantenimiento')),
+    path('', include('apps.balancines.urls.api')),
+]
@@ -0,0 +1,8 @@
+# apps/balancines/urls/alertas.py
+from django.urls import path
+from ..views import perezosa
+
+urlpatterns = [
+    path('dashboard-alertas/', perezosa('alertas.dashboard_alertas'), name='dashboard_alertas'),
+    path('api/marcar-alerta-leida/', perezosa('alertas.marcar_alerta_leida'), name='marcar_alerta_leida'),
+]
@@ -0,0 +1,30 @@
+# apps/balancines/urls/api.py
+from django.urls import path
+from ..views import perezosa
+
+urlpatterns = [
+    # ========== CÓDIGOS Y BÚSQUEDAS ==========
+    path('api/ultimo-codigo-balancin/', perezosa('api.ultimo_codigo_balancin'), name='ultimo_codigo_balancin'),
+    path('api/buscar-repuestos/', perezosa('api.buscar_repuestos_api'), name='buscar_repuestos_api'),
+    path('api/buscar-usuarios/', perezosa('api.buscar_usuarios_api'), name='buscar_usuarios_api'),
+    path('api/buscar-jefes/', perezosa('api.buscar_jefes_api'), name='buscar_jefes_api'),
+    path('api/torres-por-linea/', perezosa('api.torres_por_linea_api'), name='torres_por_linea_api'),
+    
+    # ========== HISTORIAL DE MOVIMIENTOS (CON FILTROS) ==========
+    path('api/historial-repuestos-balancin-filtros/', perezosa('api.api_historial_repuestos_balancin_filtros'), name='api_historial_repuestos_balancin_filtros'),
+    path('api/historial-repuestos-adicionales-filtros/', perezosa('api.api_historial_repuestos_adicionales_filtros'), name='api_historial_repuestos_adicionales_filtros'),
+    path('api/historial-completo-filtros/', perezosa('api.api_historial_completo_filtros'), name='api_historial_completo_filtros'),
+    
+    # ========== DASHBOARD ==========
+    path('api/dashboard-inventario/', perezosa('api.api_dashboard_inventario'), name='api_dashboard_inventario'),
+    
+    # ========== AUDITORÍA ==========
+    path('api/auditoria/', perezosa('api.api_auditoria'), name='api_auditoria'),
+    
+    # ========== ARCHIVO EN FRÍO ==========
+    path('api/archivo/<str:codigo>/', perezosa('api.api_archivo_balancin'), name='api_archivo_balancin'),
+    
+    # ========== HORAS EN VIVO ==========
+    path('api/horas-en-vivo/', perezosa('api.api_horas_en_vivo'), name='api_horas_en_vivo'),
+    path('api/horas-en-vivo/stream/', perezosa('api.stream_horas_en_vivo', asincrona=True), name='stream_horas_en_vivo'),
+]
@@ -0,0 +1,9 @@
+# apps/balancines/urls/formularios.py
+from django.urls import path
+from ..views import perezosa
+
+urlpatterns = [
+    path('crear-formulario/<path:codigo>/', perezosa('formularios.crear_formulario_control'), name='crear_formulario_control'),
+    path('formularios/', perezosa('formularios.lista_formularios'), name='lista_formularios'),
+    path('formulario/<str:codigo>/', perezosa('formularios.detalle_formulario'), name='detalle_formulario'),
+]
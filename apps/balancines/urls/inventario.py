@@ -0,0 +1,36 @@
+# apps/balancines/urls/inventario.py
+from django.urls import path, re_path
+from ..views import perezosa
+
+urlpatterns = [
+    # ========== INVENTARIO - PRINCIPAL ==========
+    path('inventario/', perezosa('inventario.inventario_principal'), name='inventario_principal'),
+    path('inventario/dashboard/', perezosa('inventario.dashboard_inventario'), name='dashboard_inventario'),
+    path('inventario/buscar/', perezosa('inventario.buscar_inventario'), name='buscar_inventario'),
+    path('inventario/exportar-excel/', perezosa('inventario.exportar_inventario_excel'), name='exportar_inventario_excel'),
+    
+    # ========== INVENTARIO - TIPOS DE BALANCÍN ==========
+    path('inventario/tipos-balancin/', perezosa('inventario.lista_tipos_balancin'), name='lista_tipos_balancin'),
+    path('inventario/tipos-balancin/agregar/', perezosa('inventario.agregar_tipo_balancin'), name='agregar_tipo_balancin'),
+    re_path(r'^inventario/tipos-balancin/(?P<codigo>.+)/$', perezosa('inventario.detalle_tipo_balancin'), name='detalle_tipo_balancin'),
+    
+    # ========== INVENTARIO - BALANCINES INDIVIDUALES ==========
+    path('inventario/balancines/', perezosa('inventario.lista_balancines_individuales'), name='lista_balancines_individuales'),
+    path('inventario/balancines/agregar/', perezosa('inventario.agregar_balancin_individual'), name='agregar_balancin_individual'),
+    
+    re_path(r'^inventario/balancines/(?P<codigo>.+)/editar/$', perezosa('inventario.editar_balancin_individual'), name='editar_balancin_individual'),
+    re_path(r'^inventario/balancines/(?P<codigo>.+)/eliminar/$', perezosa('inventario.eliminar_balancin_individual'), name='eliminar_balancin_individual'),
+    re_path(r'^inventario/balancines/(?P<codigo>.+)/$', perezosa('inventario.detalle_balancin'), name='detalle_balancin'),
+    
+    # ========== INVENTARIO - REPUESTOS PARA BALANCINES ==========
+    path('inventario/repuestos-balancin/', perezosa('inventario.lista_repuestos_balancin'), name='lista_repuestos_balancin'),
+    path('inventario/repuestos-balancin/agregar/', perezosa('inventario.agregar_repuesto_balancin'), name='agregar_repuesto_balancin'),
+    path('inventario/repuestos-balancin/<str:item>/entrada/', perezosa('inventario.entrada_stock_balancin'), name='entrada_stock_balancin'),
+    path('inventario/repuestos-balancin/<str:item>/salida/', perezosa('inventario.salida_stock_balancin'), name='salida_stock_balancin'),
+    
+    # ========== INVENTARIO - REPUESTOS ADICIONALES ==========
+    path('inventario/repuestos-adicionales/', perezosa('inventario.lista_repuestos_adicionales'), name='lista_repuestos_adicionales'),
+    path('inventario/repuestos-adicionales/agregar/', perezosa('inventario.agregar_repuesto_adicional'), name='agregar_repuesto_adicional'),
+    path('inventario/repuestos-adicionales/<str:item>/entrada/', perezosa('inventario.entrada_stock_adicional'), name='entrada_stock_adicional'),
+    path('inventario/repuestos-adicionales/<str:item>/salida/', perezosa('inventario.salida_stock_adicional'), name='salida_stock_adicional'),
+]
@@ -0,0 +1,12 @@
+# apps/balancines/urls/mantenimiento.py
+from django.urls import path, re_path
+from ..views import perezosa
+
+urlpatterns = [
+    path('mantenimiento/', perezosa('mantenimiento.mantenimiento_balancines'), name='mantenimiento_balancines'),
+    path('api/cambiar-estado-mantenimiento/', perezosa('mantenimiento.cambiar_estado_mantenimiento'), name='cambiar_estado_mantenimiento'),
+    
+    # ========== INTERCAMBIO DE BALANCINES ==========
+    re_path(r'^intercambiar/(?P<codigo_balancin>.+)/$', perezosa('mantenimiento.intercambiar_balancin'), name='intercambiar_balancin'),
+    path('api/realizar-intercambio/', perezosa('mantenimiento.realizar_intercambio'), name='realizar_intercambio'),
+]
@@ -0,0 +1,21 @@
+# apps/balancines/urls/oh.py
+from django.urls import path, re_path
+from ..views import perezosa
+
+urlpatterns = [
+    # ========== REGISTRO DE OH ==========
+    re_path(r'^inventario/balancines/(?P<codigo>.+)/registrar-oh/$', perezosa('oh.registrar_oh_balancin'), name='registrar_oh_balancin'),
+    path('inventario/registrar_oh_balancin/', perezosa('oh.registrar_oh_balancin'), name='registrar_oh_balancin'),
+    
+    # ========== DASHBOARD OH ==========
+    path('inventario/dashboard-oh/', perezosa('oh.dashboard_oh_nuevo'), name='dashboard_oh_balancines'),
+    path('inventario/dashboard-oh-nuevo/', perezosa('oh.dashboard_oh_nuevo'), name='dashboard_oh_nuevo'),
+    path('inventario/dashboard-oh-vivo/', perezosa('oh.dashboard_oh_vivo'), name='dashboard_oh_vivo'),
+    
+    # ========== HISTORIAL ==========
+    path('historial-torre/', perezosa('oh.historial_torre_con_filtros'), name='historial_torre_filtros'),
+    path('historial-balancin/<path:codigo>/', perezosa('oh.historial_balancin'), name='historial_balancin'),
+    
+    # ========== REINICIAR CONTADOR ==========
+    path('api/reiniciar-contador/', perezosa('oh.reiniciar_contador'), name='reiniciar_contador'),
+]
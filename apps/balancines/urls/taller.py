@@ -0,0 +1,10 @@
+# apps/balancines/urls/taller.py
+from django.urls import path
+from ..views import perezosa
+
+urlpatterns = [
+    path('trabajos/', perezosa('taller.lista_trabajos_taller'), name='lista_trabajos_taller'),
+    path('trabajos/nuevo/', perezosa('taller.crear_trabajo_taller'), name='crear_trabajo_taller'),
+    path('trabajos/<int:pk>/', perezosa('taller.detalle_trabajo_taller'), name='detalle_trabajo_taller'),
+    path('trabajos/<int:pk>/editar/', perezosa('taller.editar_trabajo_taller'), name='editar_trabajo_taller'),
+]
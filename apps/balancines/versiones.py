@@ -0,0 +1,111 @@
+# apps/balancines/versiones.py
+"""
+Versionado de respuestas por contador de cambios por tabla.
+
+Cada modelo versionado tiene un contador (ContadorCambios) que se
+incrementa en post_save/post_delete (ver signals.py) y explícitamente
+después de operaciones masivas (update/bulk_create/bulk_update), que no
+disparan señales. Con esos contadores se calcula un ETag barato para
+responder 304 a If-None-Match sin ejecutar la vista:
+
+    @login_required
+    @condicional(HistorialRepuesto, RepuestoBalancin, ventana=60)
+    def api_historial_repuestos_balancin_filtros(request): ...
+"""
+
+import hashlib
+from functools import wraps
+
+from django.db.models import F
+from django.db.models.functions import Now
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+# Modelos cuyos cambios incrementan su contador
+MODELOS_VERSIONADOS = {
+    'balancines.linea',
+    'balancines.calendariolinea',
+    'balancines.excepcionoperacion',
+    'balancines.seccion',
+    'balancines.torre',
+    'balancines.tipobalancin',
+    'balancines.balancinindividual',
+    'balancines.historialoh',
+    'balancines.controlhorasbalancin',
+    'balancines.alertaoh',
+    'balancines.repuestobalancin',
+    'balancines.repuestoadicional',
+    'balancines.historialrepuesto',
+    'balancines.historialadicional',
+    'balancines.registrotallerdiario',
+    'balancines.formularioreacondicionamiento',
+    'balancines.configuracionrepuestosportipo',
+    'balancines.usuario',
+}
+
+
+def _etiqueta(modelo):
+    return modelo if isinstance(modelo, str) else modelo._meta.label_lower
+
+
+def incrementar(*modelos):
+    """Incrementa el contador de cambios de los modelos indicados"""
+    from .models import ContadorCambios
+
+    tablas = {_etiqueta(m) for m in modelos}
+    actualizadas = ContadorCambios.objects.filter(tabla__in=tablas).update(
+        version=F('version') + 1, actualizado=Now()
+    )
+    if actualizadas < len(tablas):
+        existentes = set(ContadorCambios.objects.filter(tabla__in=tablas).values_list('tabla', flat=True))
+        ContadorCambios.objects.bulk_create(
+            [ContadorCambios(tabla=tabla, version=1) for tabla in tablas - existentes],
+            ignore_conflicts=True,
+        )
+
+
+def obtener_versiones(*modelos):
+    """{tabla: version} de los modelos indicados (0 si nunca cambiaron)"""
+    from .models import ContadorCambios
+
+    tablas = sorted({_etiqueta(m) for m in modelos})
+    versiones = dict(ContadorCambios.objects.filter(tabla__in=tablas).values_list('tabla', 'version'))
+    return {tabla: versiones.get(tabla, 0) for tabla in tablas}
+
+
+def token_version(*modelos, extra=''):
+    """Token corto que cambia cuando cambia cualquiera de los modelos"""
+    versiones = obtener_versiones(*modelos)
+    base = '|'.join(f'{tabla}:{version}' for tabla, version in versiones.items()) + f'|{extra}'
+    return hashlib.md5(base.encode()).hexdigest()[:16]
+
+
+def condicional(*modelos, ventana=None):
+    """
+    Decorador de vista: ETag a partir de los contadores de los modelos.
+    `ventana` (segundos) agrega un bucket de tiempo al token, para respuestas
+    que también dependen de la hora actual (horas en vivo, periodos móviles,
+    "hace X minutos").
+    """
+    def etag(request, *args, **kwargs):
+        # La respuesta depende de los filtros GET
+        extra = request.get_full_path()
+        if ventana:
+            extra += f'|{int(timezone.now().timestamp() // ventana)}'
+        return token_version(*modelos, extra=extra)
+
+    def decorador(vista):
+        vista_condicional = condition(etag_func=etag)(vista)
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            response = vista_condicional(request, *args, **kwargs)
+            # El navegador guarda la respuesta pero siempre revalida con If-None-Match
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,66 @@
+# apps/balancines/views/__init__.py
+"""
+Vistas de balancines, un módulo por dominio:
+
+    principal      inicio, dashboard, registro, métricas y salud
+    inventario     tipos, balancines, repuestos, stock, búsqueda y Excel
+    oh             registro de OH, dashboards OH, historiales y contador
+    formularios    formularios de control de reacondicionamiento
+    taller         trabajos diarios del taller
+    alertas        dashboard y lectura de alertas OH
+    mantenimiento  entrada/salida de mantenimiento e intercambios
+    api            endpoints JSON/HTML parciales y stream SSE
+
+Las consultas de lectura compartidas están en selectors.py. Este paquete no
+reexporta las vistas: las URLs (urls/) las referencian con perezosa(), así
+que cada módulo se importa con el primer request que lo necesita y no al
+arrancar el worker.
+"""
+
+from importlib import import_module
+
+
+class VistaPerezosa:
+    """
+    Referencia a una vista ('inventario.dashboard_inventario') que importa su
+    módulo la primera vez que se usa. Los atributos que leen los middlewares
+    (p. ej. csrf_exempt) se buscan en la vista real.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        modulo, self.__name__ = ruta.rsplit('.', 1)
+        self.__module__ = f'{__name__}.{modulo}'
+        self.__qualname__ = self.__name__
+        self._vista = None
+
+    @property
+    def vista(self):
+        if self._vista is None:
+            self._vista = getattr(import_module(self.__module__), self.__name__)
+        return self._vista
+
+    def __call__(self, request, *args, **kwargs):
+        return self.vista(request, *args, **kwargs)
+
+    def __getattr__(self, nombre):
+        # view_class lo consulta el resolver al armar las URLs: no debe importar nada
+        if nombre.startswith('__') or nombre in ('_vista', 'view_class'):
+            raise AttributeError(nombre)
+        return getattr(self.vista, nombre)
+
+    def __repr__(self):
+        return f'<VistaPerezosa {self.__module__}.{self.__name__}>'
+
+
+def perezosa(ruta, asincrona=False):
+    """
+    Vista para path()/re_path() que se importa con el primer request. Las
+    vistas async def se declaran con asincrona=True: Django decide cómo
+    llamarlas antes de que el módulo se importe.
+    """
+    vista = VistaPerezosa(ruta)
+    if asincrona:
+        from asgiref.sync import markcoroutinefunction
+        markcoroutinefunction(vista)
+    return vista
@@ -0,0 +1,53 @@
+# ============================================================
+# BALANCINES - VISTAS: ALERTAS OH
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+# ========== PYTHON STANDARD LIBRARY ==========
+import json
+
+# ========== LOCALES ==========
+from ..models import AlertaOH
+from ..services.alertas_oh import ServicioAlertasOH
+
+
+# ============================================================
+# DASHBOARD DE ALERTAS
+# ============================================================
+
+@login_required
+def dashboard_alertas(request):
+    """Vista del dashboard de alertas OH"""
+    alertas = ServicioAlertasOH.obtener_alertas_activas(incluir_leidas=False)
+    estadisticas = ServicioAlertasOH.obtener_estadisticas()
+    
+    context = {
+        'alertas': alertas,
+        'stats': estadisticas,
+    }
+    return render(request, 'balancines/dashboard_alertas.html', context)
+
+
+@login_required
+@require_POST
+@csrf_exempt
+def marcar_alerta_leida(request):
+    """API para marcar una alerta como leída"""
+    try:
+        data = json.loads(request.body)
+        alerta_id = data.get('alerta_id')
+        
+        alerta = AlertaOH.objects.get(id=alerta_id)
+        alerta.marcar_como_leida(usuario=request.user)
+        
+        return JsonResponse({'success': True, 'message': 'Alerta marcada como leída'})
+    except AlertaOH.DoesNotExist:
+        return JsonResponse({'success': False, 'message': 'Alerta no encontrada'}, status=404)
+    except Exception as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=500)
@@ -0,0 +1,578 @@
+# ============================================================
+# BALANCINES - VISTAS: API
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q, Sum
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.conf import settings
+
+# ========== PYTHON STANDARD LIBRARY ==========
+import asyncio
+import json
+from datetime import datetime, time, timedelta
+from collections import defaultdict
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    Linea, Torre, BalancinIndividual, HistorialOH, ControlHorasBalancin,
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional, Usuario, ActivityLog,
+)
+
+# ========== LOCALES ==========
+from ..auditoria import paginar_auditoria
+from ..services.archivo import ServicioArchivo
+from ..services.horas_en_vivo import ServicioHorasEnVivo
+from ..eventos import canal_horas
+from ..versiones import condicional
+from ..routers import solo_lectura
+from ..paginacion import MAX_POR_PAGINA, limitar_por_pagina, paginar_combinado, paginar_keyset
+from ..selectors import torres_con_tipo
+
+
+@login_required
+def ultimo_codigo_balancin(request):
+    """API para obtener el último código de balancín de un tipo específico."""
+    tipo = request.GET.get('tipo', '')
+    
+    if not tipo:
+        return JsonResponse({'error': 'Tipo no especificado'}, status=400)
+    
+    try:
+        balancines = BalancinIndividual.objects.filter(
+            codigo__startswith=f"BAL-{tipo}-"
+        )
+        
+        ultimo_numero = 0
+        ultimo_codigo = None
+        
+        for b in balancines:
+            partes = b.codigo.split('-')
+            if len(partes) >= 4:
+                try:
+                    numero = int(partes[-1])
+                    if numero > ultimo_numero:
+                        ultimo_numero = numero
+                        ultimo_codigo = b.codigo
+                except ValueError:
+                    continue
+        
+        if ultimo_numero == 0:
+            siguiente_numero = 1
+        else:
+            siguiente_numero = ultimo_numero + 1
+        
+        siguiente_codigo = f"BAL-{tipo}-{siguiente_numero:03d}"
+        
+        return JsonResponse({
+            'tipo': tipo,
+            'ultimo_codigo': ultimo_codigo,
+            'ultimo_numero': ultimo_numero,
+            'siguiente_numero': siguiente_numero,
+            'siguiente_codigo': siguiente_codigo
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def torres_por_linea_api(request):
+    """API para obtener torres de una línea que tienen un tipo específico de balancín"""
+    linea_nombre = request.GET.get('linea')
+    tipo_balancin = request.GET.get('tipo')
+    
+    if not linea_nombre or not tipo_balancin:
+        return JsonResponse({'torres': []})
+    
+    torres = torres_con_tipo(linea_nombre, tipo_balancin)
+    if torres is None:
+        return JsonResponse({'torres': []})
+    
+    torres_data = [{
+        'id': t.id,
+        'numero': t.numero_torre,
+        'texto': f"Torre {t.numero_torre} ({t.seccion.nombre})"
+    } for t in torres]
+    
+    return JsonResponse({'torres': torres_data})
+
+
+# ============================================================
+# API ENDPOINTS
+# ============================================================
+
+@login_required
+def buscar_repuestos_api(request):
+    """API para buscar repuestos en ambas tablas"""
+    query = request.GET.get('q', '').strip()
+    
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+    
+    resultados = []
+    query_upper = query.upper()
+    
+    repuestos_balancin = RepuestoBalancin.objects.filter(
+        Q(item__icontains=query_upper) | Q(descripcion__icontains=query)
+    )[:10]
+    
+    for r in repuestos_balancin:
+        resultados.append({
+            'id': r.item,
+            'item': r.item,
+            'descripcion': r.descripcion,
+            'tipo': 'Balancín',
+            'cantidad': r.cantidad,
+            'origen': 'balancin'
+        })
+    
+    repuestos_adicionales = RepuestoAdicional.objects.filter(
+        Q(item__icontains=query_upper) | Q(descripcion__icontains=query)
+    )[:10]
+    
+    for r in repuestos_adicionales:
+        resultados.append({
+            'id': r.item,
+            'item': r.item,
+            'descripcion': r.descripcion,
+            'tipo': 'Adicional',
+            'cantidad': r.cantidad,
+            'origen': 'adicional'
+        })
+    
+    resultados = sorted(resultados, key=lambda x: x['item'])[:15]
+    return JsonResponse({'results': resultados})
+
+
+@login_required
+def buscar_usuarios_api(request):
+    """API para buscar usuarios por nombre o email"""
+    query = request.GET.get('q', '').strip()
+    
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+    
+    usuarios = Usuario.objects.filter(
+        Q(nombre__icontains=query) | Q(email__icontains=query)
+    )[:10]
+    
+    results = []
+    for user in usuarios:
+        results.append({
+            'id': user.id,
+            'nombre': user.nombre,
+            'email': user.email,
+            'rol': user.get_rol_display(),
+            'rol_value': user.rol
+        })
+    
+    return JsonResponse({'results': results})
+
+
+@login_required
+def buscar_jefes_api(request):
+    """API para buscar solo usuarios con rol de jefe"""
+    query = request.GET.get('q', '').strip()
+    
+    usuarios = Usuario.objects.filter(rol='jefe')
+    
+    if len(query) >= 2:
+        usuarios = usuarios.filter(
+            Q(nombre__icontains=query) | Q(email__icontains=query)
+        )
+    
+    usuarios = usuarios[:10]
+    
+    results = []
+    for user in usuarios:
+        results.append({
+            'id': user.id,
+            'nombre': user.nombre,
+            'email': user.email,
+            'rol': user.get_rol_display(),
+        })
+    
+    return JsonResponse({'results': results})
+
+
+# ============================================================
+# APIs DE FILTROS PARA HISTORIAL
+# ============================================================
+
+def _filtrar_historial(request, historial):
+    """Filtros comunes de los historiales de movimientos (fecha, tipo y búsqueda)"""
+    fecha_desde = parse_date(request.GET.get('fecha_desde') or '')
+    fecha_hasta = parse_date(request.GET.get('fecha_hasta') or '')
+    tipo = request.GET.get('tipo')
+    busqueda = request.GET.get('busqueda')
+    
+    if fecha_desde:
+        historial = historial.filter(fecha_movimiento__date__gte=fecha_desde)
+    if fecha_hasta:
+        historial = historial.filter(fecha_movimiento__date__lte=fecha_hasta)
+    if tipo:
+        historial = historial.filter(tipo_movimiento=tipo)
+    if busqueda:
+        historial = historial.filter(
+            Q(repuesto__item__icontains=busqueda) |
+            Q(repuesto__descripcion__icontains=busqueda) |
+            Q(observaciones__icontains=busqueda)
+        )
+    return historial
+
+
+def _actividad_historial(h, origen):
+    """Movimiento de HistorialRepuesto o HistorialAdicional como item de historial_items.html"""
+    actividad = {
+        'tipo': h.tipo_movimiento,
+        'repuesto': h.repuesto.item,
+        'descripcion': h.repuesto.descripcion,
+        'cantidad': h.cantidad,
+        'stock_restante': h.stock_restante,
+        'observaciones': h.observaciones,
+        'fecha': h.fecha_movimiento,
+        'origen': origen,
+    }
+    if origen == 'Adicional':
+        actividad['usuario'] = h.usuario.nombre if h.usuario else 'Sistema'
+    return actividad
+
+
+def _por_pagina_historial(request):
+    return limitar_por_pagina(request.GET.get('por_pagina'), defecto=MAX_POR_PAGINA)
+
+
+def _pagina_historial(request, historial):
+    """Página de movimientos por cursor (?cursor=...&por_pagina=...), más recientes primero"""
+    return paginar_keyset(
+        historial, ('-fecha_movimiento', '-id'),
+        cursor=request.GET.get('cursor'),
+        por_pagina=_por_pagina_historial(request),
+    ).con_urls(request)
+
+
+def _respuesta_historial_items(request, actividades, pagina):
+    """Fragmento HTML; con cursor es una continuación ("Cargar más") que se agrega al final"""
+    html = render_to_string('balancines/historial_items.html', {
+        'actividades': actividades,
+        'pagina': pagina,
+        'es_continuacion': bool(request.GET.get('cursor')),
+    })
+    return HttpResponse(html)
+
+
+@login_required
+@solo_lectura
+@condicional(HistorialRepuesto, RepuestoBalancin, ventana=60)
+def api_historial_repuestos_balancin_filtros(request):
+    """API que devuelve el HTML del historial de repuestos de balancines con filtros"""
+    historial = _filtrar_historial(request, HistorialRepuesto.objects.select_related('repuesto'))
+    pagina = _pagina_historial(request, historial)
+    actividades = [_actividad_historial(h, 'Balancín') for h in pagina]
+    return _respuesta_historial_items(request, actividades, pagina)
+
+
+@login_required
+@solo_lectura
+@condicional(HistorialAdicional, RepuestoAdicional, Usuario, ventana=60)
+def api_historial_repuestos_adicionales_filtros(request):
+    """API que devuelve el HTML del historial de repuestos adicionales con filtros"""
+    historial = _filtrar_historial(request, HistorialAdicional.objects.select_related('repuesto', 'usuario'))
+    pagina = _pagina_historial(request, historial)
+    actividades = [_actividad_historial(h, 'Adicional') for h in pagina]
+    return _respuesta_historial_items(request, actividades, pagina)
+
+
+# Orden de las fuentes del historial combinado (va en el cursor: no reordenar)
+FUENTES_HISTORIAL_COMBINADO = ('Balancín', 'Adicional')
+
+
+@login_required
+@solo_lectura
+@condicional(HistorialRepuesto, RepuestoBalancin, HistorialAdicional, RepuestoAdicional, Usuario, ventana=60)
+def api_historial_completo_filtros(request):
+    """
+    API que devuelve el HTML del historial combinado con filtros. Las dos
+    tablas se leen ordenadas por su índice de fecha y se intercalan, así la
+    página son los N movimientos más recientes de ambas.
+    """
+    pagina = paginar_combinado(
+        [
+            _filtrar_historial(request, HistorialRepuesto.objects.select_related('repuesto')),
+            _filtrar_historial(request, HistorialAdicional.objects.select_related('repuesto', 'usuario')),
+        ],
+        ('-fecha_movimiento', '-id'),
+        cursor=request.GET.get('cursor'),
+        por_pagina=_por_pagina_historial(request),
+    ).con_urls(request)
+    
+    actividades = [_actividad_historial(h, FUENTES_HISTORIAL_COMBINADO[h.indice_fuente]) for h in pagina]
+    return _respuesta_historial_items(request, actividades, pagina)
+
+
+@login_required
+@solo_lectura
+@condicional(HistorialRepuesto, RepuestoBalancin, HistorialAdicional, RepuestoAdicional, ventana=300)
+def api_dashboard_inventario(request):
+    """API que devuelve datos JSON para el dashboard de inventario"""
+    periodo = int(request.GET.get('periodo', 30))
+    tipo = request.GET.get('tipo', 'todos')
+    
+    fecha_limite = timezone.now() - timedelta(days=periodo)
+    
+    data = {
+        'total_entradas': 0,
+        'total_salidas': 0,
+        'total_movimientos': 0,
+        'stock_total': 0,
+        'movimientos_dia': {'fechas': [], 'entradas': [], 'salidas': []},
+        'distribucion': {'entradas': 0, 'salidas': 0, 'creaciones': 0, 'actualizaciones': 0},
+        'top_repuestos': []
+    }
+    
+    stock_balancines = RepuestoBalancin.objects.aggregate(total=Sum('cantidad'))['total'] or 0
+    stock_adicionales = RepuestoAdicional.objects.aggregate(total=Sum('cantidad'))['total'] or 0
+    data['stock_total'] = stock_balancines + stock_adicionales
+    
+    if tipo in ['todos', 'balancines']:
+        historial_balancin = HistorialRepuesto.objects.filter(fecha_movimiento__gte=fecha_limite)
+        data['total_entradas'] += historial_balancin.filter(tipo_movimiento='entrada').count()
+        data['total_salidas'] += historial_balancin.filter(tipo_movimiento='salida').count()
+        data['total_movimientos'] += historial_balancin.count()
+        data['distribucion']['entradas'] += historial_balancin.filter(tipo_movimiento='entrada').count()
+        data['distribucion']['salidas'] += historial_balancin.filter(tipo_movimiento='salida').count()
+    
+    if tipo in ['todos', 'adicionales']:
+        historial_adicional = HistorialAdicional.objects.filter(fecha_movimiento__gte=fecha_limite)
+        data['total_entradas'] += historial_adicional.filter(tipo_movimiento='entrada').count()
+        data['total_salidas'] += historial_adicional.filter(tipo_movimiento='salida').count()
+        data['total_movimientos'] += historial_adicional.count()
+        data['distribucion']['entradas'] += historial_adicional.filter(tipo_movimiento='entrada').count()
+        data['distribucion']['salidas'] += historial_adicional.filter(tipo_movimiento='salida').count()
+    
+    for i in range(6, -1, -1):
+        dia = timezone.now().date() - timedelta(days=i)
+        data['movimientos_dia']['fechas'].append(dia.strftime('%d/%m'))
+        
+        entradas_dia = 0
+        salidas_dia = 0
+        
+        if tipo in ['todos', 'balancines']:
+            entradas_dia += HistorialRepuesto.objects.filter(fecha_movimiento__date=dia, tipo_movimiento='entrada').count()
+            salidas_dia += HistorialRepuesto.objects.filter(fecha_movimiento__date=dia, tipo_movimiento='salida').count()
+        
+        if tipo in ['todos', 'adicionales']:
+            entradas_dia += HistorialAdicional.objects.filter(fecha_movimiento__date=dia, tipo_movimiento='entrada').count()
+            salidas_dia += HistorialAdicional.objects.filter(fecha_movimiento__date=dia, tipo_movimiento='salida').count()
+        
+        data['movimientos_dia']['entradas'].append(entradas_dia)
+        data['movimientos_dia']['salidas'].append(salidas_dia)
+    
+    movimientos_repuesto = defaultdict(lambda: {'codigo': '', 'descripcion': '', 'tipo': '', 'entradas': 0, 'salidas': 0, 'total': 0})
+    
+    if tipo in ['todos', 'balancines']:
+        for h in HistorialRepuesto.objects.filter(fecha_movimiento__gte=fecha_limite).select_related('repuesto')[:100]:
+            codigo = h.repuesto.item
+            if codigo not in movimientos_repuesto:
+                movimientos_repuesto[codigo] = {
+                    'codigo': codigo, 'descripcion': h.repuesto.descripcion, 'tipo': 'balancin',
+                    'entradas': 0, 'salidas': 0, 'total': 0
+                }
+            if h.tipo_movimiento == 'entrada':
+                movimientos_repuesto[codigo]['entradas'] += h.cantidad
+                movimientos_repuesto[codigo]['total'] += h.cantidad
+            elif h.tipo_movimiento == 'salida':
+                movimientos_repuesto[codigo]['salidas'] += h.cantidad
+                movimientos_repuesto[codigo]['total'] += h.cantidad
+    
+    if tipo in ['todos', 'adicionales']:
+        for h in HistorialAdicional.objects.filter(fecha_movimiento__gte=fecha_limite).select_related('repuesto')[:100]:
+            codigo = h.repuesto.item
+            if codigo not in movimientos_repuesto:
+                movimientos_repuesto[codigo] = {
+                    'codigo': codigo, 'descripcion': h.repuesto.descripcion, 'tipo': 'adicional',
+                    'entradas': 0, 'salidas': 0, 'total': 0
+                }
+            if h.tipo_movimiento == 'entrada':
+                movimientos_repuesto[codigo]['entradas'] += h.cantidad
+                movimientos_repuesto[codigo]['total'] += h.cantidad
+            elif h.tipo_movimiento == 'salida':
+                movimientos_repuesto[codigo]['salidas'] += h.cantidad
+                movimientos_repuesto[codigo]['total'] += h.cantidad
+    
+    data['top_repuestos'] = sorted(
+        [v for v in movimientos_repuesto.values() if v['total'] > 0],
+        key=lambda x: x['total'], reverse=True
+    )[:10]
+    
+    return JsonResponse(data)
+
+
+# ============================================================
+# AUDITORÍA (ActivityLog)
+# ============================================================
+
+def _registro_auditoria(registro):
+    return {
+        'fecha': registro.created_at,
+        'usuario': registro.user.email if registro.user else None,
+        'accion': registro.action,
+        'modulo': registro.module,
+        'descripcion': registro.description,
+        'objeto_id': registro.object_id,
+        'objeto_nombre': registro.object_name,
+        'ip': registro.ip_address,
+        'navegador': registro.browser_info,
+        'anteriores': registro.old_values,
+        'nuevos': registro.new_values,
+    }
+
+
+@staff_member_required
+@solo_lectura
+def api_auditoria(request):
+    """
+    Registros de auditoría por cursor, más recientes primero (solo staff).
+    Filtros: ?usuario=<id>&modulo=...&accion=...&objeto=<id>&desde=AAAA-MM-DD&hasta=AAAA-MM-DD
+    """
+    registros = ActivityLog.objects.all()
+    if request.GET.get('usuario', '').isdigit():
+        registros = registros.de_usuario(int(request.GET['usuario']))
+    if request.GET.get('modulo'):
+        registros = registros.de_modulo(request.GET['modulo'])
+    if request.GET.get('accion'):
+        registros = registros.de_accion(request.GET['accion'])
+    if request.GET.get('objeto'):
+        registros = registros.filter(object_id=request.GET['objeto'])
+
+    desde = parse_date(request.GET.get('desde', ''))
+    hasta = parse_date(request.GET.get('hasta', ''))
+    registros = registros.recientes(
+        desde=timezone.make_aware(datetime.combine(desde, time.min)) if desde else None,
+        hasta=timezone.make_aware(datetime.combine(hasta + timedelta(days=1), time.min)) if hasta else None,
+    )
+
+    pagina = paginar_auditoria(
+        registros,
+        cursor=request.GET.get('cursor'),
+        por_pagina=limitar_por_pagina(request.GET.get('por_pagina'), defecto=50),
+    ).con_urls(request)
+    return JsonResponse({
+        'registros': [_registro_auditoria(registro) for registro in pagina],
+        'siguiente': pagina.url_siguiente,
+        'anterior': pagina.url_anterior,
+    })
+
+
+# Tipos del archivo en frío que se pueden pedir por ?tipo=
+TIPOS_ARCHIVO = {
+    'alertas': 'balancines.AlertaOH',
+    'movimientos': 'balancines.HistorialBalancin',
+}
+
+
+@login_required
+@solo_lectura
+def api_archivo_balancin(request, codigo):
+    """
+    Alertas resueltas o movimientos archivados de un balancín, más recientes
+    primero: ?tipo=alertas|movimientos&limite=50
+    """
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    label = TIPOS_ARCHIVO.get(request.GET.get('tipo', 'alertas'))
+    if label is None:
+        return JsonResponse({'success': False, 'error': f'Tipo inválido: {", ".join(TIPOS_ARCHIVO)}'}, status=400)
+
+    filas = ServicioArchivo.del_balancin(
+        label, balancin, limite=limitar_por_pagina(request.GET.get('limite'), defecto=50)
+    )
+    return JsonResponse({
+        'success': True,
+        'codigo': balancin.codigo,
+        'archivados': ServicioArchivo.contar(balancin)[label],
+        'registros': [ServicioArchivo.como_dict(fila) for fila in filas],
+    })
+
+
+@login_required
+@solo_lectura
+@condicional(ControlHorasBalancin, BalancinIndividual, Torre, Linea, HistorialOH, ventana=60)
+def api_horas_en_vivo(request):
+    """
+    API que devuelve horas actuales en vivo usando ControlHorasBalancin
+    Las horas INCLUYEN las horas parciales del día actual
+    """
+    linea_filtro = request.GET.get('linea', '')
+    return JsonResponse({
+        'success': True,
+        **ServicioHorasEnVivo.snapshot(linea_filtro),
+    })
+
+
+def _evento_sse(tipo, datos):
+    return f"event: {tipo}\ndata: {json.dumps(datos, default=str)}\n\n"
+
+
+async def stream_horas_en_vivo(request):
+    """
+    Stream SSE de horas en vivo: envía un snapshot al conectar y luego solo
+    deltas (cambios de control de horas, nuevos OH, estados y alertas).
+    El cliente interpola las horas localmente.
+    Requiere servir la app por ASGI (config.asgi); con WSGI responde 204
+    y el dashboard vuelve al polling.
+    """
+    from asgiref.sync import sync_to_async
+    from django.core.handlers.asgi import ASGIRequest
+
+    autenticado = await sync_to_async(lambda: request.user.is_authenticated)()
+    if not autenticado:
+        return HttpResponse(status=403)
+
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    linea_filtro = request.GET.get('linea', '')
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT_SEGUNDOS', 15)
+    resync = getattr(settings, 'SSE_RESYNC_SEGUNDOS', 600)
+    snapshot = sync_to_async(ServicioHorasEnVivo.snapshot)
+
+    async def eventos():
+        cola = canal_horas.suscribir()
+        loop = asyncio.get_running_loop()
+        try:
+            yield f"retry: 5000\n{_evento_sse('snapshot', await snapshot(linea_filtro))}"
+            ultimo_snapshot = loop.time()
+
+            while True:
+                try:
+                    evento = await asyncio.wait_for(cola.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    evento = None
+
+                if evento is None or evento['tipo'] == 'resync':
+                    if evento or loop.time() - ultimo_snapshot >= resync:
+                        yield _evento_sse('snapshot', await snapshot(linea_filtro))
+                        ultimo_snapshot = loop.time()
+                    else:
+                        yield ": ping\n\n"
+                    continue
+
+                linea_evento = evento['datos'].get('linea_nombre')
+                if linea_filtro and linea_evento and linea_evento != linea_filtro:
+                    continue
+
+                yield _evento_sse(evento['tipo'], evento['datos'])
+        finally:
+            canal_horas.desuscribir(cola)
+
+    response = StreamingHttpResponse(eventos(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
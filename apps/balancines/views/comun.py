@@ -0,0 +1,7 @@
+# apps/balancines/views/comun.py
+
+from django.conf import settings
+
+# Fragmentos {% cache %} de filtros y listas: la clave lleva la versión de
+# las tablas de las que salen, así que el tiempo solo limita la memoria
+TIEMPO_CACHE_FRAGMENTOS = getattr(settings, 'TIEMPO_CACHE_FRAGMENTOS', 60 * 60 * 24)
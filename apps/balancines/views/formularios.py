@@ -0,0 +1,322 @@
+# ============================================================
+# BALANCINES - VISTAS: FORMULARIOS DE CONTROL (OH)
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Q, Sum, Count, Max
+from django.http import JsonResponse
+from django.utils import timezone
+
+# ========== PYTHON STANDARD LIBRARY ==========
+from functools import partial
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    Linea, BalancinIndividual, RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+    FormularioReacondicionamiento, ItemFormularioReacondicionamiento,
+    ConfiguracionRepuestosPorTipo, TecnicoFormulario, Usuario,
+)
+
+# ========== LOCALES ==========
+from ..auditoria import auditar
+from ..services.formulario_control import ServicioFormularioControl
+from ..paginacion import limitar_por_pagina, paginar_keyset
+from .. import selectors
+
+
+# ============================================================
+# FORMULARIOS DE CONTROL (OH)
+# ============================================================
+
+def generar_codigo_formulario(tipo):
+    """Genera un código de formulario automático Ej: TRM-FCRB-4T-501C-001"""
+    tipo_limpio = tipo.replace('/', '-')
+    
+    ultimo = FormularioReacondicionamiento.objects.filter(
+        codigo_formulario__startswith=f"TRM-FCRB-{tipo_limpio}-"
+    ).aggregate(Max('codigo_formulario'))['codigo_formulario__max']
+    
+    if ultimo:
+        try:
+            numero = int(ultimo.split('-')[-1]) + 1
+        except:
+            numero = 1
+    else:
+        numero = 1
+    
+    return f"TRM-FCRB-{tipo_limpio}-{numero:03d}"
+
+
+@login_required
+@auditar()
+def crear_formulario_control(request, codigo):
+    """Vista para crear formulario de control de reacondicionamiento CON PROTECCIÓN"""
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    ultimo_oh = selectors.ultimo_oh(balancin)
+    tipo_codigo = balancin.tipo_balancin_codigo
+    
+    # API para cargar torres
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest' and request.GET.get('linea'):
+        tipo_balancin = request.GET.get('tipo')
+        torres = selectors.torres_con_tipo(request.GET.get('linea'), tipo_balancin) or []
+        
+        torres_data = []
+        for t in torres:
+            if t.tipo_balancin_ascendente == tipo_balancin:
+                torres_data.append({
+                    'id': f"{t.id}_ASC",
+                    'numero': t.numero_torre,
+                    'sentido': 'ASCENDENTE',
+                    'texto': f"Torre {t.numero_torre} / ASC"
+                })
+            if t.tipo_balancin_descendente == tipo_balancin:
+                torres_data.append({
+                    'id': f"{t.id}_DESC",
+                    'numero': t.numero_torre,
+                    'sentido': 'DESCENDENTE',
+                    'texto': f"Torre {t.numero_torre} / DESC"
+                })
+        return JsonResponse({'torres': torres_data})
+    
+    # Procesar POST con protección de concurrencia
+    if request.method == 'POST':
+        try:
+            with transaction.atomic():
+                codigo_formulario = generar_codigo_formulario(tipo_codigo)
+                
+                # Crear el formulario
+                formulario = FormularioReacondicionamiento.objects.create(
+                    codigo_formulario=codigo_formulario,
+                    tipo=tipo_codigo,
+                    balancin=balancin,
+                    historial_oh=ultimo_oh,
+                    fecha=request.POST.get('fecha', timezone.now().date()),
+                    horas_funcionamiento=request.POST.get('horas_funcionamiento', 0),
+                    linea_inicial=request.POST.get('linea_inicial', ''),
+                    torre_inicial=request.POST.get('torre_inicial', ''),
+                    linea_final=request.POST.get('linea_final', ''),
+                    torre_final=request.POST.get('torre_final', ''),
+                    sentido_final=request.POST.get('sentido_final', ''),
+                    control_particulas=request.POST.get('control_particulas') == 'on',
+                    codigo_informe=request.POST.get('codigo_informe', ''),
+                    torque_verificado=request.POST.get('torque_verificado') == 'on',
+                    limpieza_verificada=request.POST.get('limpieza_verificada') == 'on',
+                    continuidad_verificada=request.POST.get('continuidad_verificada') == 'on',
+                    realizado_por_analisis_id=request.POST.get('realizado_analisis'),
+                    aprobado_por_id=request.POST.get('jefe_id'),
+                    usuario_creacion=request.user if request.user.is_authenticated else None
+                )
+                
+                # Procesar técnicos
+                total_filas = int(request.POST.get('total_filas_realizado', 0))
+                for i in range(total_filas):
+                    usuario_id = request.POST.get(f'usuario_realizado_{i}')
+                    if usuario_id:
+                        firma = request.POST.get(f'firma_realizado_{i}', '')
+                        TecnicoFormulario.objects.create(
+                            formulario=formulario,
+                            usuario_id=usuario_id,
+                            firma=firma
+                        )
+                
+                # 🔑 RECOLECTAR TODOS LOS REPUESTOS A DESCONTAR
+                repuestos_a_descontar = []
+                
+                # Repuestos configurados (radio SI/NO)
+                for key, value in request.POST.items():
+                    if key.startswith('recambio_') and value == 'SI':
+                        item_id = key.replace('recambio_', '')
+                        cantidad = int(request.POST.get(f'cantidad_{item_id}', 0))
+                        if cantidad > 0:
+                            repuestos_a_descontar.append({
+                                'id': item_id,
+                                'cantidad': cantidad,
+                                'tipo': 'configurado'
+                            })
+                
+                # Repuestos de "otras piezas reemplazadas"
+                total_filas_otros = int(request.POST.get('total_filas_otros', 0))
+                for i in range(total_filas_otros):
+                    item_id = request.POST.get(f'otro_id_{i}', '')
+                    if item_id:
+                        cantidad = int(request.POST.get(f'otro_cant_{i}', 0))
+                        origen = request.POST.get(f'otro_origen_{i}', 'balancin')
+                        if cantidad > 0:
+                            repuestos_a_descontar.append({
+                                'id': item_id,
+                                'cantidad': cantidad,
+                                'tipo': origen
+                            })
+                
+                # 🔑 ORDENAR para evitar deadlocks
+                repuestos_a_descontar.sort(key=lambda x: x['id'])
+                
+                # 🔒 PROCESAR CADA REPUESTO CON BLOQUEO
+                for item in repuestos_a_descontar:
+                    if item['tipo'] in ['configurado', 'balancin']:
+                        # Repuesto de balancín
+                        config = ConfiguracionRepuestosPorTipo.objects.select_related('repuesto').get(id=item['id'])
+                        if not config.repuesto:
+                            continue
+                        
+                        # 🔒 Bloquear
+                        repuesto_bloqueado = RepuestoBalancin.objects.select_for_update().get(item=config.repuesto.item)
+                        
+                        if repuesto_bloqueado.cantidad < item['cantidad']:
+                            raise ValueError(f'Stock insuficiente para {repuesto_bloqueado.item}')
+                        
+                        stock_antes = repuesto_bloqueado.cantidad
+                        repuesto_bloqueado.cantidad -= item['cantidad']
+                        repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                        repuesto_bloqueado.fecha_ultima_salida = timezone.now()
+                        repuesto_bloqueado.save()
+                        
+                        # Registrar historial
+                        HistorialRepuesto.objects.create(
+                            repuesto=repuesto_bloqueado,
+                            tipo_movimiento='salida',
+                            cantidad=-item['cantidad'],
+                            stock_restante=repuesto_bloqueado.cantidad,
+                            observaciones=f"Salida por formulario {codigo_formulario}"
+                        )
+                        
+                        # Registrar item del formulario
+                        ItemFormularioReacondicionamiento.objects.create(
+                            formulario=formulario,
+                            configuracion=config,
+                            repuesto=repuesto_bloqueado,
+                            id_original=config.id_original,
+                            descripcion=config.descripcion,
+                            cantidad_requerida=config.cantidad_por_balancin,
+                            cantidad_usada=item['cantidad'],
+                            fue_reemplazado=True,
+                            stock_antes=stock_antes,
+                            stock_despues=repuesto_bloqueado.cantidad
+                        )
+                        
+                    elif item['tipo'] == 'adicional':
+                        # Repuesto adicional
+                        # 🔒 Bloquear
+                        repuesto_bloqueado = RepuestoAdicional.objects.select_for_update().get(item=item['id'])
+                        
+                        if repuesto_bloqueado.cantidad < item['cantidad']:
+                            raise ValueError(f'Stock insuficiente para {repuesto_bloqueado.item}')
+                        
+                        stock_antes = repuesto_bloqueado.cantidad
+                        repuesto_bloqueado.cantidad -= item['cantidad']
+                        repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                        repuesto_bloqueado.fecha_ultima_salida = timezone.now()
+                        repuesto_bloqueado.save()
+                        
+                        # Registrar historial
+                        HistorialAdicional.objects.create(
+                            repuesto=repuesto_bloqueado,
+                            tipo_movimiento='salida',
+                            cantidad=-item['cantidad'],
+                            stock_restante=repuesto_bloqueado.cantidad,
+                            observaciones=f"Salida por formulario {codigo_formulario}",
+                            usuario=request.user
+                        )
+                
+                messages.success(request, f'✅ Formulario {codigo_formulario} guardado correctamente.')
+                return redirect('dashboard_oh_nuevo')
+                
+        except ValueError as e:
+            messages.error(request, f'❌ {str(e)}')
+        except Exception as e:
+            messages.error(request, f'❌ Error al guardar: {str(e)}')
+    
+    # GET - mostrar formulario
+    lineas_disponibles = Linea.objects.filter(
+        Q(torres__tipo_balancin_ascendente=tipo_codigo) |
+        Q(torres__tipo_balancin_descendente=tipo_codigo)
+    ).distinct().order_by('nombre')
+    
+    usuarios_tecnicos = Usuario.objects.filter(rol__in=['tecnico', 'supervisor']).order_by('nombre')
+    jefes = Usuario.objects.filter(rol='jefe').order_by('nombre')
+    
+    torre = balancin.torre
+    linea_actual = torre.linea.nombre if torre and torre.linea else 'N/A'
+    torre_actual = torre.numero_torre if torre else 'N/A'
+    horas_actuales = ultimo_oh.horas_operacion if ultimo_oh else 0
+    
+    context = {
+        'balancin': balancin,
+        'tipo_balancin': tipo_codigo,
+        'linea_actual': linea_actual,
+        'torre_actual': torre_actual,
+        'sentido': balancin.sentido,
+        'horas_actuales': horas_actuales,
+        'ultimo_oh': ultimo_oh,
+        'lineas_disponibles': lineas_disponibles,
+        'usuarios_tecnicos': usuarios_tecnicos,
+        'jefes': jefes,
+        # Partes por tipo: la plantilla las guarda en cache, los repuestos
+        # solo se consultan si su fragmento no está en cache
+        'layout': ServicioFormularioControl.layout(tipo_codigo),
+        'repuestos_agrupados': partial(ServicioFormularioControl.repuestos_agrupados, tipo_codigo),
+        'version_repuestos': ServicioFormularioControl.version_repuestos(),
+        'tiempo_cache': ServicioFormularioControl.TIEMPO_CACHE_FRAGMENTOS,
+    }
+    
+    return render(request, 'balancines/formularios/formulario_control.html', context)
+
+
+@login_required
+def lista_formularios(request):
+    """Lista todos los formularios de reacondicionamiento guardados"""
+    formularios = FormularioReacondicionamiento.objects.all().select_related(
+        'balancin', 'balancin__torre__linea', 'balancin__torre__seccion',
+        'historial_oh', 'realizado_por_analisis', 'realizado_por_recambio', 
+        'aprobado_por'
+    ).prefetch_related('tecnicos__usuario')
+    
+    total_formularios = formularios.count()
+    
+    # Página por cursor; los conteos de items se anotan en la misma consulta
+    pagina = paginar_keyset(
+        formularios.annotate(
+            total_items=Count('items'),
+            items_usados=Count('items', filter=Q(items__fue_reemplazado=True)),
+        ),
+        ('-fecha_creacion', '-codigo_formulario'),
+        cursor=request.GET.get('cursor'),
+        por_pagina=limitar_por_pagina(request.GET.get('por_pagina'), defecto=25),
+    ).con_urls(request)
+    total_repuestos_usados = ItemFormularioReacondicionamiento.objects.filter(
+        fue_reemplazado=True
+    ).aggregate(total=Sum('cantidad_usada'))['total'] or 0
+    
+    context = {
+        'formularios': pagina,
+        'pagina': pagina,
+        'total_formularios': total_formularios,
+        'total_repuestos_usados': total_repuestos_usados,
+    }
+    return render(request, 'balancines/lista_formularios.html', context)
+
+
+@login_required
+def detalle_formulario(request, codigo):
+    """Detalle de un formulario específico"""
+    formulario = get_object_or_404(
+        FormularioReacondicionamiento.objects.select_related(
+            'balancin', 'historial_oh', 'realizado_por_analisis', 
+            'realizado_por_recambio', 'aprobado_por', 'usuario_creacion'
+        ).prefetch_related('items__repuesto'),
+        codigo_formulario=codigo
+    )
+    
+    items_usados = formulario.items.filter(fue_reemplazado=True)
+    total_items = formulario.items.count()
+    
+    context = {
+        'formulario': formulario,
+        'items_usados': items_usados,
+        'total_items': total_items,
+    }
+    return render(request, 'balancines/detalle_formulario.html', context)
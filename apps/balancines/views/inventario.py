@@ -0,0 +1,897 @@
+# ============================================================
+# BALANCINES - VISTAS: INVENTARIO
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.http import HttpResponse
+from django.utils import timezone
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    Linea, Torre,
+    TipoBalancin, BalancinIndividual, BalancinOH, HistorialBalancin,
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+    FormularioReacondicionamiento,
+)
+
+# ========== FORMULARIOS LOCALES ==========
+from ..forms import BalancinIndividualForm, TipoBalancinForm
+
+# ========== LOCALES ==========
+from ..auditoria import auditar
+from ..routers import solo_lectura
+from ..services.archivo import ServicioArchivo
+from .. import selectors
+
+
+# ============================================================
+# VISTAS DE INVENTARIO
+# ============================================================
+
+@login_required
+def inventario_principal(request):
+    """Vista principal del inventario."""
+    context = {'title': 'Inventario Principal', 'user': request.user}
+    return render(request, 'balancines/inventario_principal.html', context)
+
+
+@login_required
+def lista_tipos_balancin(request):
+    """Lista de tipos/modelos de balancín."""
+    tipos = TipoBalancin.objects.all().order_by('tipo', 'codigo')
+    total_tipos = tipos.count()
+    total_cantidad = tipos.aggregate(total=Sum('cantidad_total'))['total'] or 0
+    compresion_total = tipos.filter(tipo='compresion').aggregate(total=Sum('cantidad_total'))['total'] or 0
+    soporte_total = tipos.filter(tipo='soporte').aggregate(total=Sum('cantidad_total'))['total'] or 0
+    
+    context = {
+        'title': 'Tipos de Balancín',
+        'tipos': tipos,
+        'total_tipos': total_tipos,
+        'total_cantidad': total_cantidad,
+        'compresion_total': compresion_total,
+        'soporte_total': soporte_total,
+    }
+    return render(request, 'balancines/tipos_balancin.html', context)
+
+
+@login_required
+def detalle_tipo_balancin(request, codigo):
+    """Detalle de un tipo de balancín con sus balancines individuales en torres."""
+    tipo = get_object_or_404(TipoBalancin, codigo=codigo)
+    
+    balancines = BalancinIndividual.objects.filter(
+        Q(torre__tipo_balancin_ascendente=codigo) |
+        Q(torre__tipo_balancin_descendente=codigo)
+    ).select_related(
+        'torre', 
+        'torre__linea', 
+        'torre__seccion'
+    ).prefetch_related(
+        'historial_oh_completo'
+    ).order_by('torre__linea_id', 'torre__numero_torre')
+    
+    balancines_asc = [b for b in balancines if b.sentido == 'ASCENDENTE']
+    balancines_desc = [b for b in balancines if b.sentido == 'DESCENDENTE']
+    
+    torres_ascendentes = Torre.objects.filter(
+        tipo_balancin_ascendente=codigo
+    ).select_related('linea', 'seccion')
+    
+    torres_descendentes = Torre.objects.filter(
+        tipo_balancin_descendente=codigo
+    ).select_related('linea', 'seccion')
+    
+    torres_con_ascendente = set(
+        BalancinIndividual.objects.filter(
+            torre__in=torres_ascendentes,
+            sentido='ASCENDENTE'
+        ).values_list('torre_id', flat=True)
+    )
+    
+    torres_con_descendente = set(
+        BalancinIndividual.objects.filter(
+            torre__in=torres_descendentes,
+            sentido='DESCENDENTE'
+        ).values_list('torre_id', flat=True)
+    )
+    
+    context = {
+        'title': f'Tipo: {codigo}',
+        'tipo': tipo,
+        'balancines': balancines,
+        'balancines_asc': balancines_asc,
+        'balancines_desc': balancines_desc,
+        'total_balancines': balancines.count(),
+        'torres_ascendentes': torres_ascendentes,
+        'torres_descendentes': torres_descendentes,
+        'torres_con_ascendente': torres_con_ascendente,
+        'torres_con_descendente': torres_con_descendente,
+    }
+    return render(request, 'balancines/detalle_tipo_balancin.html', context)
+
+
+@login_required
+def lista_balancines_individuales(request):
+    """Lista de balancines individuales instalados en torres."""
+    balancines = BalancinIndividual.objects.all().select_related(
+        'torre', 'torre__linea', 'torre__seccion'
+    ).prefetch_related('ordenes_horas').order_by('torre__linea_id', 'torre__numero_torre')
+    
+    sentido = request.GET.get('sentido', '')
+    linea_id = request.GET.get('linea', '')
+    
+    if sentido:
+        balancines = balancines.filter(sentido=sentido)
+    if linea_id:
+        balancines = balancines.filter(torre__linea_id=linea_id)
+    
+    total_balancines = balancines.count()
+    lineas = Linea.objects.all()
+    
+    context = {
+        'title': 'Balancines Individuales',
+        'balancines': balancines,
+        'total_balancines': total_balancines,
+        'lineas': lineas,
+        'sentido_filtro': sentido,
+        'linea_filtro': linea_id,
+    }
+    return render(request, 'balancines/balancines_individuales.html', context)
+
+
+@login_required
+def detalle_balancin(request, codigo):
+    """Detalle de un balancín individual."""
+    balancin = get_object_or_404(
+        BalancinIndividual.objects.select_related(
+            'torre', 'torre__linea', 'torre__seccion'
+        ),
+        codigo=codigo
+    )
+    # Si el historial vivo no llega a 10 movimientos, se completa con los archivados
+    historial = ServicioArchivo.completar(
+        balancin.historial.all().order_by('-fecha_cambio')[:10],
+        'balancines.HistorialBalancin', balancin, 10,
+    )
+    ordenes_horas = balancin.ordenes_horas.all().order_by('-numero_oh')[:5]
+    
+    formularios = FormularioReacondicionamiento.objects.filter(
+        balancin=balancin
+    ).order_by('-fecha')[:5]
+    
+    context = {
+        'title': f'Balancín {codigo}',
+        'balancin': balancin,
+        'historial': historial,
+        'ordenes_horas': ordenes_horas,
+        'formularios': formularios,
+        'tipo_codigo': balancin.tipo_balancin_codigo,
+    }
+    return render(request, 'balancines/detalle_balancin.html', context)
+
+
+# ============================================================
+# VISTAS PARA AGREGAR Y EDITAR
+# ============================================================
+
+@login_required
+@auditar()
+def agregar_tipo_balancin(request):
+    """Vista para agregar un nuevo tipo de balancín."""
+    if request.method == 'POST':
+        form = TipoBalancinForm(request.POST)
+        if form.is_valid():
+            form.save()
+            messages.success(request, f'Tipo de balancín {form.cleaned_data["codigo"]} agregado correctamente.')
+            return redirect('lista_tipos_balancin')
+    else:
+        form = TipoBalancinForm()
+    
+    context = {'title': 'Agregar Tipo de Balancín', 'form': form}
+    return render(request, 'balancines/agregar_tipo_balancin.html', context)
+
+
+@login_required
+@auditar()
+def agregar_balancin_individual(request):
+    """Vista para agregar un balancín individual en una torre."""
+    tipo_predefinido = request.GET.get('tipo', '')
+    torre_id = request.GET.get('torre', '')
+    sentido_predefinido = request.GET.get('sentido', 'ASCENDENTE')
+    
+    torre_seleccionada = None
+    if torre_id:
+        try:
+            torre_seleccionada = Torre.objects.select_related('linea', 'seccion').get(id=torre_id)
+        except Torre.DoesNotExist:
+            pass
+    
+    if request.method == 'POST':
+        form = BalancinIndividualForm(request.POST)
+        if form.is_valid():
+            balancin = form.save(commit=False)
+            
+            if torre_seleccionada:
+                balancin.torre = torre_seleccionada
+            
+            balancin.save()
+            
+            try:
+                HistorialBalancin.objects.create(
+                    balancin=balancin,
+                    estado_anterior='NUEVO',
+                    estado_nuevo='INSTALADO',
+                    accion='INSTALACION',
+                    observaciones=f'Balancín instalado en {balancin.torre}',
+                    usuario=request.user
+                )
+            except Exception as e:
+                print(f"Error al crear historial: {e}")
+            
+            messages.success(request, f'✅ Balancín {balancin.codigo} instalado correctamente en {balancin.torre}.')
+            
+            tipo_codigo = balancin.tipo_balancin_codigo
+            if tipo_codigo:
+                return redirect('detalle_tipo_balancin', codigo=tipo_codigo)
+            else:
+                return redirect('lista_tipos_balancin')
+        else:
+            messages.error(request, '❌ Por favor corrige los errores del formulario.')
+            for field, errors in form.errors.items():
+                for error in errors:
+                    messages.error(request, f'{field}: {error}')
+    else:
+        initial = {
+            'sentido': sentido_predefinido,
+            'rango_horas_cambio_oh': 30000
+        }
+        if torre_seleccionada:
+            initial['torre'] = torre_seleccionada
+        
+        form = BalancinIndividualForm(initial=initial)
+    
+    context = {
+        'title': 'Instalar Balancín Individual',
+        'form': form,
+        'tipo_predefinido': tipo_predefinido,
+        'torre_seleccionada': torre_seleccionada,
+        'sentido_predefinido': sentido_predefinido,
+    }
+    return render(request, 'balancines/agregar_balancin_individual.html', context)
+
+
+@login_required
+@auditar()
+def editar_balancin_individual(request, codigo):
+    """Vista para editar un balancín individual."""
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    
+    if request.method == 'POST':
+        form = BalancinIndividualForm(request.POST, instance=balancin)
+        if form.is_valid():
+            balancin_editado = form.save()
+            messages.success(request, f'✅ Balancín {balancin_editado.codigo} actualizado correctamente.')
+            
+            tipo_codigo = balancin_editado.tipo_balancin_codigo
+            if tipo_codigo:
+                return redirect('detalle_tipo_balancin', codigo=tipo_codigo)
+            else:
+                return redirect('lista_tipos_balancin')
+        else:
+            messages.error(request, '❌ Por favor corrige los errores del formulario.')
+    else:
+        form = BalancinIndividualForm(instance=balancin)
+    
+    context = {
+        'title': f'Editar Balancín - {balancin.codigo}',
+        'form': form,
+        'balancin': balancin,
+    }
+    return render(request, 'balancines/editar_balancin_individual.html', context)
+
+
+@login_required
+@auditar()
+def eliminar_balancin_individual(request, codigo):
+    """Vista para eliminar un balancín individual."""
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    tipo_codigo = balancin.tipo_balancin_codigo
+    
+    if request.method == 'POST':
+        balancin.delete()
+        messages.success(request, f'Balancín {codigo} eliminado correctamente.')
+        return redirect('detalle_tipo_balancin', codigo=tipo_codigo)
+    
+    context = {
+        'title': f'Eliminar Balancín: {codigo}',
+        'balancin': balancin
+    }
+    return render(request, 'balancines/confirmar_eliminacion.html', context)
+
+
+# ============================================================
+# VISTAS DE REPUESTOS CON PROTECCIÓN DE CONCURRENCIA
+# ============================================================
+
+@login_required
+def lista_repuestos_balancin(request):
+    """Lista de repuestos para balancines."""
+    stock = request.GET.get('stock', '')
+    query = request.GET.get('q', '')
+    repuestos = selectors.filtrar_repuestos(RepuestoBalancin, query, stock)
+
+    total_repuestos = repuestos.count()
+    total_cantidad = repuestos.aggregate(total=Sum('cantidad'))['total'] or 0
+
+    context = {
+        'title': 'Repuestos para Balancines',
+        'repuestos': repuestos,
+        'total_repuestos': total_repuestos,
+        'total_cantidad': total_cantidad,
+        'repuestos_bajo_stock': selectors.repuestos_bajo_stock(RepuestoBalancin),
+        'repuestos_sin_stock': selectors.repuestos_sin_stock(RepuestoBalancin),
+        'stock_filtro': stock,
+        'query': query,
+        'ultimas_actividades': selectors.ultimas_actividades_repuestos(),
+    }
+    return render(request, 'balancines/repuestos_balancin.html', context)
+
+
+@login_required
+def lista_repuestos_adicionales(request):
+    """Lista de repuestos adicionales."""
+    stock = request.GET.get('stock', '')
+    query = request.GET.get('q', '')
+    repuestos = selectors.filtrar_repuestos(RepuestoAdicional, query, stock)
+
+    total_repuestos = repuestos.count()
+    total_cantidad = repuestos.aggregate(total=Sum('cantidad'))['total'] or 0
+
+    context = {
+        'title': 'Repuestos Adicionales',
+        'repuestos': repuestos,
+        'total_repuestos': total_repuestos,
+        'total_cantidad': total_cantidad,
+        'repuestos_bajo_stock': selectors.repuestos_bajo_stock(RepuestoAdicional),
+        'repuestos_sin_stock': selectors.repuestos_sin_stock(RepuestoAdicional),
+        'stock_filtro': stock,
+        'query': query,
+        'ultimas_actividades': selectors.ultimas_actividades_adicionales(),
+    }
+    return render(request, 'balancines/repuestos_adicionales.html', context)
+
+
+@login_required
+@auditar()
+def agregar_repuesto_balancin(request):
+    """Vista para agregar un repuesto para balancín."""
+    if request.method == 'POST':
+        item = request.POST.get('item', '').strip()
+        descripcion = request.POST.get('descripcion', '').strip()
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        ubicacion = request.POST.get('ubicacion', '').strip()
+        observaciones = request.POST.get('observaciones', '')
+        
+        if not item:
+            messages.error(request, 'El código del item es requerido.')
+        elif RepuestoBalancin.objects.filter(item=item).exists():
+            messages.error(request, f'El item {item} ya existe.')
+        else:
+            RepuestoBalancin.objects.create(
+                item=item.upper(),
+                descripcion=descripcion,
+                cantidad=cantidad,
+                ubicacion=ubicacion,
+                observaciones=observaciones
+            )
+            messages.success(request, f'Repuesto {item} agregado correctamente.')
+            return redirect('lista_repuestos_balancin')
+    
+    context = {'title': 'Agregar Repuesto para Balancín'}
+    return render(request, 'balancines/form_repuesto_balancin.html', context)
+
+
+@login_required
+@auditar()
+def agregar_repuesto_adicional(request):
+    """Vista para agregar un repuesto adicional."""
+    if request.method == 'POST':
+        item = request.POST.get('item', '').strip()
+        descripcion = request.POST.get('descripcion', '').strip()
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        ubicacion = request.POST.get('ubicacion', '').strip()
+        observaciones = request.POST.get('observaciones', '')
+        
+        if not item:
+            messages.error(request, 'El código del item es requerido.')
+        elif RepuestoAdicional.objects.filter(item=item).exists():
+            messages.error(request, f'El item {item} ya existe.')
+        else:
+            repuesto = RepuestoAdicional.objects.create(
+                item=item.upper(),
+                descripcion=descripcion,
+                cantidad=cantidad,
+                ubicacion=ubicacion,
+                observaciones=observaciones
+            )
+            
+            try:
+                HistorialAdicional.objects.create(
+                    repuesto=repuesto,
+                    tipo_movimiento='creacion',
+                    cantidad=cantidad,
+                    stock_restante=cantidad,
+                    observaciones='Creación inicial del repuesto',
+                    usuario=request.user
+                )
+            except Exception as e:
+                print(f"Error al registrar creación: {e}")
+            
+            messages.success(request, f'Repuesto adicional {item} agregado correctamente.')
+            return redirect('lista_repuestos_adicionales')
+    
+    context = {'title': 'Agregar Repuesto Adicional'}
+    return render(request, 'balancines/form_repuesto_adicional.html', context)
+
+
+# ============================================================
+# VISTAS PARA MANEJO DE STOCK CON PROTECCIÓN DE CONCURRENCIA
+# ============================================================
+
+@login_required
+@auditar()
+def entrada_stock_adicional(request, item):
+    """Registrar entrada de stock para repuesto adicional CON PROTECCIÓN"""
+    repuesto = get_object_or_404(RepuestoAdicional, item=item)
+    
+    if request.method == 'POST':
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        observaciones = request.POST.get('observaciones', '').strip()
+        
+        if cantidad <= 0:
+            messages.error(request, '❌ La cantidad debe ser mayor a 0.')
+            return redirect('lista_repuestos_adicionales')
+        
+        try:
+            with transaction.atomic():
+                # 🔒 BLOQUEAR LA FILA
+                repuesto_bloqueado = RepuestoAdicional.objects.select_for_update().get(item=item)
+                
+                stock_anterior = repuesto_bloqueado.cantidad
+                repuesto_bloqueado.cantidad += cantidad
+                repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                repuesto_bloqueado.save()
+                
+                # Registrar en historial
+                HistorialAdicional.objects.create(
+                    repuesto=repuesto_bloqueado,
+                    tipo_movimiento='entrada',
+                    cantidad=cantidad,
+                    stock_restante=repuesto_bloqueado.cantidad,
+                    observaciones=f'Entrada de {cantidad} unidades. {observaciones}',
+                    usuario=request.user
+                )
+                
+                messages.success(request, 
+                    f'✅ Entrada registrada: {stock_anterior} → {repuesto_bloqueado.cantidad} unidades (+{cantidad})')
+                
+        except Exception as e:
+            messages.error(request, f'❌ Error al procesar: {str(e)}')
+        
+        return redirect('lista_repuestos_adicionales')
+    
+    context = {
+        'title': f'Entrada de Stock: {item}',
+        'repuesto': repuesto,
+    }
+    return render(request, 'balancines/entrada_stock_adicional.html', context)
+
+
+@login_required
+@auditar()
+def salida_stock_adicional(request, item):
+    """Registrar salida de stock para repuesto adicional CON PROTECCIÓN"""
+    repuesto = get_object_or_404(RepuestoAdicional, item=item)
+    
+    if request.method == 'POST':
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        observaciones = request.POST.get('observaciones', '').strip()
+        
+        if cantidad <= 0:
+            messages.error(request, '❌ La cantidad debe ser mayor a 0.')
+            return redirect('lista_repuestos_adicionales')
+        
+        try:
+            with transaction.atomic():
+                # 🔒 BLOQUEAR LA FILA
+                repuesto_bloqueado = RepuestoAdicional.objects.select_for_update().get(item=item)
+                
+                if repuesto_bloqueado.cantidad < cantidad:
+                    messages.error(request, f'❌ Stock insuficiente. Disponible: {repuesto_bloqueado.cantidad}')
+                    return redirect('lista_repuestos_adicionales')
+                
+                stock_anterior = repuesto_bloqueado.cantidad
+                repuesto_bloqueado.cantidad -= cantidad
+                repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                repuesto_bloqueado.fecha_ultima_salida = timezone.now()
+                repuesto_bloqueado.save()
+                
+                # Registrar en historial
+                HistorialAdicional.objects.create(
+                    repuesto=repuesto_bloqueado,
+                    tipo_movimiento='salida',
+                    cantidad=cantidad,
+                    stock_restante=repuesto_bloqueado.cantidad,
+                    observaciones=f'Salida de {cantidad} unidades. {observaciones}',
+                    usuario=request.user
+                )
+                
+                messages.success(request, 
+                    f'✅ Salida registrada: {stock_anterior} → {repuesto_bloqueado.cantidad} unidades (-{cantidad})')
+                
+        except Exception as e:
+            messages.error(request, f'❌ Error al procesar: {str(e)}')
+        
+        return redirect('lista_repuestos_adicionales')
+    
+    context = {
+        'title': f'Salida de Stock: {item}',
+        'repuesto': repuesto,
+    }
+    return render(request, 'balancines/salida_stock_adicional.html', context)
+
+
+@login_required
+@auditar()
+def entrada_stock_balancin(request, item):
+    """Registrar entrada de stock para repuesto de balancín CON PROTECCIÓN"""
+    repuesto = get_object_or_404(RepuestoBalancin, item=item)
+    
+    if request.method == 'POST':
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        observaciones = request.POST.get('observaciones', '').strip()
+        
+        if cantidad <= 0:
+            messages.error(request, '❌ La cantidad debe ser mayor a 0.')
+            return redirect('lista_repuestos_balancin')
+        
+        try:
+            with transaction.atomic():
+                # 🔒 BLOQUEAR LA FILA
+                repuesto_bloqueado = RepuestoBalancin.objects.select_for_update().get(item=item)
+                
+                stock_anterior = repuesto_bloqueado.cantidad
+                repuesto_bloqueado.cantidad += cantidad
+                repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                repuesto_bloqueado.save()
+                
+                # Registrar en historial
+                HistorialRepuesto.objects.create(
+                    repuesto=repuesto_bloqueado,
+                    tipo_movimiento='entrada',
+                    cantidad=cantidad,
+                    stock_restante=repuesto_bloqueado.cantidad,
+                    observaciones=f'Entrada de {cantidad} unidades. {observaciones}'
+                )
+                
+                messages.success(request, 
+                    f'✅ Entrada registrada: {stock_anterior} → {repuesto_bloqueado.cantidad} unidades (+{cantidad})')
+                
+        except Exception as e:
+            messages.error(request, f'❌ Error al procesar: {str(e)}')
+        
+        return redirect('lista_repuestos_balancin')
+    
+    context = {
+        'title': f'Entrada de Stock: {item}',
+        'repuesto': repuesto,
+    }
+    return render(request, 'balancines/entrada_stock_balancin.html', context)
+
+
+@login_required
+@auditar()
+def salida_stock_balancin(request, item):
+    """Registrar salida de stock para repuesto de balancín CON PROTECCIÓN"""
+    repuesto = get_object_or_404(RepuestoBalancin, item=item)
+    
+    if request.method == 'POST':
+        cantidad = int(request.POST.get('cantidad', 0) or 0)
+        observaciones = request.POST.get('observaciones', '').strip()
+        
+        if cantidad <= 0:
+            messages.error(request, '❌ La cantidad debe ser mayor a 0.')
+            return redirect('lista_repuestos_balancin')
+        
+        try:
+            with transaction.atomic():
+                # 🔒 BLOQUEAR LA FILA
+                repuesto_bloqueado = RepuestoBalancin.objects.select_for_update().get(item=item)
+                
+                if repuesto_bloqueado.cantidad < cantidad:
+                    messages.error(request, f'❌ Stock insuficiente. Disponible: {repuesto_bloqueado.cantidad}')
+                    return redirect('lista_repuestos_balancin')
+                
+                stock_anterior = repuesto_bloqueado.cantidad
+                repuesto_bloqueado.cantidad -= cantidad
+                repuesto_bloqueado.fecha_ultimo_movimiento = timezone.now()
+                repuesto_bloqueado.fecha_ultima_salida = timezone.now()
+                repuesto_bloqueado.save()
+                
+                # Registrar en historial
+                HistorialRepuesto.objects.create(
+                    repuesto=repuesto_bloqueado,
+                    tipo_movimiento='salida',
+                    cantidad=cantidad,
+                    stock_restante=repuesto_bloqueado.cantidad,
+                    observaciones=f'Salida de {cantidad} unidades. {observaciones}'
+                )
+                
+                messages.success(request, 
+                    f'✅ Salida registrada: {stock_anterior} → {repuesto_bloqueado.cantidad} unidades (-{cantidad})')
+                
+        except Exception as e:
+            messages.error(request, f'❌ Error al procesar: {str(e)}')
+        
+        return redirect('lista_repuestos_balancin')
+    
+    context = {
+        'title': f'Salida de Stock: {item}',
+        'repuesto': repuesto,
+    }
+    return render(request, 'balancines/salida_stock_balancin.html', context)
+
+
+# ============================================================
+# DASHBOARD Y BÚSQUEDA
+# ============================================================
+
+@login_required
+@solo_lectura
+def dashboard_inventario(request):
+    """Dashboard con estadísticas del inventario."""
+    
+    conteos = selectors.conteos_inventario()
+    total_repuestos = conteos['total_repuestos']
+    
+    repuestos_bajo_stock = list(selectors.repuestos_bajo_stock(RepuestoBalancin)) + \
+                          list(selectors.repuestos_bajo_stock(RepuestoAdicional))
+    repuestos_sin_stock = list(selectors.repuestos_sin_stock(RepuestoBalancin)) + \
+                         list(selectors.repuestos_sin_stock(RepuestoAdicional))
+    repuestos_normal = total_repuestos - len(repuestos_bajo_stock) - len(repuestos_sin_stock)
+    
+    balancines_criticos = 0
+    balancines_alerta = 0
+    balancines_normal = 0
+    balancines_sin_oh = 0
+    
+    # Horas de la última OH de cada balancín en la misma consulta (antes, una por balancín)
+    ultima_oh = BalancinOH.objects.filter(
+        balancin=OuterRef('pk')
+    ).order_by('-numero_oh').values('horas_operacion')[:1]
+    balancines = BalancinIndividual.objects.annotate(
+        horas_ultima_oh=Subquery(ultima_oh)
+    ).values_list('rango_horas_cambio_oh', 'horas_ultima_oh')
+
+    for rango, horas_ultima_oh in balancines:
+        if horas_ultima_oh is None:
+            balancines_sin_oh += 1
+        else:
+            porcentaje = (horas_ultima_oh / rango) * 100
+            if horas_ultima_oh >= rango:
+                balancines_criticos += 1
+            elif porcentaje >= 80:
+                balancines_alerta += 1
+            else:
+                balancines_normal += 1
+    
+    total_con_oh = balancines_criticos + balancines_alerta + balancines_normal
+    porcentaje_normal = (balancines_normal / total_con_oh * 100) if total_con_oh > 0 else 0
+    porcentaje_alerta = (balancines_alerta / total_con_oh * 100) if total_con_oh > 0 else 0
+    porcentaje_critico = (balancines_criticos / total_con_oh * 100) if total_con_oh > 0 else 0
+    
+    context = {
+        'title': 'Dashboard de Inventario',
+        **conteos,
+        'repuestos_bajo_stock': repuestos_bajo_stock[:10],
+        'repuestos_sin_stock': repuestos_sin_stock[:10],
+        'repuestos_normal': repuestos_normal,
+        'balancines_criticos': balancines_criticos,
+        'balancines_alerta': balancines_alerta,
+        'balancines_normal': balancines_normal,
+        'balancines_sin_oh': balancines_sin_oh,
+        'porcentaje_normal': porcentaje_normal,
+        'porcentaje_alerta': porcentaje_alerta,
+        'porcentaje_critico': porcentaje_critico,
+    }
+    return render(request, 'balancines/dashboard_inventario.html', context)
+
+
+@login_required
+@solo_lectura
+def buscar_inventario(request):
+    """Búsqueda mejorada en todo el inventario."""
+    query = request.GET.get('q', '').strip()
+    tipo = request.GET.get('tipo', '')
+    
+    resultados = {
+        'tipos': [],
+        'balancines': [],
+        'torres': [],
+        'repuestos_balancin': [],
+        'repuestos_adicionales': [],
+    }
+    
+    total_resultados = 0
+    
+    if query:
+        query_upper = query.upper()
+        
+        if not tipo or tipo == 'tipos':
+            resultados['tipos'] = TipoBalancin.objects.with_installed_counts().filter(
+                Q(codigo__icontains=query_upper) | 
+                Q(tipo__icontains=query)
+            )[:10]
+            total_resultados += len(resultados['tipos'])
+        
+        if not tipo or tipo == 'balancines':
+            resultados['balancines'] = BalancinIndividual.objects.filter(
+                Q(codigo__icontains=query_upper)
+            ).select_related(
+                'torre', 'torre__linea', 'torre__seccion'
+            )[:20]
+            
+            for b in resultados['balancines']:
+                ultimo_oh = selectors.ultimo_oh(b)
+                b.ultimo_oh = ultimo_oh
+                
+                if ultimo_oh:
+                    if ultimo_oh.backlog < 0:
+                        b.estado_color = 'danger'
+                        b.estado_texto = 'Crítico'
+                    elif ultimo_oh.backlog < 5000:
+                        b.estado_color = 'warning'
+                        b.estado_texto = 'Alerta'
+                    else:
+                        b.estado_color = 'success'
+                        b.estado_texto = 'Normal'
+                else:
+                    b.estado_color = 'secondary'
+                    b.estado_texto = 'Sin OH'
+            
+            total_resultados += len(resultados['balancines'])
+        
+        if not tipo or tipo == 'torres':
+            palabras = query.split()
+            
+            filtros = Q()
+            for palabra in palabras:
+                if palabra.isdigit():
+                    filtros |= Q(numero_torre=palabra)
+                else:
+                    filtros |= Q(tipo_balancin_ascendente__icontains=palabra) | \
+                               Q(tipo_balancin_descendente__icontains=palabra)
+            
+            torres_query = Torre.objects.filter(filtros).select_related('linea', 'seccion')
+            
+            for torre in torres_query:
+                torre.total_balancines = BalancinIndividual.objects.filter(torre=torre).count()
+                torre.ascendentes = BalancinIndividual.objects.filter(torre=torre, sentido='ASCENDENTE').count()
+                torre.descendentes = torre.total_balancines - torre.ascendentes
+            
+            resultados['torres'] = torres_query
+            total_resultados += torres_query.count()
+        
+        if not tipo or tipo == 'repuestos':
+            resultados['repuestos_balancin'] = RepuestoBalancin.objects.filter(
+                Q(item__icontains=query_upper) | 
+                Q(descripcion__icontains=query) |
+                Q(ubicacion__icontains=query)
+            )[:20]
+            total_resultados += len(resultados['repuestos_balancin'])
+        
+        if not tipo or tipo == 'adicionales':
+            resultados['repuestos_adicionales'] = RepuestoAdicional.objects.filter(
+                Q(item__icontains=query_upper) | 
+                Q(descripcion__icontains=query) |
+                Q(ubicacion__icontains=query)
+            )[:20]
+            total_resultados += len(resultados['repuestos_adicionales'])
+
+    context = {
+        'title': 'Buscar en Inventario',
+        'query': query,
+        'tipo_filtro': tipo,
+        'resultados': resultados,
+        'total_resultados': total_resultados,
+        'tiene_resultados': total_resultados > 0,
+    }
+    return render(request, 'balancines/buscar_inventario.html', context)
+
+
+# ============================================================
+# EXPORTAR EXCEL
+# ============================================================
+
+@login_required
+@solo_lectura
+@auditar('EXPORT', 'INVENTORY', 'Exportación del inventario a Excel')
+def exportar_inventario_excel(request):
+    """Exporta TODO el inventario a un archivo Excel."""
+    # openpyxl solo se carga al exportar, no al arrancar cada worker
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+
+    wb = Workbook()
+
+    # HOJA 1 — Balancines Individuales
+    ws = wb.active
+    ws.title = "Balancines en Torres"
+    
+    headers = ["Código", "Línea", "Torre", "Sección", "Sentido", "Rango OH", "Fecha Instalación"]
+    ws.append(headers)
+    
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+    
+    for b in BalancinIndividual.objects.select_related('torre', 'torre__linea', 'torre__seccion'):
+        ws.append([
+            b.codigo,
+            b.torre.linea.nombre if b.torre.linea else "",
+            b.torre.numero_torre,
+            b.torre.seccion.nombre if b.torre.seccion else "",
+            b.get_sentido_display(),
+            b.rango_horas_cambio_oh,
+            b.fecha_registro.strftime('%d/%m/%Y') if b.fecha_registro else ""
+        ])
+    
+    ws.auto_filter.ref = ws.dimensions
+
+    # HOJA 2 — Tipos de Balancín
+    ws2 = wb.create_sheet("Tipos")
+    ws2.append(["Código", "Tipo", "Cantidad Total"])
+    
+    for cell in ws2[1]:
+        cell.font = Font(bold=True)
+    
+    for t in TipoBalancin.objects.all():
+        ws2.append([t.codigo, t.get_tipo_display(), t.cantidad_total])
+    
+    ws2.auto_filter.ref = ws2.dimensions
+
+    # HOJA 3 — Repuestos Balancín
+    ws3 = wb.create_sheet("Repuestos Balancin")
+    ws3.append(["Item", "Descripción", "Cantidad", "Ubicación", "Observaciones"])
+    
+    for cell in ws3[1]:
+        cell.font = Font(bold=True)
+    
+    for r in RepuestoBalancin.objects.all():
+        ws3.append([r.item, r.descripcion, r.cantidad, r.ubicacion, r.observaciones])
+    
+    ws3.auto_filter.ref = ws3.dimensions
+
+    # HOJA 4 — Repuestos Adicionales
+    ws4 = wb.create_sheet("Repuestos Adicionales")
+    ws4.append(["Item", "Descripción", "Cantidad", "Ubicación", "Observaciones"])
+    
+    for cell in ws4[1]:
+        cell.font = Font(bold=True)
+    
+    for r in RepuestoAdicional.objects.all():
+        ws4.append([r.item, r.descripcion, r.cantidad, r.ubicacion, r.observaciones])
+    
+    ws4.auto_filter.ref = ws4.dimensions
+
+    response = HttpResponse(
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = 'attachment; filename=inventario_completo.xlsx'
+    wb.save(response)
+    return response
@@ -0,0 +1,216 @@
+# ============================================================
+# BALANCINES - VISTAS: MANTENIMIENTO E INTERCAMBIOS
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+# ========== PYTHON STANDARD LIBRARY ==========
+import json
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    Linea, Torre, BalancinIndividual, HistorialBalancin, AlertaOH, FormularioReacondicionamiento,
+)
+
+# ========== LOCALES ==========
+from ..auditoria import auditar
+from ..versiones import incrementar
+from ..selectors import balancines_por_torre
+
+
+# ============================================================
+# INTERFAZ DE MANTENIMIENTO
+# ============================================================
+
+@login_required
+def mantenimiento_balancines(request):
+    """Vista para gestionar balancines en mantenimiento"""
+    lineas = Linea.objects.all().order_by('id')
+    
+    disponibles = balancines_por_torre('OPERANDO', 'OH_PENDIENTE')
+    en_mantenimiento = balancines_por_torre('MANTENIMIENTO')
+    
+    context = {
+        'lineas': lineas,
+        'disponibles': disponibles,
+        'en_mantenimiento': en_mantenimiento,
+    }
+    return render(request, 'balancines/mantenimiento.html', context)
+
+
+@login_required
+@require_POST
+@auditar()
+def cambiar_estado_mantenimiento(request):
+    """Cambia el estado de un balancín (entrada/salida de mantenimiento)"""
+    try:
+        data = json.loads(request.body)
+        balancin_id = data.get('balancin_id')
+        accion = data.get('accion')
+        observaciones = data.get('observaciones', '')
+        
+        if not balancin_id or not accion:
+            return JsonResponse({'success': False, 'error': 'Faltan datos requeridos'}, status=400)
+        
+        balancin = get_object_or_404(BalancinIndividual, codigo=balancin_id)
+        estado_anterior = balancin.estado
+        
+        if accion == 'entrar':
+            balancin.estado = 'MANTENIMIENTO'
+            balancin.observaciones_estado = observaciones or f"Entra a mantenimiento - {timezone.now().strftime('%d/%m/%Y %H:%M')}"
+            balancin.save()
+            
+            HistorialBalancin.objects.create(
+                balancin=balancin,
+                estado_anterior=estado_anterior,
+                estado_nuevo='MANTENIMIENTO',
+                accion='ENTRADA_MANTENIMIENTO',
+                observaciones=observaciones,
+                usuario=request.user
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'Balancín {balancin.codigo} marcado como EN MANTENIMIENTO',
+                'nuevo_estado': 'MANTENIMIENTO'
+            })
+            
+        elif accion == 'salir':
+            balancin.estado = 'OPERANDO'
+            balancin.observaciones_estado = observaciones or f"Sale de mantenimiento - {timezone.now().strftime('%d/%m/%Y %H:%M')}"
+            balancin.save()
+            
+            alertas_resueltas = AlertaOH.objects.filter(balancin=balancin, resuelta=False).update(
+                resuelta=True, fecha_resolucion=timezone.now()
+            )
+            if alertas_resueltas:
+                incrementar(AlertaOH)
+            
+            HistorialBalancin.objects.create(
+                balancin=balancin,
+                estado_anterior=estado_anterior,
+                estado_nuevo='OPERANDO',
+                accion='SALIDA_MANTENIMIENTO',
+                observaciones=observaciones,
+                usuario=request.user
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'message': f'Balancín {balancin.codigo} marcado como OPERANDO',
+                'nuevo_estado': 'OPERANDO',
+                'alertas_resueltas': alertas_resueltas
+            })
+        else:
+            return JsonResponse({'success': False, 'error': f'Acción no válida: {accion}'}, status=400)
+            
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@login_required
+def intercambiar_balancin(request, codigo_balancin):
+    """Vista para intercambiar un balancín que necesita mantenimiento por otro que acaba de salir de mantenimiento"""
+    balancin_necesita_oh = get_object_or_404(BalancinIndividual, codigo=codigo_balancin)
+    
+    balancines_disponibles = BalancinIndividual.objects.filter(
+        estado='OPERANDO'
+    ).exclude(codigo=codigo_balancin).select_related('torre__linea').order_by('torre__linea__id', 'torre__numero_torre')
+    
+    torres_disponibles = Torre.objects.all().order_by('linea__id', 'numero_torre')
+    
+    context = {
+        'balancin_necesita_oh': balancin_necesita_oh,
+        'balancines_disponibles': balancines_disponibles,
+        'torres_disponibles': torres_disponibles,
+    }
+    return render(request, 'balancines/intercambiar_balancin.html', context)
+
+
+@login_required
+@require_POST
+@auditar()
+def realizar_intercambio(request):
+    """Procesa el intercambio circular de balancines"""
+    try:
+        data = json.loads(request.body)
+        balancin_sale_id = data.get('balancin_sale_id')
+        balancin_entra_id = data.get('balancin_entra_id')
+        observaciones = data.get('observaciones', '')
+        
+        if not all([balancin_sale_id, balancin_entra_id]):
+            return JsonResponse({'success': False, 'error': 'Se requieren ambos balancines para el intercambio'}, status=400)
+        
+        balancin_sale = get_object_or_404(BalancinIndividual, codigo=balancin_sale_id)
+        balancin_entra = get_object_or_404(BalancinIndividual, codigo=balancin_entra_id)
+        
+        if balancin_entra.estado != 'OPERANDO':
+            return JsonResponse({
+                'success': False,
+                'error': f'El balancín {balancin_entra.codigo} no está disponible (estado: {balancin_entra.estado})'
+            }, status=400)
+        
+        torre_origen = balancin_sale.torre
+        sentido_origen = balancin_sale.sentido
+        
+        with transaction.atomic():
+            # Intercambio
+            balancin_entra.torre = torre_origen
+            balancin_entra.sentido = sentido_origen
+            balancin_entra.estado = 'OPERANDO'
+            balancin_entra.observaciones_estado = f"Instalado en reemplazo de {balancin_sale.codigo}"
+            balancin_entra.save()
+            
+            balancin_sale.estado = 'MANTENIMIENTO'
+            balancin_sale.torre = None
+            balancin_sale.observaciones_estado = f"Retirado para mantenimiento. Reemplazado por {balancin_entra.codigo}"
+            balancin_sale.save()
+            
+            HistorialBalancin.objects.create(
+                balancin=balancin_entra,
+                estado_anterior='OPERANDO',
+                estado_nuevo='OPERANDO',
+                accion='INSTALACION_POST_MANTENIMIENTO',
+                observaciones=f"Instalado en torre {torre_origen.linea.nombre} T{torre_origen.numero_torre} {sentido_origen}",
+                usuario=request.user
+            )
+            
+            HistorialBalancin.objects.create(
+                balancin=balancin_sale,
+                estado_anterior='OPERANDO',
+                estado_nuevo='MANTENIMIENTO',
+                accion='RETIRO_PARA_OH',
+                observaciones=f"Retirado para mantenimiento. Reemplazado por {balancin_entra.codigo}",
+                usuario=request.user
+            )
+            
+            formulario = FormularioReacondicionamiento.objects.create(
+                codigo_formulario=f"OT-{timezone.now().strftime('%Y%m%d%H%M%S')}-{balancin_sale.codigo[-4:]}",
+                tipo=balancin_sale.tipo_balancin_codigo or 'DESCONOCIDO',
+                balancin=balancin_sale,
+                fecha=timezone.now().date(),
+                horas_funcionamiento=0,
+                linea_inicial=torre_origen.linea.nombre,
+                torre_inicial=torre_origen.numero_torre,
+                linea_final='',
+                torre_final='',
+                usuario_creacion=request.user
+            )
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Intercambio realizado correctamente',
+            'formulario_id': formulario.codigo_formulario,
+            'balancin_instalado': balancin_entra.codigo,
+            'balancin_retirado': balancin_sale.codigo,
+            'ubicacion': f"{torre_origen.linea.nombre} T{torre_origen.numero_torre} {sentido_origen}"
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -0,0 +1,549 @@
+# ============================================================
+# BALANCINES - VISTAS: OH (OVERHAUL)
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.conf import settings
+
+# ========== PYTHON STANDARD LIBRARY ==========
+import json
+from datetime import timedelta
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    Linea, Torre, TipoBalancin, BalancinIndividual, HistorialOH, ControlHorasBalancin,
+)
+
+# ========== FORMULARIOS LOCALES ==========
+from ..forms import RegistrarOHForm
+
+# ========== LOCALES ==========
+from ..auditoria import auditar
+from ..services.tablero_oh import ServicioTableroOH
+from ..services.archivo import ServicioArchivo
+from ..services.calendario import ServicioCalendario
+from ..routers import solo_lectura
+from ..paginacion import limitar_por_pagina, paginar_keyset
+from ..selectors import siguiente_numero_oh
+from .comun import TIEMPO_CACHE_FRAGMENTOS
+
+
+# ============================================================
+# VISTAS DE OH (OVERHAUL)
+# ============================================================
+
+@login_required
+@auditar()
+def registrar_oh_balancin(request, codigo):
+    """Registrar una nueva orden de horas para un balancín específico usando HistorialOH"""
+    
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    
+    if request.method == 'POST':
+        form = RegistrarOHForm(request.POST)
+        if form.is_valid():
+            numero_oh = form.cleaned_data['numero_oh']
+            fecha_oh = form.cleaned_data['fecha_oh']
+            horas_operacion = form.cleaned_data['horas_operacion']
+            observaciones = form.cleaned_data['observaciones']
+            
+            # ✅ Usar HistorialOH en lugar de BalancinOH
+            if HistorialOH.objects.filter(balancin=balancin, numero_oh=numero_oh).exists():
+                messages.error(request, f'❌ Ya existe la OH #{numero_oh} para este balancín.')
+            else:
+                # Obtener datos de la torre
+                torre = balancin.torre
+                linea_nombre = torre.linea.nombre if torre and torre.linea else 'N/A'
+                
+                if balancin.sentido == 'ASCENDENTE':
+                    tipo = torre.tipo_balancin_ascendente if torre else 'Desconocido'
+                else:
+                    tipo = torre.tipo_balancin_descendente if torre else 'Desconocido'
+                
+                backlog = balancin.rango_horas_cambio_oh - horas_operacion
+                
+                # ✅ Crear en HistorialOH
+                nuevo_oh = HistorialOH.objects.create(
+                    balancin=balancin,
+                    linea_nombre=linea_nombre,
+                    torre_numero=torre.numero_torre if torre else '0',
+                    sentido=balancin.sentido,
+                    tipo_balancin=tipo,
+                    rango_oh_horas=balancin.rango_horas_cambio_oh,
+                    inicio_oc='2014-05-01',
+                    horas_promedio_dia=ServicioCalendario.de_balancin(balancin).horas_dia,
+                    factor_correccion=1.00,
+                    numero_oh=numero_oh,
+                    fecha_oh=fecha_oh,
+                    horas_operacion=horas_operacion,
+                    backlog=backlog,
+                    anio=fecha_oh.year,
+                    dia_semana=fecha_oh.strftime('%A'),
+                    observaciones=observaciones,
+                    usuario_registro=request.user.email if request.user.is_authenticated else 'Sistema'
+                )
+                
+                messages.success(request, f'✅ OH #{numero_oh} registrado correctamente para {balancin.codigo}')
+                return redirect('dashboard_oh_nuevo')
+        else:
+            messages.error(request, '❌ Por favor corrige los errores en el formulario.')
+    else:
+        form = RegistrarOHForm(initial={
+            'numero_oh': siguiente_numero_oh(balancin),
+            'fecha_oh': timezone.now().date()
+        })
+    
+    context = {
+        'form': form,
+        'balancin': balancin,
+        'title': f'Registrar OH para {balancin.codigo}'
+    }
+    
+    return render(request, 'balancines/registrar_oh_balancin.html', context)
+
+
+@login_required
+@solo_lectura
+def dashboard_oh_nuevo(request):
+    """Dashboard con gráficos de estado por torre y listado detallado"""
+    
+    linea_filtro = request.GET.get('linea', '')
+    torre_filtro = request.GET.get('torre', '')
+    estado_filtro = request.GET.get('estado', '')
+    balancin_filtro = request.GET.get('balancin', '')
+    
+    lineas = Linea.objects.all().order_by('nombre')
+    tipos = TipoBalancin.objects.all().order_by('codigo')
+    
+    # Filas calculadas por línea (fragmentos en cache, ver services/tablero_oh.py)
+    linea_id = next((linea.id for linea in lineas if linea.nombre == linea_filtro), None)
+    historial = ServicioTableroOH.historial(linea_id)
+    
+    if balancin_filtro:
+        historial = [item for item in historial if item['balancin_codigo'] == balancin_filtro]
+    
+    if linea_filtro:
+        historial = [item for item in historial if item['linea_nombre'] == linea_filtro]
+    if torre_filtro:
+        historial = [item for item in historial if torre_filtro.lower() in item['torre_numero'].lower()]
+    if estado_filtro:
+        historial = [item for item in historial if item['estado'] == estado_filtro]
+    
+    total_normal = sum(1 for item in historial if item['estado'] == 'normal')
+    total_alerta = sum(1 for item in historial if item['estado'] == 'alerta')
+    total_critico = sum(1 for item in historial if item['estado'] == 'critico')
+    total_sin_oh = 0
+    
+    labels_lineas = []
+    data_normal = []
+    data_alerta = []
+    data_critico = []
+    
+    for linea in lineas:
+        count_normal = sum(1 for item in historial 
+                          if item['linea_nombre'] == linea.nombre and item['estado'] == 'normal')
+        count_alerta = sum(1 for item in historial 
+                          if item['linea_nombre'] == linea.nombre and item['estado'] == 'alerta')
+        count_critico = sum(1 for item in historial 
+                           if item['linea_nombre'] == linea.nombre and item['estado'] == 'critico')
+        
+        if count_normal > 0 or count_alerta > 0 or count_critico > 0:
+            labels_lineas.append(linea.nombre)
+            data_normal.append(count_normal)
+            data_alerta.append(count_alerta)
+            data_critico.append(count_critico)
+    
+    torres_labels = []
+    backlog_data = []
+    backlog_colors = []
+    
+    for item in historial:
+        sentido_short = "ASC" if item['sentido'] == 'ASCENDENTE' else "DES"
+        etiqueta = f"{item['linea_nombre']} T{item['torre_numero']} {sentido_short}"
+        torres_labels.append(etiqueta)
+        
+        backlog = item['backlog_actual']
+        
+        if backlog is None:
+            backlog_data.append(0)
+            backlog_colors.append('#6c757d')
+        else:
+            backlog_data.append(backlog)
+            if backlog < 0:
+                backlog_colors.append('#dc3545')
+            elif backlog < 5000:
+                backlog_colors.append('#ffc107')
+            else:
+                backlog_colors.append('#28a745')
+    
+    total_balancines = len(historial)
+    balancines_asc = sum(1 for item in historial if item['sentido'] == 'ASCENDENTE')
+    balancines_desc = total_balancines - balancines_asc
+    
+    total_con_oh = total_normal + total_alerta + total_critico
+    porcentaje_normal = (total_normal / total_con_oh * 100) if total_con_oh > 0 else 0
+    porcentaje_alerta = (total_alerta / total_con_oh * 100) if total_con_oh > 0 else 0
+    porcentaje_critico = (total_critico / total_con_oh * 100) if total_con_oh > 0 else 0
+    
+    context = {
+        'lineas': lineas,
+        'tipos': tipos,
+        'linea_filtro': linea_filtro,
+        'torre_filtro': torre_filtro,
+        'estado_filtro': estado_filtro,
+        'balancin_filtro': balancin_filtro,
+        'historial': historial,
+        'total_balancines': total_balancines,
+        'balancines_asc': balancines_asc,
+        'balancines_desc': balancines_desc,
+        'total_normal': total_normal,
+        'total_alerta': total_alerta,
+        'total_critico': total_critico,
+        'total_sin_oh': total_sin_oh,
+        'porcentaje_normal': porcentaje_normal,
+        'porcentaje_alerta': porcentaje_alerta,
+        'porcentaje_critico': porcentaje_critico,
+        'labels_lineas': json.dumps(labels_lineas),
+        'data_normal': json.dumps(data_normal),
+        'data_alerta': json.dumps(data_alerta),
+        'data_critico': json.dumps(data_critico),
+        'torres_labels': json.dumps(torres_labels),
+        'backlog_data': json.dumps(backlog_data),
+        'backlog_colors': json.dumps(backlog_colors),
+    }
+    
+    return render(request, 'balancines/dashboard_oh_nuevo.html', context)
+
+
+@login_required
+@auditar()
+def registrar_oh_balancin_completo(request, codigo):
+    """Registrar una nueva orden de horas para un balancín específico"""
+    
+    balancin = get_object_or_404(BalancinIndividual, codigo=codigo)
+    
+    if request.method == 'POST':
+        form = RegistrarOHForm(request.POST)
+        if form.is_valid():
+            numero_oh = form.cleaned_data['numero_oh']
+            fecha_oh = form.cleaned_data['fecha_oh']
+            horas_operacion = form.cleaned_data['horas_operacion']
+            observaciones = form.cleaned_data['observaciones']
+            
+            if HistorialOH.objects.filter(balancin=balancin, numero_oh=numero_oh).exists():
+                messages.error(request, f'❌ Ya existe la OH #{numero_oh} para este balancín.')
+            else:
+                torre = balancin.torre
+                linea_nombre = torre.linea.nombre if torre and torre.linea else 'N/A'
+                
+                if balancin.sentido == 'ASCENDENTE':
+                    tipo = torre.tipo_balancin_ascendente if torre else 'Desconocido'
+                else:
+                    tipo = torre.tipo_balancin_descendente if torre else 'Desconocido'
+                
+                backlog = balancin.rango_horas_cambio_oh - horas_operacion
+                
+                nuevo_oh = HistorialOH.objects.create(
+                    balancin=balancin,
+                    linea_nombre=linea_nombre,
+                    torre_numero=torre.numero_torre if torre else '0',
+                    sentido=balancin.sentido,
+                    tipo_balancin=tipo,
+                    rango_oh_horas=balancin.rango_horas_cambio_oh,
+                    inicio_oc='2014-05-01',
+                    horas_promedio_dia=ServicioCalendario.de_balancin(balancin).horas_dia,
+                    factor_correccion=1.00,
+                    numero_oh=numero_oh,
+                    fecha_oh=fecha_oh,
+                    horas_operacion=horas_operacion,
+                    backlog=backlog,
+                    anio=fecha_oh.year,
+                    dia_semana=fecha_oh.strftime('%A'),
+                    observaciones=observaciones,
+                    usuario_registro=request.user.email if request.user.is_authenticated else 'Sistema'
+                )
+                
+                messages.success(request, f'✅ OH #{numero_oh} registrado correctamente para {balancin.codigo}')
+                return redirect('dashboard_oh_nuevo')
+        else:
+            messages.error(request, '❌ Por favor corrige los errores en el formulario.')
+    else:
+        form = RegistrarOHForm(initial={
+            'numero_oh': siguiente_numero_oh(balancin),
+            'fecha_oh': timezone.now().date()
+        })
+    
+    context = {
+        'form': form,
+        'balancin': balancin,
+        'title': f'Registrar OH para {balancin.codigo}'
+    }
+    
+    return render(request, 'balancines/registrar_oh_balancin.html', context)
+
+
+# ============================================================
+# HISTORIAL
+# ============================================================
+
+@login_required
+@solo_lectura
+def historial_torre_con_filtros(request):
+    """Vista con filtros para buscar torres por línea, número y tipo de balancín"""
+    lineas = Linea.objects.all()
+    tipos_balancin = TipoBalancin.objects.all().values_list('codigo', flat=True)
+    
+    torre_seleccionada = None
+    balancines_data = []
+    total_oh_torre = 0
+    ultimo_oh_torre = None
+    torres_linea = []
+    linea_seleccionada = None
+    torres_duplicadas = []
+    
+    linea_id = request.GET.get('linea')
+    numero_torre = request.GET.get('numero_torre')
+    tipo_balancin = request.GET.get('tipo_balancin')
+    seccion_id = request.GET.get('seccion_id')
+    
+    if linea_id:
+        try:
+            linea_seleccionada = Linea.objects.get(id=linea_id)
+            torres_query = Torre.objects.filter(linea_id=linea_id).select_related('linea', 'seccion')
+            # Perezoso: solo se consulta si el fragmento de filtros no está en cache
+            torres_linea = SimpleLazyObject(lambda: sorted(
+                torres_query,
+                key=lambda t: (int(t.numero_torre) if t.numero_torre.isdigit() else float('inf'), t.numero_torre)
+            ))
+        except Linea.DoesNotExist:
+            pass
+    
+    if linea_id and numero_torre:
+        torres_coincidentes = Torre.objects.select_related('linea', 'seccion').filter(
+            linea_id=linea_id, numero_torre=numero_torre
+        )
+        
+        if torres_coincidentes.count() > 1:
+            if seccion_id:
+                try:
+                    torre_seleccionada = torres_coincidentes.get(seccion_id=seccion_id)
+                except Torre.DoesNotExist:
+                    torres_duplicadas = torres_coincidentes
+            else:
+                torres_duplicadas = torres_coincidentes
+        elif torres_coincidentes.count() == 1:
+            torre_seleccionada = torres_coincidentes.first()
+        
+        if torre_seleccionada:
+            balancines = BalancinIndividual.objects.filter(torre=torre_seleccionada).order_by('sentido')
+            
+            for balancin in balancines:
+                if balancin.sentido == 'ASCENDENTE':
+                    tipo_codigo = torre_seleccionada.tipo_balancin_ascendente
+                else:
+                    tipo_codigo = torre_seleccionada.tipo_balancin_descendente
+                
+                if tipo_balancin and tipo_codigo != tipo_balancin:
+                    continue
+                
+                historial = HistorialOH.objects.filter(balancin=balancin).order_by('-fecha_oh')
+                
+                balancin_dict = {
+                    'objeto': balancin,
+                    'codigo': balancin.codigo,
+                    'sentido': balancin.sentido,
+                    'sentido_display': balancin.get_sentido_display(),
+                    'rango_horas_cambio_oh': balancin.rango_horas_cambio_oh,
+                    'observaciones': balancin.observaciones,
+                    'fecha_registro': balancin.fecha_registro,
+                    'tipo_codigo': tipo_codigo,
+                    'oh_historial': historial,
+                    'total_oh': historial.count(),
+                    'ultimo_oh': historial.first() if historial.exists() else None
+                }
+                
+                balancines_data.append(balancin_dict)
+                
+                if historial.exists():
+                    total_oh_torre += balancin_dict['total_oh']
+                    if not ultimo_oh_torre or historial.first().fecha_oh > ultimo_oh_torre.fecha_oh:
+                        ultimo_oh_torre = historial.first()
+    
+    context = {
+        'lineas': lineas,
+        'tipos_balancin': tipos_balancin,
+        'torre': torre_seleccionada,
+        'balancines': balancines_data,
+        'total_oh_torre': total_oh_torre,
+        'ultimo_oh_torre': ultimo_oh_torre,
+        'total_balancines': len(balancines_data),
+        'filtros': {'linea': linea_id, 'numero_torre': numero_torre, 'tipo_balancin': tipo_balancin, 'seccion_id': seccion_id},
+        'torres_linea': torres_linea,
+        'linea_seleccionada': linea_seleccionada,
+        'torres_duplicadas': torres_duplicadas,
+        'MEDIA_URL': settings.MEDIA_URL,
+        'tiempo_cache': TIEMPO_CACHE_FRAGMENTOS,
+    }
+    return render(request, 'balancines/historial_torre.html', context)
+
+
+@login_required
+@solo_lectura
+def historial_balancin(request, codigo):
+    """Muestra el historial completo de un balancín específico"""
+    balancin = get_object_or_404(
+        BalancinIndividual.objects.select_related('torre__linea', 'torre__seccion'),
+        codigo=codigo
+    )
+    
+    tipo_balancin_codigo = balancin.tipo_balancin_codigo
+    historial_oh = HistorialOH.objects.filter(balancin=balancin).order_by('-fecha_oh', '-numero_oh')
+    total_oh = historial_oh.count()
+    ultimo_oh = historial_oh.first()
+    
+    per_page = limitar_por_pagina(request.GET.get('per_page'), defecto=10)
+    page_obj = paginar_keyset(
+        historial_oh, ('-fecha_oh', '-numero_oh', '-id'),
+        cursor=request.GET.get('cursor'), por_pagina=per_page,
+    ).con_urls(request)
+    
+    fechas = []
+    backlogs = []
+    if total_oh > 0:
+        ultimos_10 = historial_oh[:10]
+        fechas = [h.fecha_oh.strftime('%d/%m/%Y') for h in ultimos_10]
+        backlogs = [h.backlog or 0 for h in ultimos_10]
+    
+    # Alertas resueltas y movimientos ya archivados: el detalle se lee solo con ?archivo=1
+    archivados = ServicioArchivo.contar(balancin)
+    alertas_archivadas = movimientos_archivados = None
+    if request.GET.get('archivo'):
+        alertas_archivadas = ServicioArchivo.del_balancin('balancines.AlertaOH', balancin, limite=50)
+        movimientos_archivados = ServicioArchivo.del_balancin('balancines.HistorialBalancin', balancin, limite=50)
+    
+    context = {
+        'balancin': balancin,
+        'page_obj': page_obj,
+        'total_oh': total_oh,
+        'ultimo_oh': ultimo_oh,
+        'fechas': fechas,
+        'backlogs': backlogs,
+        'tipo_balancin': tipo_balancin_codigo,
+        'hay_datos': total_oh > 0,
+        'total_archivados': sum(archivados.values()),
+        'alertas_archivadas': alertas_archivadas,
+        'movimientos_archivados': movimientos_archivados,
+    }
+    return render(request, 'balancines/historial_balancin.html', context)
+
+
+# ============================================================
+# DASHBOARD OH EN VIVO (stream SSE con polling de respaldo)
+# ============================================================
+
+@login_required
+def dashboard_oh_vivo(request):
+    """
+    Dashboard OH con actualización en vivo (stream SSE; polling cada 30 segundos si no está disponible)
+    """
+    context = {
+        'title': 'Dashboard OH - En Vivo',
+        # Se consulta solo si los fragmentos de filtros no están en cache
+        'lineas': Linea.objects.values_list('nombre', flat=True),
+        'tiempo_cache': TIEMPO_CACHE_FRAGMENTOS,
+    }
+    return render(request, 'balancines/dashboard_oh_vivo.html', context)
+
+
+
+# ============================================================
+# REINICIAR CONTADOR DE UN BALANCÍN
+# ============================================================
+
+@login_required
+@require_POST
+@csrf_exempt
+@auditar()
+def reiniciar_contador(request):
+    """
+    API para reiniciar el contador de horas de un balancín individual
+    El usuario ingresa un número, el sistema lo redondea hacia abajo a días
+    completos de la ventana de servicio de su línea (p. ej. múltiplos de 16)
+    """
+    try:
+        data = json.loads(request.body)
+        balancin_codigo = data.get('balancin_codigo')
+        horas_ingresadas = data.get('nuevas_horas', 0)
+        observaciones = data.get('observaciones', '')
+        
+        if not balancin_codigo:
+            return JsonResponse({'success': False, 'error': 'Balancín no especificado'}, status=400)
+        
+        balancin = get_object_or_404(BalancinIndividual, codigo=balancin_codigo)
+        
+        calendario = ServicioCalendario.de_balancin(balancin)
+        horas_dia = calendario.horas_dia or 1
+        horas_base_calculadas = (horas_ingresadas // horas_dia) * horas_dia
+        
+        # Calcular días que representa
+        dias_representados = horas_base_calculadas // horas_dia
+        
+        # Obtener o crear el control de horas
+        control, creado = ControlHorasBalancin.objects.get_or_create(
+            balancin=balancin
+        )
+        
+        # Registrar en HistorialOH
+        nuevo_oh = HistorialOH.objects.create(
+            balancin=balancin,
+            numero_oh=(HistorialOH.objects.filter(balancin=balancin).count() + 1),
+            fecha_oh=timezone.now().date(),
+            horas_operacion=horas_base_calculadas,
+            observaciones=f"Reinicio: Usuario ingresó {horas_ingresadas}h → redondeado a {horas_base_calculadas}h ({dias_representados} días × {horas_dia}h). {observaciones}",
+            linea_nombre=balancin.torre.linea.nombre if balancin.torre else 'N/A',
+            torre_numero=balancin.torre.numero_torre if balancin.torre else '0',
+            sentido=balancin.sentido,
+            tipo_balancin=balancin.tipo_balancin_codigo or 'N/A',
+            rango_oh_horas=balancin.rango_horas_cambio_oh,
+            inicio_oc='2014-05-01',
+            horas_promedio_dia=horas_dia,
+            factor_correccion=1.00,
+            backlog=balancin.rango_horas_cambio_oh - horas_base_calculadas,
+            anio=timezone.now().year,
+            dia_semana=timezone.now().strftime('%A'),
+            usuario_registro=request.user.email if request.user.is_authenticated else 'Sistema'
+        )
+        
+        # Actualizar el control de horas
+        control.actualizar_base(
+            nuevas_horas=horas_base_calculadas,
+            nueva_fecha=timezone.now().date(),
+            nuevo_oh=nuevo_oh
+        )
+        
+        # Calcular lo que se mostrará hoy
+        hoy = timezone.now().date()
+        horas_mostradas_hoy = control.horas_base + calendario.horas_entre(control.fecha_base, hoy)
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'✅ Contador reiniciado. Usuario ingresó {horas_ingresadas}h → se guardó {horas_base_calculadas}h ({dias_representados} días × {horas_dia}h)',
+            'horas_ingresadas': horas_ingresadas,
+            'horas_guardadas': horas_base_calculadas,
+            'dias_representados': dias_representados,
+            'horas_mostradas_hoy': horas_mostradas_hoy,
+            'horas_manana': horas_base_calculadas + calendario.horas_entre(hoy, hoy + timedelta(days=1)),
+            'horas_pasado': horas_base_calculadas + calendario.horas_entre(hoy, hoy + timedelta(days=2)),
+            'nuevo_backlog': control.backlog_actual,
+        })
+        
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -0,0 +1,118 @@
+# ============================================================
+# BALANCINES - VISTAS: VISTAS PRINCIPALES
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, redirect
+from django.contrib.auth import login, authenticate
+from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib import messages
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+# ========== LOCALES ==========
+from ..forms import RegistroForm
+from ..metricas import obtener_metricas, limpiar_metricas, resumen_por_vista
+from ..selectors import conteos_inventario
+
+
+def home(request):
+    """Página de inicio pública."""
+    context = {}
+    if request.user.is_authenticated:
+        context['user'] = request.user
+        context['mensaje_bienvenida'] = f'¡Bienvenido de nuevo, {request.user.nombre}!'
+    return render(request, 'home.html', context)
+
+
+@login_required
+def dashboard(request):
+    """Dashboard principal."""
+    conteos = conteos_inventario()
+
+    context = {
+        'user': request.user,
+        'welcome_message': f'Bienvenido, {request.user.nombre}!',
+        'total_tipos': conteos['total_tipos'],
+        'total_balancines': conteos['total_balancines'],
+        'total_repuestos': conteos['total_repuestos'],
+        'total_torres': conteos['total_torres'],
+        'balancines_asc': conteos['balancines_asc'],
+        'balancines_desc': conteos['balancines_desc'],
+        'es_jefe': request.user.es_jefe,
+        'es_supervisor': request.user.es_supervisor,
+        'es_tecnico': request.user.es_tecnico,
+    }
+    return render(request, 'dashboard.html', context)
+
+
+def register(request):
+    """Vista para registro de usuarios."""
+    if request.method == 'POST':
+        form = RegistroForm(request.POST)
+        if form.is_valid():
+            user = form.save()
+            user = authenticate(
+                email=form.cleaned_data['email'],
+                password=form.cleaned_data['password1']
+            )
+            if user is not None:
+                login(request, user)
+                messages.success(request, f'¡Bienvenido {user.nombre}! Registro exitoso.')
+                return redirect('home')
+            else:
+                messages.error(request, 'Error al autenticar usuario.')
+        else:
+            messages.error(request, 'Por favor corrige los errores del formulario.')
+    else:
+        form = RegistroForm()
+    
+    context = {'form': form, 'title': 'Registro de Usuario'}
+    return render(request, 'accounts/register.html', context)
+
+
+# ============================================================
+# MÉTRICAS DE RENDIMIENTO
+# ============================================================
+
+@staff_member_required
+def metricas_rendimiento(request):
+    """
+    Resumen de consultas y latencia por vista (solo staff).
+    Los datos son del buffer en memoria del proceso que atiende el request.
+    """
+    metricas = obtener_metricas()
+    url_name = request.GET.get('vista', '').strip()
+
+    context = {
+        'resumen': resumen_por_vista(metricas),
+        'recientes': [m for m in metricas if not url_name or m['url_name'] == url_name][:100],
+        'vista_seleccionada': url_name,
+        'total_registradas': len(metricas),
+    }
+    return render(request, 'balancines/metricas_rendimiento.html', context)
+
+
+@staff_member_required
+@require_POST
+def limpiar_metricas_rendimiento(request):
+    """Vacía el buffer de métricas del proceso (POST con CSRF desde la página de métricas)"""
+    limpiar_metricas()
+    return redirect('metricas_rendimiento')
+
+
+# ============================================================
+# SALUD (healthcheck de docker compose / nginx)
+# ============================================================
+
+def salud(request):
+    """200 si el proceso responde y la base de datos acepta consultas, 503 si no"""
+    from django.db import DatabaseError, connection
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return JsonResponse({'estado': 'error', 'base_datos': False}, status=503)
+    return JsonResponse({'estado': 'ok', 'base_datos': True})
@@ -0,0 +1,329 @@
+# ============================================================
+# BALANCINES - VISTAS: TRABAJOS TALLER
+# ============================================================
+
+# ========== DJANGO CORE ==========
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Q, Count
+from django.utils import timezone
+from django.core.cache import cache
+
+# ========== PYTHON STANDARD LIBRARY ==========
+from datetime import timedelta
+from collections import OrderedDict
+
+# ========== MODELOS LOCALES ==========
+from ..models import (
+    RepuestoBalancin, RepuestoAdicional, HistorialRepuesto, HistorialAdicional,
+    Usuario, RegistroTallerDiario, RegistroRepuestoBalancin, RegistroRepuestoAdicional,
+)
+
+# ========== FORMULARIOS LOCALES ==========
+from ..forms_taller import RegistroTallerDiarioForm
+
+# ========== LOCALES ==========
+from ..auditoria import auditar
+from ..versiones import token_version
+from ..paginacion import limitar_por_pagina, paginar_keyset
+
+
+# ============================================================
+# VISTAS DE TRABAJOS TALLER CON PROTECCIÓN DE CONCURRENCIA
+# ============================================================
+
+def _resumen_taller(registros, clave_filtros):
+    """
+    Resumen por área y top de técnicos de los registros filtrados. Se guarda
+    en cache por combinación de filtros; la clave incluye la versión de
+    RegistroTallerDiario, así que un registro nuevo la invalida.
+    """
+    clave = 'taller:resumen:' + token_version(RegistroTallerDiario, Usuario, extra=clave_filtros)
+    resumen = cache.get(clave)
+    if resumen is None:
+        resumen = {
+            'areas': list(
+                registros.order_by().values('area').annotate(total=Count('id')).order_by('-total')
+            ),
+            'tecnicos': list(
+                registros.order_by().values('tecnico__nombre', 'tecnico__id').annotate(
+                    total_trabajos=Count('id')
+                ).order_by('-total_trabajos')[:5]
+            ),
+        }
+        cache.set(clave, resumen, 60 * 60)
+    return resumen
+
+
+@login_required
+def lista_trabajos_taller(request):
+    """Vista para listar los trabajos del taller con filtros, paginada por días"""
+    
+    fecha_desde = request.GET.get('fecha_desde', '')
+    fecha_hasta = request.GET.get('fecha_hasta', '')
+    area_filtro = request.GET.get('area', '')
+    turno_filtro = request.GET.get('turno', '')
+    dias_por_pagina = limitar_por_pagina(request.GET.get('dias'), defecto=7, maximo=31)
+    
+    registros = RegistroTallerDiario.objects.all()
+    
+    if fecha_desde:
+        registros = registros.filter(fecha__gte=fecha_desde)
+    if fecha_hasta:
+        registros = registros.filter(fecha__lte=fecha_hasta)
+    if area_filtro:
+        registros = registros.filter(area=area_filtro)
+    if turno_filtro:
+        registros = registros.filter(turno=turno_filtro)
+    
+    hoy = timezone.now().date()
+    ayer = hoy - timedelta(days=1)
+    inicio_semana_actual = hoy - timedelta(days=hoy.weekday())
+    inicio_semana_pasada = inicio_semana_actual - timedelta(days=7)
+    
+    # Conteos por día y semana en una sola consulta
+    resumen_dias = registros.aggregate(
+        hoy=Count('id', filter=Q(fecha=hoy)),
+        ayer=Count('id', filter=Q(fecha=ayer)),
+        semana_actual=Count('id', filter=Q(fecha__gte=inicio_semana_actual)),
+        semana_pasada=Count('id', filter=Q(
+            fecha__range=[inicio_semana_pasada, inicio_semana_actual - timedelta(days=1)]
+        )),
+    )
+    
+    clave_filtros = f'{fecha_desde}|{fecha_hasta}|{area_filtro}|{turno_filtro}'
+    resumen = _resumen_taller(registros, clave_filtros)
+    
+    # Página de días (keyset sobre las fechas distintas) y solo sus registros
+    pagina = paginar_keyset(
+        registros.filter(fecha__isnull=False).values('fecha').distinct(),
+        ('-fecha',),
+        cursor=request.GET.get('cursor'),
+        por_pagina=dias_por_pagina,
+    ).con_urls(request)
+    fechas = [fila['fecha'] for fila in pagina]
+    
+    registros_por_fecha = OrderedDict(
+        (fecha.strftime('%Y-%m-%d'), {'fecha': fecha, 'registros': []}) for fecha in fechas
+    )
+    for registro in registros.filter(fecha__in=fechas).select_related(
+        'tipo_balancin', 'tecnico', 'registrado_por'
+    ).order_by('-fecha', '-fecha_registro'):
+        registros_por_fecha[registro.fecha.strftime('%Y-%m-%d')]['registros'].append(registro)
+    
+    context = {
+        'registros_por_fecha': registros_por_fecha,
+        'pagina': pagina,
+        'resumen_dias': resumen_dias,
+        'resumen_areas': resumen['areas'],
+        'top_tecnicos': resumen['tecnicos'],
+        'area_filtro': area_filtro,
+        'turno_filtro': turno_filtro,
+        'fecha_desde': fecha_desde,
+        'fecha_hasta': fecha_hasta,
+    }
+    
+    return render(request, 'balancines/lista_trabajos.html', context)
+
+
+@login_required
+@auditar()
+def crear_trabajo_taller(request):
+    """Vista para crear un nuevo registro de trabajo en el taller CON PROTECCIÓN"""
+    
+    if request.method == 'POST':
+        form = RegistroTallerDiarioForm(request.POST)
+        
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    # 1. Crear el registro del trabajo
+                    registro = form.save(commit=False)
+                    registro.fecha = timezone.now().date()
+                    registro.tecnico = request.user
+                    registro.registrado_por = request.user
+                    registro.save()
+                    form.save_m2m()
+                    
+                    # 2. Recolectar todos los repuestos a descontar
+                    repuestos_a_descontar = []
+                    
+                    # Repuestos de balancín
+                    repuestos_balancin_ids = request.POST.getlist('repuesto_balancin_id')
+                    repuestos_balancin_cantidades = request.POST.getlist('repuesto_balancin_cantidad')
+                    
+                    for i, repuesto_id in enumerate(repuestos_balancin_ids):
+                        if repuesto_id and repuestos_balancin_cantidades[i]:
+                            try:
+                                cantidad = float(repuestos_balancin_cantidades[i])
+                                if cantidad > 0:
+                                    repuestos_a_descontar.append({
+                                        'id': repuesto_id,
+                                        'cantidad': cantidad,
+                                        'tipo': 'balancin'
+                                    })
+                            except (ValueError, TypeError):
+                                pass
+                    
+                    # Repuestos adicionales
+                    repuestos_adicionales_ids = request.POST.getlist('repuesto_adicional_id')
+                    repuestos_adicionales_cantidades = request.POST.getlist('repuesto_adicional_cantidad')
+                    
+                    for i, repuesto_id in enumerate(repuestos_adicionales_ids):
+                        if repuesto_id and repuestos_adicionales_cantidades[i]:
+                            try:
+                                cantidad = float(repuestos_adicionales_cantidades[i])
+                                if cantidad > 0:
+                                    repuestos_a_descontar.append({
+                                        'id': repuesto_id,
+                                        'cantidad': cantidad,
+                                        'tipo': 'adicional'
+                                    })
+                            except (ValueError, TypeError):
+                                pass
+                    
+                    # 3. 🔑 ORDENAR por ID para evitar deadlocks
+                    repuestos_a_descontar.sort(key=lambda x: x['id'])
+                    
+                    # 4. 🔒 PROCESAR CADA REPUESTO CON BLOQUEO
+                    for item in repuestos_a_descontar:
+                        if item['tipo'] == 'balancin':
+                            # 🔒 Bloquear repuesto de balancín
+                            repuesto = RepuestoBalancin.objects.select_for_update().get(item=item['id'])
+                            
+                            if repuesto.cantidad < item['cantidad']:
+                                raise ValueError(f'Stock insuficiente para {repuesto.item}')
+                            
+                            stock_antes = repuesto.cantidad
+                            repuesto.cantidad -= item['cantidad']
+                            repuesto.fecha_ultimo_movimiento = timezone.now()
+                            repuesto.fecha_ultima_salida = timezone.now()
+                            repuesto.save()
+                            
+                            # Registrar en historial
+                            HistorialRepuesto.objects.create(
+                                repuesto=repuesto,
+                                tipo_movimiento='salida',
+                                cantidad=-item['cantidad'],
+                                stock_restante=repuesto.cantidad,
+                                observaciones=f"Uso en trabajo #{registro.id} - {registro.descripcion[:50]}"
+                            )
+                            
+                            # Registrar en la tabla intermedia
+                            RegistroRepuestoBalancin.objects.create(
+                                registro=registro,
+                                repuesto=repuesto,
+                                cantidad=item['cantidad'],
+                                stock_antes=stock_antes,
+                                stock_despues=repuesto.cantidad
+                            )
+                            
+                        elif item['tipo'] == 'adicional':
+                            # 🔒 Bloquear repuesto adicional
+                            repuesto = RepuestoAdicional.objects.select_for_update().get(item=item['id'])
+                            
+                            if repuesto.cantidad < item['cantidad']:
+                                raise ValueError(f'Stock insuficiente para {repuesto.item}')
+                            
+                            stock_antes = repuesto.cantidad
+                            repuesto.cantidad -= item['cantidad']
+                            repuesto.fecha_ultimo_movimiento = timezone.now()
+                            repuesto.fecha_ultima_salida = timezone.now()
+                            repuesto.save()
+                            
+                            # Registrar en historial
+                            HistorialAdicional.objects.create(
+                                repuesto=repuesto,
+                                tipo_movimiento='salida',
+                                cantidad=-item['cantidad'],
+                                stock_restante=repuesto.cantidad,
+                                observaciones=f"Uso en trabajo #{registro.id} - {registro.descripcion[:50]}",
+                                usuario=request.user
+                            )
+                            
+                            # Registrar en la tabla intermedia
+                            RegistroRepuestoAdicional.objects.create(
+                                registro=registro,
+                                repuesto=repuesto,
+                                cantidad=item['cantidad'],
+                                stock_antes=stock_antes,
+                                stock_despues=repuesto.cantidad
+                            )
+                    
+                    messages.success(request, f'✅ Trabajo registrado exitosamente para el día {registro.fecha.strftime("%d/%m/%Y")}')
+                    return redirect('lista_trabajos_taller')
+                    
+            except ValueError as e:
+                messages.error(request, f'❌ {str(e)}')
+            except Exception as e:
+                messages.error(request, f'❌ Error al registrar: {str(e)}')
+        else:
+            for field, errors in form.errors.items():
+                for error in errors:
+                    messages.error(request, f'❌ {field}: {error}')
+    else:
+        form = RegistroTallerDiarioForm()
+    
+    repuestos_balancin = RepuestoBalancin.objects.filter(cantidad__gt=0).order_by('item')
+    repuestos_adicionales = RepuestoAdicional.objects.filter(cantidad__gt=0).order_by('item')
+    
+    context = {
+        'form': form,
+        'repuestos_balancin': repuestos_balancin,
+        'repuestos_adicionales': repuestos_adicionales,
+        'title': 'Nuevo Registro de Trabajo',
+        'usuario_actual': request.user,
+        'fecha_actual': timezone.now().date(),
+    }
+    
+    return render(request, 'balancines/crear_trabajo.html', context)
+
+
+@login_required
+def detalle_trabajo_taller(request, pk):
+    """Vista para ver el detalle de un trabajo específico"""
+    registro = get_object_or_404(
+        RegistroTallerDiario.objects.select_related(
+            'tipo_balancin', 'tecnico', 'registrado_por'
+        ).prefetch_related(
+            'registrorepuestobalancin_set__repuesto',
+            'registrorepuestoadicional_set__repuesto'
+        ), 
+        pk=pk
+    )
+    
+    context = {
+        'registro': registro,
+        'title': f'Detalle: {registro.descripcion[:50]}',
+    }
+    
+    return render(request, 'balancines/detalle_trabajo.html', context)
+
+
+@login_required
+@auditar()
+def editar_trabajo_taller(request, pk):
+    """Vista para editar un registro de trabajo existente"""
+    registro = get_object_or_404(RegistroTallerDiario, pk=pk)
+    
+    if request.method == 'POST':
+        form = RegistroTallerDiarioForm(request.POST, instance=registro)
+        
+        if form.is_valid():
+            registro = form.save()
+            messages.success(request, f'✅ Trabajo actualizado correctamente')
+            return redirect('detalle_trabajo_taller', pk=registro.pk)
+        else:
+            messages.error(request, '❌ Error al actualizar el trabajo')
+    else:
+        form = RegistroTallerDiarioForm(instance=registro)
+    
+    context = {
+        'form': form,
+        'registro': registro,
+        'title': f'Editar: {registro.descripcion[:50]}',
+    }
+    
+    return render(request, 'balancines/editar_trabajo.html', context)
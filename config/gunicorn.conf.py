@@ -0,0 +1,48 @@
+# config/gunicorn.conf.py
+"""
+Configuración de gunicorn para producción (docker-compose.prod.yml):
+
+    gunicorn -c config/gunicorn.conf.py config.wsgi:application
+
+Workers gthread: las vistas pasan la mayor parte del tiempo esperando a
+PostgreSQL, así que unos pocos procesos con varios hilos cada uno atienden
+más requests que muchos procesos de un hilo, con menos memoria. Cada hilo
+mantiene su propia conexión persistente (CONN_MAX_AGE), por lo que
+workers * threads no debe superar las conexiones disponibles en PostgreSQL.
+
+Con WSGI el stream SSE responde 204 y el dashboard en vivo usa polling.
+Todo se puede ajustar con variables de entorno GUNICORN_*.
+"""
+
+import multiprocessing
+import os
+
+
+def _entero(nombre, defecto):
+    try:
+        return int(os.environ.get(nombre, defecto))
+    except ValueError:
+        return defecto
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _entero('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 9))
+threads = _entero('GUNICORN_THREADS', 4)
+
+# Los reportes Excel y los tableros sin cache pueden tardar varios segundos
+timeout = _entero('GUNICORN_TIMEOUT', 60)
+graceful_timeout = 30
+keepalive = 5
+
+# Reinicio periódico de workers: limita el crecimiento de memoria
+# (caches locales, buffer de métricas) sin reiniciar todos a la vez
+max_requests = _entero('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = max_requests // 10
+
+# Logs a stdout/stderr (docker compose logs)
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+# Detrás de nginx: en producción el puerto 8000 no se publica y solo nginx llega al contenedor
+forwarded_allow_ips = os.environ.get('GUNICORN_FORWARDED_ALLOW_IPS', '*')
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.balancines.middleware.CompresionMiddleware',
+    'apps.balancines.middleware.MetricasRendimientoMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -73,8 +75,19 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
-    }
+    },
+}
+
+# Réplica de lectura para las vistas @solo_lectura (apps/balancines/routers.py).
+# Sin DB_REPLICA_* apunta a la misma base; en tests es un espejo de default.
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+    'HOST': config('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+    'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+    'TEST': {'MIRROR': 'default'},
 }
+DATABASE_ROUTERS = ['apps.balancines.routers.RouterLecturaEscritura']
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -140,3 +153,77 @@ EMAIL_HOST_PASSWORD = 'jevxxzitiqxuofox'
 DEFAULT_FROM_EMAIL = 'miguefernandohuanca@gmail.com'
 
 
+# Métricas de rendimiento (consultas SQL y latencia por vista). Registrarlas
+# cuesta en cada request (captura y huella de cada consulta): por defecto
+# solo con DEBUG; en producción se activan con METRICAS_RENDIMIENTO_ACTIVAS=True
+METRICAS_RENDIMIENTO_ACTIVAS = config('METRICAS_RENDIMIENTO_ACTIVAS', default=DEBUG, cast=bool)
+METRICAS_BUFFER_TAMANO = 500
+METRICAS_PRESUPUESTO_ESTRICTO = False
+
+# Máximo de consultas por vista (nombre de URL). Ver apps/balancines/metricas.py
+PRESUPUESTOS_CONSULTAS = {
+    'dashboard_oh_nuevo': 30,
+    'dashboard_inventario': 40,
+    'api_horas_en_vivo': 20,
+    'api_dashboard_inventario': 50,
+    'buscar_inventario': 60,
+    'historial_torre_filtros': 40,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps.balancines.metricas': {
+            'handlers': ['console'],
+            'level': config('METRICAS_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Stream SSE de horas en vivo (requiere servir por ASGI: config.asgi)
+SSE_HEARTBEAT_SEGUNDOS = 15
+SSE_RESYNC_SEGUNDOS = 600
+
+# Tableros OH por línea: hilos para calcular en paralelo los fragmentos sin cache (0 = en serie)
+TABLERO_OH_HILOS = config('TABLERO_OH_HILOS', default=0, cast=int)
+
+# Listados del admin: sobre este número de filas se usa la estimación de PostgreSQL en vez de COUNT(*)
+PAGINACION_UMBRAL_ESTIMADO = 10000
+
+# Auditoría (ActivityLog): cada worker escribe en lotes. Ver apps/balancines/auditoria.py
+AUDITORIA_ACTIVA = config('AUDITORIA_ACTIVA', default=True, cast=bool)
+AUDITORIA_TAMANO_LOTE = 100
+AUDITORIA_INTERVALO_SEGUNDOS = 5
+# Meses completos que se conservan (manage.py depurar_auditoria)
+AUDITORIA_RETENCION_MESES = config('AUDITORIA_RETENCION_MESES', default=24, cast=int)
+
+# Tablas de historial particionadas por mes (migración 0022, manage.py gestionar_particiones):
+# tabla -> meses completos que quedan en la tabla además del actual (None = toda la historia).
+# La retención de app_activitylog la aplica depurar_auditoria (AUDITORIA_RETENCION_MESES)
+PARTICIONES_TABLAS = {
+    'app_historialrepuesto': None,
+    'app_historialadicional': None,
+    'app_historialbalancin': None,
+    'app_activitylog': None,
+}
+PARTICIONES_MESES_FUTUROS = 3
+# Particiones fuera de la retención: 'archivar' (esquema "archivo"), 'separar' o 'eliminar'
+PARTICIONES_ACCION_RETIRO = 'archivar'
+
+# Archivo en frío (manage.py archivar_historial, services/archivo.py): alertas OH resueltas
+# hace más de estos días e historial de balancines anterior a estos meses completos
+ARCHIVO_ALERTAS_DIAS = config('ARCHIVO_ALERTAS_DIAS', default=90, cast=int)
+ARCHIVO_HISTORIAL_MESES = config('ARCHIVO_HISTORIAL_MESES', default=24, cast=int)
+
+# Tareas diarias del servicio "tareas" (manage.py tareas_programadas): comando -> hora local HH:MM
+TAREAS_PROGRAMADAS = {
+    'generar_alertas_oh': config('HORA_ALERTAS_OH', default='06:00'),
+    'gestionar_particiones': config('HORA_GESTIONAR_PARTICIONES', default='03:00'),
+    'depurar_auditoria': config('HORA_DEPURAR_AUDITORIA', default='03:30'),
+    'archivar_historial': config('HORA_ARCHIVAR_HISTORIAL', default='04:00'),
+}
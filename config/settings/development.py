@@ -3,6 +3,7 @@ from .base import *
 # Configuración de desarrollo
 DEBUG = True
 ALLOWED_HOSTS = ['*']
+METRICAS_RENDIMIENTO_ACTIVAS = config('METRICAS_RENDIMIENTO_ACTIVAS', default=True, cast=bool)
 
 # Media files (para las imágenes)
 MEDIA_URL = '/media/'
@@ -0,0 +1,55 @@
+from .base import *
+
+# Configuración de producción
+DEBUG = False
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=lambda v: [h.strip() for h in v.split(',') if h.strip()])
+
+# Conexiones persistentes: cada hilo de gunicorn reutiliza su conexión a
+# PostgreSQL en vez de abrir una por request. CONN_HEALTH_CHECKS la verifica
+# al inicio de cada request y la reabre si PostgreSQL la cerró (reinicio,
+# failover, timeout del servidor).
+#
+# Con pgbouncer en modo transaction (docker-compose.prod.yml) cada
+# transacción puede ir a otra conexión del servidor: los cursores del lado
+# del servidor de .iterator() no sobreviven y se desactivan.
+for _alias in ('default', 'replica'):
+    DATABASES[_alias]['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    DATABASES[_alias]['CONN_HEALTH_CHECKS'] = True
+    DATABASES[_alias]['DISABLE_SERVER_SIDE_CURSORS'] = config('DB_PGBOUNCER', default=False, cast=bool)
+
+# Estáticos: collectstatic los copia con el hash del contenido en el nombre
+# (style.3f2a9c1b7e4d.css) y nginx los sirve desde el volumen compartido
+# con cache larga; un cambio en el archivo cambia su URL.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+}
+STATIC_URL = '/static/'
+MEDIA_URL = '/media/'
+
+# nginx termina la conexión y reenvía el esquema original
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+
+# Plantillas: el cargador con cache compila cada plantilla una sola vez por
+# proceso (en desarrollo se relee el archivo en cada request).
+# Con 'loaders' explícito APP_DIRS debe ser False.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Cache de fragmentos ({% cache %}) y de los tableros. Las claves llevan la
+# versión de los contadores de cambios (apps/balancines/versiones.py), así
+# que una cache local por proceso no sirve datos viejos entre workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sistrm',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+}
+TIEMPO_CACHE_FRAGMENTOS = 60 * 60 * 24
@@ -0,0 +1,188 @@
+"""
+Prueba de carga contra los contenedores locales (solo biblioteca estándar)
+
+Ejecutar con los contenedores levantados en modo producción:
+
+    docker compose -f docker-compose.yml -f docker-compose.prod.yml up -d --build
+    python scripts/prueba_carga.py --url http://localhost --email admin@x.com --password ... \\
+        --concurrencia 20 --duracion 60
+
+Cada hilo inicia su propia sesión y recorre las rutas en orden. Al final
+imprime por ruta: requests, errores, req/s y latencias p50/p95/p99 (ms).
+Con --json el resumen sale en JSON (para comparar corridas, p. ej. antes y
+después de cambiar GUNICORN_WORKERS/GUNICORN_THREADS o DB_CONN_MAX_AGE).
+"""
+
+import argparse
+import http.cookiejar
+import json
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+RUTAS_DEFECTO = [
+    '/salud/',
+    '/static/css/style.css',
+    '/inventario/dashboard-oh-vivo/',
+    '/api/horas-en-vivo/',
+    '/inventario/dashboard-oh-nuevo/',
+    '/inventario/dashboard/',
+    '/api/dashboard-inventario/',
+    '/historial-torre/',
+]
+
+
+def _percentil(valores, p):
+    if not valores:
+        return None
+    valores = sorted(valores)
+    indice = min(len(valores) - 1, max(0, round(p / 100 * len(valores)) - 1))
+    return round(valores[indice], 2)
+
+
+class Sesion:
+    """Cliente HTTP con cookies propias (una sesión de Django por hilo)"""
+
+    def __init__(self, base, timeout):
+        self.base = base.rstrip('/')
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+        self.opener.addheaders = [('Accept-Encoding', 'gzip')]
+
+    def get(self, ruta):
+        with self.opener.open(self.base + ruta, timeout=self.timeout) as respuesta:
+            return respuesta.status, respuesta.read()
+
+    def login(self, email, password):
+        _, html = self.get('/login/')
+        match = re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', html)
+        if not match:
+            raise RuntimeError('No se encontró el token CSRF en /login/')
+        datos = urllib.parse.urlencode({
+            'csrfmiddlewaretoken': match.group(1).decode(),
+            'username': email,
+            'password': password,
+        }).encode()
+        peticion = urllib.request.Request(
+            self.base + '/login/', data=datos, headers={'Referer': self.base + '/login/'}
+        )
+        with self.opener.open(peticion, timeout=self.timeout) as respuesta:
+            if respuesta.geturl().rstrip('/').endswith('/login'):
+                raise RuntimeError('Credenciales inválidas')
+
+
+def ejecutar(args):
+    resultados = defaultdict(lambda: {'latencias': [], 'errores': 0, 'estados': defaultdict(int)})
+    lock = threading.Lock()
+    fin = time.monotonic() + args.duracion
+
+    def trabajador(numero):
+        sesion = Sesion(args.url, args.timeout)
+        if args.email:
+            sesion.login(args.email, args.password)
+        i = numero  # cada hilo empieza en una ruta distinta
+        while time.monotonic() < fin:
+            ruta = args.ruta[i % len(args.ruta)]
+            i += 1
+            inicio = time.perf_counter()
+            try:
+                estado, _ = sesion.get(ruta)
+            except urllib.error.HTTPError as e:
+                estado = e.code
+            except (urllib.error.URLError, TimeoutError, ConnectionError):
+                estado = None
+            latencia = (time.perf_counter() - inicio) * 1000
+            with lock:
+                r = resultados[ruta]
+                r['estados'][estado] += 1
+                if estado is None or estado >= 400:
+                    r['errores'] += 1
+                else:
+                    r['latencias'].append(latencia)
+
+    inicio = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrencia) as pool:
+        # list() propaga los errores de login
+        list(pool.map(trabajador, range(args.concurrencia)))
+    duracion = time.monotonic() - inicio
+
+    resumen = {}
+    for ruta in args.ruta:
+        r = resultados[ruta]
+        total = len(r['latencias']) + r['errores']
+        resumen[ruta] = {
+            'requests': total,
+            'errores': r['errores'],
+            'req_s': round(total / duracion, 1),
+            'p50_ms': _percentil(r['latencias'], 50),
+            'p95_ms': _percentil(r['latencias'], 95),
+            'p99_ms': _percentil(r['latencias'], 99),
+            'media_ms': round(statistics.mean(r['latencias']), 2) if r['latencias'] else None,
+            'estados': {str(k): v for k, v in r['estados'].items()},
+        }
+    todas = [lat for r in resultados.values() for lat in r['latencias']]
+    total = sum(v['requests'] for v in resumen.values())
+    return {
+        'url': args.url,
+        'concurrencia': args.concurrencia,
+        'duracion_s': round(duracion, 1),
+        'total': {
+            'requests': total,
+            'errores': sum(v['errores'] for v in resumen.values()),
+            'req_s': round(total / duracion, 1),
+            'p50_ms': _percentil(todas, 50),
+            'p95_ms': _percentil(todas, 95),
+            'p99_ms': _percentil(todas, 99),
+        },
+        'rutas': resumen,
+    }
+
+
+def imprimir(resultado):
+    print(f"\n📊 {resultado['url']} | {resultado['concurrencia']} hilos | {resultado['duracion_s']} s\n")
+    print(f"{'Ruta':<40} {'req':>7} {'err':>5} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    filas = list(resultado['rutas'].items()) + [('TOTAL', resultado['total'])]
+    for ruta, r in filas:
+        print(
+            f"{ruta:<40} {r['requests']:>7} {r['errores']:>5} {r['req_s']:>7} "
+            f"{r['p50_ms'] or '-':>8} {r['p95_ms'] or '-':>8} {r['p99_ms'] or '-':>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga contra los contenedores locales')
+    parser.add_argument('--url', default='http://localhost', help='URL base (nginx). Default: http://localhost')
+    parser.add_argument('--email', help='Usuario para iniciar sesión (sin él solo rutas públicas)')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--concurrencia', type=int, default=10, help='Hilos en paralelo (default: 10)')
+    parser.add_argument('--duracion', type=float, default=30, help='Segundos de prueba (default: 30)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout por request (default: 30)')
+    parser.add_argument('--ruta', action='append', help='Ruta a pedir (se puede repetir). Por defecto las principales')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resumen en JSON')
+    args = parser.parse_args()
+    args.ruta = args.ruta or RUTAS_DEFECTO
+    if not args.email:
+        args.ruta = [r for r in args.ruta if r.startswith(('/salud/', '/static/'))] or args.ruta
+
+    try:
+        resultado = ejecutar(args)
+    except RuntimeError as e:
+        print(f'❌ {e}', file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    else:
+        imprimir(resultado)
+
+
+if __name__ == '__main__':
+    main()